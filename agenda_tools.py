@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Ponto de entrada único das ferramentas do projeto Agenda Livre.
+
+Em vez de rodar cada script em um processo separado (cada um varrendo e
+lendo o projeto inteiro de novo), as etapas escolhidas rodam em sequência
+no mesmo processo, sobre um Workspace compartilhado (ver shared_workspace.py):
+
+    python agenda_tools.py run analyze dedupe fix-auth fix-user-type
+
+Etapas disponíveis:
+    analyze             project_analyzer.py
+    dedupe              component_deduplicator.py
+    fix-auth            auth_context_fixer.py
+    fix-user-type       user_type_fixer.py
+    consolidate-auth    consolidar_authcontext.py
+    fix-backup-imports  corrigir_imports_backups.py
+
+As etapas rodam na ordem em que foram pedidas; cada uma enxerga as edições
+das anteriores sem reler os arquivos do disco. Em simulação (--dry-run)
+nada é escrito, então cada etapa vê a árvore original.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import consolidar_authcontext
+import corrigir_imports_backups
+from auth_context_fixer import AuthContextFixer
+from component_deduplicator import ComponentDeduplicator
+from metrics import profiled
+from project_analyzer import ProjectAnalyzer
+from shared_workspace import Workspace
+from typescript_worker import start_tsc_worker
+from user_type_fixer import UserTypeFixer
+
+# Configurações
+PROJECT_ROOT = '.'  # Diretório atual
+
+
+def run_analyze(workspace, args):
+    tsc = start_tsc_worker(workspace.root_dir) if args.tsc else None
+    analyzer = ProjectAnalyzer(workspace.root_dir, jobs=args.jobs, workspace=workspace, tsc=tsc)
+    try:
+        analyzer.scan_directory()
+        analyzer.analyze_imports()
+        analyzer.find_duplications()
+        analyzer.generate_report()
+    finally:
+        if analyzer.tsc is not None:
+            analyzer.tsc.close()
+    return None
+
+
+def run_dedupe(workspace, args):
+    deduplicator = ComponentDeduplicator(workspace.root_dir, dry_run=args.dry_run, jobs=args.jobs,
+                                         workspace=workspace, include_similar=args.include_similar)
+    deduplicator.scan_directory()
+    deduplicator.run()
+    return deduplicator.plan
+
+
+def run_fix_auth(workspace, args):
+    fixer = AuthContextFixer(workspace.root_dir, dry_run=args.dry_run, jobs=args.jobs, workspace=workspace)
+    fixer.scan_directory()
+    fixer.run()
+    return fixer.plan
+
+
+def run_fix_user_type(workspace, args):
+    fixer = UserTypeFixer(workspace.root_dir, target_style=args.target, dry_run=args.dry_run,
+                          jobs=args.jobs, workspace=workspace)
+    fixer.scan_directory()
+    fixer.run()
+    return fixer.plan
+
+
+def run_consolidate_auth(workspace, args):
+    root_dir = Path(workspace.root_dir).resolve()
+    auth_files = consolidar_authcontext.listar_auth_contexts(root_dir)
+    if not auth_files:
+        print("Nenhum arquivo AuthContext encontrado.")
+        return None
+    mais_recente = consolidar_authcontext.authcontext_mais_recente(auth_files)
+    print(f"AuthContext mais recente: {mais_recente}")
+    if args.dry_run:
+        print("Simulação: consolidate-auth não tem modo de simulação, etapa ignorada")
+        return None
+    return consolidar_authcontext.corrigir_importacoes_useauth(mais_recente, root_dir, contents=workspace.contents,
+                                                               cache=workspace.cache)
+
+
+def run_fix_backup_imports(workspace, args):
+    if args.dry_run:
+        print("Simulação: fix-backup-imports não tem modo de simulação, etapa ignorada")
+        return None
+    root_dir = Path(workspace.root_dir).resolve()
+    return corrigir_imports_backups.corrigir_imports_de_backup(root_dir, contents=workspace.contents)
+
+
+# Nome da etapa -> função(workspace, args) que retorna o ChangePlan aplicado (ou None)
+STEPS = {
+    'analyze': run_analyze,
+    'dedupe': run_dedupe,
+    'fix-auth': run_fix_auth,
+    'fix-user-type': run_fix_user_type,
+    'consolidate-auth': run_consolidate_auth,
+    'fix-backup-imports': run_fix_backup_imports,
+}
+
+
+def run_pipeline(root_dir, steps, args):
+    """Executa as etapas em sequência sobre um único Workspace; retorna os tempos por etapa."""
+    workspace = Workspace(root_dir, use_cache=not args.no_cache)
+    timings = []
+    try:
+        for step in steps:
+            print(f"\n=== {step} ===")
+            started = time.perf_counter()
+            plan = STEPS[step](workspace, args)
+            if plan is not None:
+                # As próximas etapas veem as edições desta sem reler os arquivos
+                workspace.record_changes(plan)
+            timings.append((step, time.perf_counter() - started))
+    finally:
+        workspace.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ferramentas do projeto Agenda Livre em um único processo')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Executar etapas em sequência')
+    run_parser.add_argument('steps', nargs='+', choices=list(STEPS), metavar='etapa',
+                            help=f"Etapas, na ordem de execução: {', '.join(STEPS)}")
+    run_parser.add_argument('--dry-run', action='store_true', help='Apenas mostrar mudanças sem aplicá-las')
+    run_parser.add_argument('--no-cache', action='store_true', help='Ignorar o cache de análise em .cache/')
+    run_parser.add_argument('--jobs', type=int, default=1, help='Repassado às etapas (processos ou threads)')
+    run_parser.add_argument('--target', choices=['camel', 'snake'], help='Estilo do tipo User em fix-user-type')
+    run_parser.add_argument('--include-similar', action='store_true',
+                            help='Em dedupe, redirecionar também componentes apenas similares')
+    run_parser.add_argument('--tsc', action='store_true', help='Erros TypeScript reais via tsc do projeto em analyze')
+    run_parser.add_argument('--profile', metavar='ARQUIVO', help='Gravar um perfil cProfile da execução em ARQUIVO')
+
+    args = parser.parse_args()
+
+    with profiled(args.profile):
+        timings = run_pipeline(PROJECT_ROOT, args.steps, args)
+
+    print("\nResumo:")
+    for step, seconds in timings:
+        print(f"  {step:20} {seconds:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
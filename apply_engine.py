@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Aplicação transacional das mudanças dos corretores do projeto Agenda Livre.
+
+Os corretores não escrevem mais no disco no meio da análise: eles montam um
+ChangePlan (caminho -> novo conteúdo) e só no fim o plano é aplicado:
+1. Backup de todos os arquivos existentes, em lote (ver backup_store.py)
+2. Manifesto do plano gravado antes de qualquer escrita (status 'applying')
+3. Cada arquivo é escrito em um temporário no mesmo diretório e trocado com
+   os.replace, opcionalmente em paralelo (threads)
+4. Manifesto marcado como 'applied'
+
+Se uma escrita falhar, o que já foi escrito é desfeito na hora. Se a execução
+for interrompida, o manifesto continua 'applying' e pode ser desfeito com:
+
+    python apply_engine.py rollback [manifesto]
+
+Sem manifesto, desfaz a execução mais recente que ainda não foi desfeita.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from backup_store import STORE_DIR, BackupStore
+
+# Configurações
+PROJECT_ROOT = '.'  # Diretório atual
+
+
+def _text_digest(content):
+    """Hash do conteúdo como ele fica no disco (quebras de linha do sistema)."""
+    return hashlib.sha1(content.replace('\n', os.linesep).encode('utf-8')).hexdigest()
+
+
+def _file_digest(full_path):
+    with open(full_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _atomic_write(full_path, data, text=True):
+    """Grava em um temporário no mesmo diretório e troca com os.replace."""
+    directory = os.path.dirname(full_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = os.path.join(directory, f".{os.path.basename(full_path)}.{os.getpid()}.tmp")
+    try:
+        if text:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        else:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+        if os.path.exists(full_path):
+            shutil.copymode(full_path, tmp_path)
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ChangePlan:
+    def __init__(self, root_dir, tool, dry_run=False):
+        self.root_dir = str(root_dir)
+        self.dry_run = dry_run
+        self.changes = {}  # caminho relativo -> novo conteúdo (ordem de inclusão)
+        self.backups = BackupStore(self.root_dir, tool, dry_run=dry_run)
+        self.manifest_path = None
+
+    def write(self, file_path, content):
+        """Agenda a escrita de um arquivo; uma escrita posterior substitui a anterior."""
+        self.changes[str(file_path)] = content
+
+    def get(self, file_path):
+        """Conteúdo já planejado para um arquivo, ou None."""
+        return self.changes.get(str(file_path))
+
+    def __contains__(self, file_path):
+        return str(file_path) in self.changes
+
+    def __len__(self):
+        return len(self.changes)
+
+    def _full_path(self, file_path):
+        return os.path.join(self.root_dir, file_path)
+
+    def apply(self, workers=1):
+        """
+        Aplica o plano; retorna o caminho do manifesto (None em simulação ou
+        se não houver mudanças).
+        """
+        if self.dry_run or not self.changes:
+            return None
+
+        # 1. Backups em lote, antes de qualquer escrita
+        created = []
+        for file_path in self.changes:
+            if os.path.exists(self._full_path(file_path)):
+                self.backups.backup(file_path)
+            else:
+                created.append(file_path)
+
+        written = {file_path: _text_digest(content) for file_path, content in self.changes.items()}
+
+        # 2. Manifesto antes de escrever: uma interrupção daqui em diante pode ser desfeita
+        self.manifest_path = self.backups.save_manifest(status='applying', created=created, written=written)
+
+        # 3. Escritas atômicas, em paralelo se pedido
+        def write(item):
+            file_path, content = item
+            _atomic_write(self._full_path(file_path), content)
+
+        try:
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(write, self.changes.items()))
+            else:
+                for item in self.changes.items():
+                    write(item)
+        except BaseException:
+            print("Erro ao aplicar as mudanças; desfazendo o que já foi escrito...")
+            rollback(self.root_dir, self.manifest_path)
+            raise
+
+        # 4. Plano concluído
+        self.backups.save_manifest(status='applied', created=created, written=written)
+        return self.manifest_path
+
+
+def list_manifests(root_dir):
+    """Manifestos de execução, do mais antigo para o mais recente."""
+    manifest_dir = os.path.join(root_dir, STORE_DIR, 'manifests')
+    if not os.path.isdir(manifest_dir):
+        return []
+    return [os.path.join(manifest_dir, name) for name in sorted(os.listdir(manifest_dir)) if name.endswith('.json')]
+
+
+def _load_manifest(manifest_path):
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def latest_manifest(root_dir):
+    """Manifesto mais recente que ainda não foi desfeito, ou None."""
+    for manifest_path in reversed(list_manifests(root_dir)):
+        if _load_manifest(manifest_path).get('status') != 'rolled_back':
+            return manifest_path
+    return None
+
+
+def rollback(root_dir, manifest_path, force=False):
+    """
+    Restaura os arquivos de uma execução a partir do manifesto.
+
+    Arquivos alterados depois da execução (conteúdo diferente do que ela
+    escreveu) são mantidos, a menos que `force` seja verdadeiro. Retorna
+    (restaurados, removidos, mantidos).
+    """
+    root_dir = str(root_dir)
+    manifest = _load_manifest(manifest_path)
+    store = BackupStore(root_dir, manifest['tool'])
+    written = manifest.get('written', {})
+    restored, removed, kept = [], [], []
+
+    def changed_since_run(full_path, file_path):
+        if force or file_path not in written or not os.path.exists(full_path):
+            return False
+        return _file_digest(full_path) != written[file_path]
+
+    for file_path, digest in manifest['files'].items():
+        full_path = os.path.join(root_dir, file_path)
+        if changed_since_run(full_path, file_path):
+            kept.append(file_path)
+            continue
+        with open(store.blob_path(digest), 'rb') as f:
+            _atomic_write(full_path, f.read(), text=False)
+        restored.append(file_path)
+
+    for file_path in manifest.get('created', []):
+        full_path = os.path.join(root_dir, file_path)
+        if changed_since_run(full_path, file_path):
+            kept.append(file_path)
+            continue
+        if os.path.exists(full_path):
+            os.remove(full_path)
+            removed.append(file_path)
+
+    manifest['status'] = 'rolled_back'
+    _atomic_write(manifest_path, json.dumps(manifest, indent=2))
+
+    return restored, removed, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Desfazer execuções dos corretores do projeto Agenda Livre')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='Listar as execuções registradas')
+
+    rollback_parser = subparsers.add_parser('rollback', help='Desfazer uma execução')
+    rollback_parser.add_argument('manifest', nargs='?', help='Manifesto da execução (padrão: a mais recente)')
+    rollback_parser.add_argument('--force', action='store_true',
+                                 help='Restaurar também arquivos alterados depois da execução')
+
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for manifest_path in list_manifests(PROJECT_ROOT):
+            manifest = _load_manifest(manifest_path)
+            changed = len(manifest['files']) + len(manifest.get('created', []))
+            print(f"{manifest['run_id']}: {manifest.get('status', 'applied')}, {changed} arquivos")
+        return
+
+    manifest_path = args.manifest or latest_manifest(PROJECT_ROOT)
+    if manifest_path is None:
+        print("Nenhuma execução para desfazer.")
+        return
+
+    restored, removed, kept = rollback(PROJECT_ROOT, manifest_path, force=args.force)
+    print(f"Execução desfeita: {manifest_path}")
+    print(f"  {len(restored)} arquivos restaurados, {len(removed)} arquivos criados removidos")
+    for file_path in kept:
+        print(f"  Mantido (alterado depois da execução): {file_path}")
+
+
+if __name__ == "__main__":
+    main()
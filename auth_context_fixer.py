@@ -11,81 +11,103 @@ Este script:
 
 import os
 import re
-import json
-import shutil
 from pathlib import Path
 
+from apply_engine import ChangePlan
+from content_store import ContentStore
+from file_cache import FileFactsCache
+from metrics import Metrics, measured, profiled
+from import_resolver import build_import_resolver
+from report_sink import ReportSink, write_json_report
+from rewrite_rules import Rule, RuleSet
+from workspace_scanner import iter_files, workspace_paths
+
 # Configurações
 PROJECT_ROOT = '.'  # Diretório atual
-IGNORE_DIRS = ['.git', '.next', 'node_modules', 'coverage']
-BACKUP_DIR = './backups/auth_context_fix'
 SUPPORTED_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx']
 
+# Regras compiladas uma vez (ver rewrite_rules.py)
+# import { ..., useAuth, ... } from '<origem>': grupos (início, origem, aspa final)
+USEAUTH_IMPORT_RULES = RuleSet([
+    Rule('useauth_import',
+         r'(import\s+[^;]*?{[^}]*?useAuth[^}]*?}\s+from\s+[\'"])([^\'"]*)([\'"])',
+         keywords=['useAuth']),
+])
+
+# Definição de useAuth sem export
+USEAUTH_DEFINITION_RE = re.compile(r'(function|const)\s+useAuth')
+USEAUTH_FUNCTION_RE = re.compile(r'function\s+useAuth')
+USEAUTH_CONST_RE = re.compile(r'const\s+useAuth')
+
 class AuthContextFixer:
-    def __init__(self, root_dir, dry_run=False):
+    def __init__(self, root_dir, dry_run=False, use_cache=True, jobs=1, workspace=None):
         self.root_dir = Path(root_dir)
         self.dry_run = dry_run
+        # Com um Workspace (ver shared_workspace.py), cache e conteúdos são os mesmos das outras etapas
+        self.cache = workspace.cache if workspace else FileFactsCache(root_dir, enabled=use_cache)
+        self.backup_manifest = None
+        self.jobs = jobs  # Threads para gravar os arquivos no fim
+        # Mudanças acumuladas e aplicadas de uma vez no fim (ver apply_engine.py)
+        self.plan = ChangePlan(root_dir, 'auth_context_fix', dry_run=dry_run)
         self.files = []
-        self.file_contents = {}
-        self.changes_made = []
+        self.file_facts = {}
+        self.contents = workspace.contents if workspace else ContentStore(root_dir)  # Sob demanda, com limite de memória
+        self.metrics = Metrics()  # Tempos por fase e contadores (bloco 'metrics' do relatório)
+        self.metrics.track('cache', self.cache.stats)
+        self.metrics.track('contents', self.contents.stats)
+        self.metrics.track('rules', USEAUTH_IMPORT_RULES.stats)
+        # Mudanças gravadas no .jsonl à medida que acontecem (ver report_sink.py)
+        self.changes = ReportSink('auth_context_fixes_report.jsonl', 'auth_context_fix', enabled=not dry_run)
         self.auth_context_files = []
         self.files_importing_useauth = []
+        self.resolver = None  # Construído após a varredura (ver import_resolver.py)
+        self.paths = None  # PathTable do inventário: diretório de cada arquivo (ver path_table.py)
+        self.auth_import_paths = {}  # id do diretório -> caminho do import do AuthContext mais próximo
         
+    @measured
     def scan_directory(self):
         """Escaneia o diretório do projeto e carrega os arquivos relevantes."""
         print(f"Escaneando diretório: {self.root_dir}")
         
-        for root, dirs, files in os.walk(self.root_dir):
-            # Ignorar diretórios específicos
-            dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+        for entry in iter_files(self.root_dir, SUPPORTED_EXTENSIONS):
+            str_path = entry.path
+            self.files.append(str_path)
             
-            for file in files:
-                file_path = Path(root) / file
-                rel_path = file_path.relative_to(self.root_dir)
-                str_path = str(rel_path)
-                
-                # Verificar se é um arquivo relevante
-                if file_path.suffix in SUPPORTED_EXTENSIONS:
-                    self.files.append(str_path)
-                    
-                    # Identificar arquivos de autenticação
-                    if 'auth' in str_path.lower() or 'context' in str_path.lower():
-                        if 'authcontext' in str_path.lower() or 'useauth' in str_path.lower():
-                            self.auth_context_files.append(str_path)
-                    
-                    # Carregar o conteúdo dos arquivos
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            self.file_contents[str_path] = f.read()
-                    except Exception as e:
-                        print(f"Erro ao ler arquivo {file_path}: {e}")
+            # Identificar arquivos de autenticação
+            if 'auth' in str_path.lower() or 'context' in str_path.lower():
+                if 'authcontext' in str_path.lower() or 'useauth' in str_path.lower():
+                    self.auth_context_files.append(str_path)
+            
+            facts, content = self.cache.facts_for(entry)
+            if facts is None:
+                continue
+            self.file_facts[str_path] = facts
+            
+            # Aproveitar o conteúdo já lido só dos arquivos que podem mudar
+            if content is not None and (facts['imports_useauth'] or str_path in self.auth_context_files):
+                self.contents.put(str_path, content)
+        
+        self.metrics.count('files_scanned', len(self.files))
+        self.cache.save()
+        
+        self.resolver = build_import_resolver(self.root_dir)
+        self.paths = workspace_paths(self.root_dir)
         
         print(f"Total de arquivos encontrados: {len(self.files)}")
         print(f"Arquivos de autenticação encontrados: {len(self.auth_context_files)}")
     
-    def _backup_file(self, file_path):
-        """Cria um backup de um arquivo antes de modificá-lo."""
-        if self.dry_run:
-            return
-            
-        backup_path = Path(BACKUP_DIR) / file_path
-        os.makedirs(backup_path.parent, exist_ok=True)
-        
-        src_path = self.root_dir / file_path
-        shutil.copy2(src_path, backup_path)
-        
-        return backup_path
+    def _get_content(self, file_path):
+        """Retorna o conteúdo de um arquivo, lendo do disco só se não estiver no cache."""
+        planned = self.plan.get(file_path)
+        if planned is not None:
+            return planned  # Já alterado nesta execução, ainda não gravado
+        return self.contents.get(file_path)
     
     def _save_file(self, file_path, content):
-        """Salva o conteúdo em um arquivo."""
-        if self.dry_run:
-            return
-            
-        full_path = self.root_dir / file_path
-        
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        """Agenda a gravação de um arquivo no plano de mudanças."""
+        self.plan.write(file_path, content)
     
+    @measured
     def fix_auth_context(self):
         """Corrige os arquivos de AuthContext para garantir que useAuth seja exportado corretamente."""
         print("Corrigindo arquivos AuthContext...")
@@ -96,7 +118,9 @@ class AuthContextFixer:
             return
         
         for auth_file in self.auth_context_files:
-            content = self.file_contents[auth_file]
+            if auth_file not in self.file_facts:
+                continue
+            content = self._get_content(auth_file)
             original_content = content
             
             # Verificar se useAuth está sendo exportado
@@ -111,40 +135,28 @@ class AuthContextFixer:
                 continue
             
             # Verificar se useAuth existe mas não está sendo exportado
-            has_use_auth = re.search(r'(function|const)\s+useAuth', content) is not None
+            has_use_auth = USEAUTH_DEFINITION_RE.search(content) is not None
             
             if has_use_auth:
                 # useAuth existe, mas precisa ser exportado
-                self._backup_file(auth_file)
-                
                 if 'function useAuth' in content:
                     # Adicionar export à função useAuth existente
-                    updated_content = re.sub(
-                        r'function\s+useAuth', 
-                        'export function useAuth', 
-                        content
-                    )
+                    updated_content = USEAUTH_FUNCTION_RE.sub('export function useAuth', content)
                     self._save_file(auth_file, updated_content)
-                    self.changes_made.append({
+                    self.changes.add({
                         'file': auth_file,
                         'change': 'Adicionado export à function useAuth existente'
                     })
                 elif 'const useAuth' in content:
                     # Adicionar export à const useAuth existente
-                    updated_content = re.sub(
-                        r'const\s+useAuth', 
-                        'export const useAuth', 
-                        content
-                    )
+                    updated_content = USEAUTH_CONST_RE.sub('export const useAuth', content)
                     self._save_file(auth_file, updated_content)
-                    self.changes_made.append({
+                    self.changes.add({
                         'file': auth_file,
                         'change': 'Adicionado export à const useAuth existente'
                     })
             else:
                 # useAuth não existe, precisa ser criado
-                self._backup_file(auth_file)
-                
                 # Determinar se o arquivo usa TypeScript
                 is_typescript = auth_file.endswith('.ts') or auth_file.endswith('.tsx')
                 
@@ -184,20 +196,14 @@ export function useAuth() {
                     updated_content = content + '\n' + use_auth_function
                 
                 self._save_file(auth_file, updated_content)
-                self.changes_made.append({
+                self.changes.add({
                     'file': auth_file,
                     'change': 'Criada e exportada function useAuth'
                 })
     
     def _create_auth_context(self):
         """Cria um novo arquivo AuthContext se não existir nenhum."""
-        # Decidir onde criar o arquivo
-        contexts_dir = self.root_dir / 'src/contexts'
-        if not contexts_dir.exists():
-            contexts_dir = self.root_dir / 'contexts'
-            if not contexts_dir.exists() and not self.dry_run:
-                os.makedirs(contexts_dir)
-        
+        # Decidir onde criar o arquivo (o diretório é criado ao aplicar o plano)
         auth_file = 'src/contexts/AuthContext.tsx' if (self.root_dir / 'src/contexts').exists() else 'contexts/AuthContext.tsx'
         
         # Conteúdo do novo arquivo
@@ -354,94 +360,78 @@ export default AuthProvider;
         
         if not self.dry_run:
             # Criar o arquivo
-            full_path = self.root_dir / auth_file
-            os.makedirs(full_path.parent, exist_ok=True)
             self._save_file(auth_file, content)
             
-            self.changes_made.append({
+            self.changes.add({
                 'file': auth_file,
                 'change': 'Criado novo arquivo AuthContext completo'
             })
     
+    @measured
     def fix_useauth_imports(self):
         """Corrige importações de useAuth que podem estar causando erros."""
         print("Corrigindo importações de useAuth...")
         
         for file_path in self.files:
-            content = self.file_contents[file_path]
-            
-            # Verificar se o arquivo importa useAuth
-            if re.search(r'import\s+[^;]*?{[^}]*?useAuth[^}]*?}\s+from', content):
+            # Verificar se o arquivo importa useAuth (detectado na varredura)
+            facts = self.file_facts.get(file_path)
+            if facts is not None and facts['imports_useauth']:
+                content = self._get_content(file_path)
                 self.files_importing_useauth.append(file_path)
                 
-                # Verificar se a importação é de um local correto
-                matches = re.findall(r'import\s+([^;]*?){([^}]*?)useAuth([^}]*?)}\s+from\s+[\'"]([^\'"]*?)[\'"]', content)
+                # Uma passada: cada importação de useAuth de um local que não é
+                # um AuthContext válido é trocada pelo AuthContext mais próximo
+                fixed = []
                 
-                for pre, use_auth, post, source in matches:
-                    # Verificar se o arquivo importado existe
-                    imported_path = self._resolve_import_path(file_path, source)
-                    
-                    if not self._is_valid_authcontext_import(imported_path):
-                        # A importação está referenciando um arquivo que não é o AuthContext correto
-                        self._backup_file(file_path)
-                        
-                        # Encontrar o AuthContext correto mais próximo
-                        closest_auth = self._find_closest_auth_context(file_path)
-                        
-                        if closest_auth:
-                            # Calcular caminho relativo
-                            file_dir = Path(file_path).parent
-                            rel_path = os.path.relpath(self.root_dir / closest_auth, self.root_dir / file_dir)
-                            
-                            # Garantir formato correto para importação
-                            if not rel_path.startswith('.'):
-                                rel_path = './' + rel_path
-                            # Normalizar separadores (para JS/TS é comum usar '/')
-                            rel_path = rel_path.replace(os.sep, '/')
-
-                            # Escapar para uso seguro no regex
-                            escaped_rel_path = re.escape(rel_path)
-
-                            # Substituir no import statement
-                            updated_content = re.sub(
-                                r'(import\s+[^;]*?{\s*[^}]*?useAuth[^}]*?}\s+from\s+[\'"]).+?([\'"])',
-                                r'\1' + escaped_rel_path + r'\2',
-                                content
-                            )
-                            
-                            self._save_file(file_path, updated_content)
-                            self.changes_made.append({
-                                'file': file_path,
-                                'change': f'Corrigida importação de useAuth para {rel_path}'
-                            })
-    
-    def _resolve_import_path(self, file_path, import_path):
-        """Resolve o caminho completo de uma importação."""
-        try:
-            # Remover extensão da importação, se houver
-            import_path = re.sub(r'\.(js|jsx|ts|tsx)$', '', import_path)
-            
-            # Caminho relativo
-            if import_path.startswith('./') or import_path.startswith('../'):
-                file_dir = Path(file_path).parent
-                resolved = (file_dir / import_path).resolve().relative_to(self.root_dir)
+                def fix_import(match):
+                    imported_path = self._resolve_import_path(file_path, match.group(2))
+                    if self._is_valid_authcontext_import(imported_path):
+                        return None
+                    rel_path = self._auth_context_import_path(file_path)
+                    if rel_path is None:
+                        return None
+                    fixed.append(rel_path)
+                    return match.group(1) + rel_path + match.group(3)
                 
-                # Verificar diferentes extensões possíveis
-                for ext in ['.js', '.jsx', '.ts', '.tsx']:
-                    potential_file = str(resolved) + ext
-                    if potential_file in self.files:
-                        return potential_file
+                updated_content, _ = USEAUTH_IMPORT_RULES.apply(content, {'useauth_import': fix_import})
+                # Cada arquivo é visitado uma vez: o original não precisa ficar no cache
+                self.contents.release(file_path)
                 
-                # Verificar se existe como index
-                for ext in ['.js', '.jsx', '.ts', '.tsx']:
-                    potential_index = str(resolved) + '/index' + ext
-                    if potential_index in self.files:
-                        return potential_index
-            
-            # Importações absolutas são mais difíceis de resolver
-            return None
-        except Exception:
+                if fixed:
+                    self._save_file(file_path, updated_content)
+                    for rel_path in fixed:
+                        self.changes.add({
+                            'file': file_path,
+                            'change': f'Corrigida importação de useAuth para {rel_path}'
+                        })
+    
+    def _auth_context_import_path(self, file_path):
+        """Caminho relativo (para importação) do AuthContext mais próximo, ou None."""
+        # O AuthContext mais próximo só depende do diretório: calculado uma vez por diretório
+        dir_id = self.paths.dir_id(file_path)
+        if dir_id in self.auth_import_paths:
+            return self.auth_import_paths[dir_id]
+        
+        closest_auth = self._find_closest_auth_context(file_path)
+        if not closest_auth:
             return None
+        
+        # Calcular caminho relativo
+        file_dir = self.paths.display_dir(file_path)
+        rel_path = os.path.relpath(self.root_dir / closest_auth, self.root_dir / file_dir)
+        
+        # Garantir formato correto para importação
+        if not rel_path.startswith('.'):
+            rel_path = './' + rel_path
+        # Normalizar separadores (para JS/TS é comum usar '/')
+        rel_path = rel_path.replace(os.sep, '/')
+        self.auth_import_paths[dir_id] = rel_path
+        return rel_path
+    
+    def _resolve_import_path(self, file_path, import_path):
+        """Resolve o caminho completo de uma importação."""
+        # Relativas e aliases do tsconfig; pacotes retornam None
+        return self.resolver.resolve(self.paths.module_dir(file_path), import_path)
     
     def _is_valid_authcontext_import(self, imported_path):
         """Verifica se o caminho importado é um AuthContext válido."""
@@ -455,12 +445,13 @@ export default AuthProvider;
         if not self.auth_context_files:
             return None
             
-        # Preferir AuthContext no mesmo diretório ou acima
-        file_dir = Path(file_path).parent
+        # Preferir AuthContext no mesmo diretório ou acima (diretórios já
+        # guardados na PathTable, sem criar caminhos a cada arquivo)
+        file_dir = self.paths.display_dir(file_path)
         
         for auth_file in self.auth_context_files:
-            auth_dir = Path(auth_file).parent
-            if str(file_dir).startswith(str(auth_dir)) or str(auth_dir).startswith(str(file_dir)):
+            auth_dir = self.paths.display_dir(auth_file)
+            if file_dir.startswith(auth_dir) or auth_dir.startswith(file_dir):
                 return auth_file
         
         # Se não encontrar nenhum próximo, retornar o primeiro
@@ -468,24 +459,28 @@ export default AuthProvider;
     
     def run(self):
         """Executa todas as correções no AuthContext."""
-        print(f"Iniciando correções no AuthContext (modo {'simulação' if self.dry_run else 'aplicação'})...")
-        
-        # Criar diretório de backup
-        if not self.dry_run:
-            os.makedirs(BACKUP_DIR, exist_ok=True)
-        
-        # Corrigir AuthContext existentes ou criar um novo
-        self.fix_auth_context()
-        
-        # Corrigir importações de useAuth
-        self.fix_useauth_imports()
+        with self.metrics.phase('run'):
+            print(f"Iniciando correções no AuthContext (modo {'simulação' if self.dry_run else 'aplicação'})...")
+            
+            # Corrigir AuthContext existentes ou criar um novo
+            self.fix_auth_context()
+            
+            # Corrigir importações de useAuth
+            self.fix_useauth_imports()
+            
+            # Aplicar todas as mudanças de uma vez: backups em lote e escrita atômica
+            with self.metrics.phase('apply'):
+                self.backup_manifest = self.plan.apply(workers=self.jobs)
+            self.metrics.count('files_planned', len(self.plan))
+            if self.backup_manifest:
+                print(f"Mudanças aplicadas. Para desfazer: python apply_engine.py rollback {self.backup_manifest}")
         
-        # Gerar relatório
+        # Gerar relatório depois de fechar a fase 'run', para o bloco metrics sair completo
         self._generate_report()
         
-        print(f"Correções concluídas. {len(self.changes_made)} mudanças {'simuladas' if self.dry_run else 'aplicadas'}.")
+        print(f"Correções concluídas. {len(self.changes)} mudanças {'simuladas' if self.dry_run else 'aplicadas'}.")
         if not self.dry_run:
-            print("Relatório salvo em auth_context_fixes_report.json e auth_context_fixes_report.txt")
+            print("Relatório salvo em auth_context_fixes_report.jsonl, auth_context_fixes_report.json e auth_context_fixes_report.txt")
     
     def _generate_report(self):
         """Gera um relatório das mudanças feitas ou simuladas."""
@@ -493,19 +488,21 @@ export default AuthProvider;
             'summary': {
                 'auth_context_files': len(self.auth_context_files),
                 'files_importing_useauth': len(self.files_importing_useauth),
-                'total_changes': len(self.changes_made),
+                'total_changes': len(self.changes),
                 'dry_run': self.dry_run
             },
-            'changes': self.changes_made,
+            'backups': dict(self.plan.backups.stats, manifest=self.backup_manifest),
+            'changes': self.changes,
             'auth_context_files': self.auth_context_files,
-            'files_importing_useauth': self.files_importing_useauth
+            'files_importing_useauth': self.files_importing_useauth,
+            'metrics': self.metrics.as_dict()
         }
         
         # Salvar o relatório
         if not self.dry_run:
-            # Formato JSON
-            with open('auth_context_fixes_report.json', 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2)
+            # Resumo no fim do .jsonl; o JSON é gerado relendo as mudanças
+            self.changes.close(report)
+            write_json_report('auth_context_fixes_report.json', report)
             
             # Formato texto
             with open('auth_context_fixes_report.txt', 'w', encoding='utf-8') as f:
@@ -527,7 +524,7 @@ export default AuthProvider;
                 f.write("\n")
                 
                 f.write("== MUDANÇAS REALIZADAS ==\n")
-                for change in self.changes_made:
+                for change in self.changes:
                     f.write(f"Arquivo: {change['file']}\n")
                     f.write(f"  {change['change']}\n\n")
                 
@@ -540,12 +537,17 @@ def main():
     
     parser = argparse.ArgumentParser(description='Corrigir problemas no AuthContext e useAuth')
     parser.add_argument('--dry-run', action='store_true', help='Apenas mostrar mudanças sem aplicá-las')
+    parser.add_argument('--no-cache', action='store_true', help='Ignorar o cache de análise em .cache/')
+    parser.add_argument('--jobs', type=int, default=1, help='Threads para gravar os arquivos alterados (padrão: 1)')
+    parser.add_argument('--profile', metavar='ARQUIVO', help='Gravar um perfil cProfile da execução em ARQUIVO')
     
     args = parser.parse_args()
     
-    fixer = AuthContextFixer(PROJECT_ROOT, dry_run=args.dry_run)
-    fixer.scan_directory()
-    fixer.run()
+    fixer = AuthContextFixer(PROJECT_ROOT, dry_run=args.dry_run, use_cache=not args.no_cache,
+                             jobs=args.jobs)
+    with profiled(args.profile):
+        fixer.scan_directory()
+        fixer.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
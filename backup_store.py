@@ -0,0 +1,104 @@
+"""
+Armazenamento de backups endereçado por conteúdo do projeto Agenda Livre.
+
+Todos os corretores fazem backup por aqui antes de alterar um arquivo:
+1. O conteúdo é gravado uma única vez em backups/store/blobs/<hash>
+2. Cada execução grava um manifesto (caminho original -> hash) em
+   backups/store/manifests/<execução>.json
+3. Arquivos idênticos nunca são duplicados, não importa quantas execuções
+   façam backup deles
+
+Os manifestos também guardam o necessário para desfazer uma execução
+(ver apply_engine.py).
+
+O diretório de backups é sempre excluído da varredura (ver workspace_scanner.py),
+então uma execução nunca faz backup dos backups de uma execução anterior.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+# Configurações
+BACKUP_ROOT = 'backups'
+STORE_DIR = os.path.join(BACKUP_ROOT, 'store')
+
+
+class BackupStore:
+    def __init__(self, root_dir, tool, dry_run=False):
+        self.root_dir = root_dir
+        self.tool = tool
+        self.dry_run = dry_run
+        self.store_dir = os.path.join(root_dir, STORE_DIR)
+        self.run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{tool}"
+        self.files = {}  # caminho original -> hash do conteúdo
+        self.stats = {'files': 0, 'blobs_written': 0, 'blobs_reused': 0}
+
+    def blob_path(self, digest):
+        return os.path.join(self.store_dir, 'blobs', digest[:2], digest)
+
+    def backup(self, file_path):
+        """Guarda o conteúdo atual de um arquivo e retorna o caminho do blob."""
+        if self.dry_run:
+            return None
+
+        # Um arquivo só precisa de um backup por execução (o conteúdo original)
+        if file_path in self.files:
+            return self.blob_path(self.files[file_path])
+
+        with open(os.path.join(self.root_dir, file_path), 'rb') as f:
+            data = f.read()
+
+        digest = hashlib.sha1(data).hexdigest()
+        blob_path = self.blob_path(digest)
+
+        if os.path.exists(blob_path):
+            self.stats['blobs_reused'] += 1
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = blob_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, blob_path)
+            self.stats['blobs_written'] += 1
+
+        self.files[file_path] = digest
+        self.stats['files'] += 1
+
+        return blob_path
+
+    def save_manifest(self, status=None, created=None, written=None):
+        """
+        Grava o manifesto da execução; retorna o caminho ou None se não houve
+        backups nem arquivos criados.
+
+        `status`, `created` (arquivos novos) e `written` (hash do conteúdo
+        escrito) são usados pelo desfazer do apply_engine.py.
+        """
+        if self.dry_run or not (self.files or created):
+            return None
+
+        manifest_dir = os.path.join(self.store_dir, 'manifests')
+        os.makedirs(manifest_dir, exist_ok=True)
+        manifest_path = os.path.join(manifest_dir, f"{self.run_id}.json")
+
+        manifest = {
+            'run_id': self.run_id,
+            'tool': self.tool,
+            'created_at': datetime.now().isoformat(),
+            'files': self.files,
+        }
+        if status is not None:
+            manifest['status'] = status
+        if created is not None:
+            manifest['created'] = created
+        if written is not None:
+            manifest['written'] = written
+
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+        return manifest_path
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark da detecção de componentes do deduplicador em entradas patológicas.
+
+Compara, em textos gerados de tamanho crescente (dobrando a cada passo):
+1. Os padrões antigos (seis re.search com re.DOTALL, incluindo .*? que pode
+   atravessar o arquivo inteiro)
+2. file_facts.looks_like_component (cabeçalho limitado e sinais sem .*)
+
+Para cada entrada mostra o tempo por tamanho e o fator de crescimento a cada
+vez que o tamanho dobra: perto de 2x é custo linear, perto de 4x é
+quadrático. Os padrões antigos só rodam até --legacy-max-chars, já que nas
+entradas maiores levariam minutos.
+
+Uso: python benchmarks/component_detection.py [--max-chars N] [--repeat N]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_facts import looks_like_component
+
+# Configurações
+MIN_CHARS = 16 * 1024
+MAX_GROWTH = 3.0  # Fator por duplicação acima do qual o custo é considerado superlinear
+
+# Padrões usados antes (component_deduplicator / file_facts)
+LEGACY_PATTERNS = [
+    r'(import React|from [\'"]react[\'"](;|,))',
+    r'function\s+\w+\s*\(\s*{\s*.*?\s*}\s*\)',
+    r'const\s+\w+\s*=\s*\(\s*{\s*.*?\s*}\s*\)',
+    r'class\s+\w+\s+extends\s+(React\.)?Component',
+    r'export\s+(default\s+)?function\s+\w+',
+    r'export\s+(default\s+)?const\s+\w+\s*=\s*\('
+]
+
+
+def legacy_looks_like_component(content):
+    for pattern in LEGACY_PATTERNS:
+        if re.search(pattern, content, re.DOTALL):
+            return True
+    return False
+
+
+def _repeat(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+# Nome -> função(tamanho) que gera o texto
+INPUTS = {
+    # Cada 'function a({' abre um .*? que vai até o fim do arquivo sem achar '})'
+    'funcoes-sem-fechamento': lambda size: _repeat('function a({ b, ', size),
+    'arrows-sem-fechamento': lambda size: _repeat('const a = ({ b, ', size),
+    # Pacote minificado: uma única linha enorme
+    'minificado': lambda size: _repeat('var a=function(b){return b.c+1},d=[a,e];', size),
+    # Palavra-chave seguida de um espaço em branco enorme
+    'espacos': lambda size: 'function' + ' ' * (size - 8),
+    # Identificador enorme depois de 'class'
+    'identificador-longo': lambda size: 'class ' + 'x' * (size - 6),
+    # Quase JSX: 'return (' sem '<' depois, em todas as posições
+    'return-sem-jsx': lambda size: _repeat('return (  a; ', size),
+    # Milhares de linhas curtas: o restante do arquivo é só declarações de nível superior
+    'linhas-curtas': lambda size: _repeat('a = b;\n', size),
+}
+
+
+def measure(detect, content, repeat):
+    """Melhor tempo (s) de `repeat` chamadas, e o resultado."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = detect(content)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def growth(times):
+    """Maior fator de crescimento entre tamanhos consecutivos (ignora tempos muito pequenos)."""
+    factors = [later / earlier for earlier, later in zip(times, times[1:]) if earlier > 1e-4]
+    return max(factors) if factors else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detecção de componentes em entradas patológicas")
+    parser.add_argument('--max-chars', type=int, default=4 * 1024 * 1024, help="Maior entrada (caracteres)")
+    parser.add_argument('--legacy-max-chars', type=int, default=128 * 1024,
+                        help="Maior entrada medida com os padrões antigos")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições; vale o melhor tempo")
+    args = parser.parse_args()
+
+    sizes = []
+    size = MIN_CHARS
+    while size <= args.max_chars:
+        sizes.append(size)
+        size *= 2
+
+    superlinear = []
+    for name, generate in INPUTS.items():
+        print(f"\n{name}")
+        print(f"  {'caracteres':>12} {'antigo (ms)':>12} {'novo (ms)':>12}  componente (antigo/novo)")
+        legacy_times = []
+        new_times = []
+        for size in sizes:
+            content = generate(size)
+            new_time, found = measure(looks_like_component, content, args.repeat)
+            new_times.append(new_time)
+            legacy = legacy_found = '-'
+            if size <= args.legacy_max_chars:
+                legacy_time, legacy_found = measure(legacy_looks_like_component, content, 1)
+                legacy_times.append(legacy_time)
+                legacy = f"{legacy_time * 1000:.2f}"
+            print(f"  {size:>12} {legacy:>12} {new_time * 1000:>12.2f}  {legacy_found}/{found}")
+
+        legacy_growth = growth(legacy_times)
+        new_growth = growth(new_times)
+        if legacy_growth is not None:
+            print(f"  Crescimento por duplicação: antigo {legacy_growth:.1f}x", end='')
+        else:
+            print("  Crescimento por duplicação: antigo -", end='')
+        print(f", novo {new_growth:.1f}x" if new_growth is not None else ", novo -")
+        if new_growth is not None and new_growth > MAX_GROWTH:
+            superlinear.append(name)
+
+    if superlinear:
+        print(f"\nCusto superlinear em: {', '.join(superlinear)}")
+        sys.exit(1)
+    print("\nNenhuma entrada com crescimento superlinear na detecção nova.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark da extração de importações do projeto Agenda Livre.
+
+Compara, sobre os arquivos de src/ e pages/ (ou outros diretórios):
+1. Os regex antigos (um findall por padrão, cada um relendo o arquivo)
+2. O lexer de passada única (import_lexer.py)
+
+Mostra o tempo de cada abordagem e as importações encontradas só por uma
+delas (por exemplo, importações em várias linhas ou dentro de strings).
+
+No fim mede o lexer em entradas patológicas de tamanho crescente (milhares de
+`import a` sem from, que não podem ser lidos até o fim do arquivo a cada
+import) e sai com erro se o tempo crescer mais que linearmente.
+
+Uso: python benchmarks/import_extraction.py [--repeat N] [diretórios...]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_cache import read_text
+from import_lexer import scan_imports
+from workspace_scanner import iter_files
+
+# Configurações
+DEFAULT_DIRS = ['src', 'pages']
+CODE_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx']
+PATHOLOGICAL_MIN_IMPORTS = 2000
+MAX_GROWTH = 3.0  # Fator por duplicação acima do qual o custo é considerado superlinear
+
+# Nome -> unidade repetida nas entradas patológicas
+PATHOLOGICAL_INPUTS = {
+    'import-sem-from': "import a\n",
+    'import-lista-sem-from': "import a, b\n",
+    'import-chaves-sem-from': "import {\n  a,\n  b }\n",
+}
+
+# Padrões usados antes do lexer
+REGEX_PATTERNS = [
+    r'import\s+.*?from\s+[\'"](.+?)[\'"]',  # import X from 'path'
+    r'require\([\'"](.+?)[\'"]\)',          # require('path')
+    r'import\([\'"](.+?)[\'"]\)',           # import('path')
+]
+
+
+def extract_with_regex(content):
+    imports = []
+    for pattern in REGEX_PATTERNS:
+        imports.extend(re.findall(pattern, content))
+    return imports
+
+
+def extract_with_lexer(content):
+    return [record.specifier for record in scan_imports(content)]
+
+
+def load_sources(root_dir, directories):
+    """Lê os arquivos de código dos diretórios informados (fora da medição)."""
+    prefixes = tuple(directory.rstrip('/\\') + os.sep for directory in directories)
+    sources = []
+    for entry in iter_files(root_dir, CODE_EXTENSIONS):
+        if entry.path.startswith(prefixes):
+            content, _ = read_text(os.path.join(root_dir, entry.path))
+            sources.append((entry.path, content))
+    return sources
+
+
+def measure(extract, sources, repeat):
+    """Melhor tempo (s) de `repeat` passadas sobre todos os arquivos, e o último resultado."""
+    best = None
+    results = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [extract(content) for _, content in sources]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def measure_pathological(max_imports, repeat):
+    """Tempo do lexer por entrada e tamanho; retorna as entradas com crescimento superlinear."""
+    superlinear = []
+    for name, unit in PATHOLOGICAL_INPUTS.items():
+        print(f"\n{name}")
+        times = []
+        count = PATHOLOGICAL_MIN_IMPORTS
+        while count <= max_imports:
+            elapsed, _ = measure(extract_with_lexer, [(name, unit * count)], repeat)
+            times.append(elapsed)
+            print(f"  {count:>8} imports: {elapsed * 1000:8.2f} ms")
+            count *= 2
+
+        factors = [later / earlier for earlier, later in zip(times, times[1:]) if earlier > 1e-4]
+        if factors:
+            print(f"  Crescimento por duplicação: {max(factors):.1f}x")
+            if max(factors) > MAX_GROWTH:
+                superlinear.append(name)
+    return superlinear
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara regex e lexer na extração de importações")
+    parser.add_argument('directories', nargs='*', default=DEFAULT_DIRS,
+                        help="Diretórios a medir (padrão: src pages)")
+    parser.add_argument('--root', default='.', help="Raiz do projeto")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetições; vale o melhor tempo")
+    parser.add_argument('--pathological-max', type=int, default=64000,
+                        help="Maior número de imports nas entradas patológicas")
+    args = parser.parse_args()
+
+    sources = load_sources(args.root, args.directories)
+    total_bytes = sum(len(content) for _, content in sources)
+    print(f"Arquivos: {len(sources)} ({total_bytes / 1024:.1f} KiB) em {', '.join(args.directories)}")
+
+    regex_time, regex_results = measure(extract_with_regex, sources, args.repeat)
+    lexer_time, lexer_results = measure(extract_with_lexer, sources, args.repeat)
+
+    print(f"Regex: {regex_time * 1000:8.2f} ms  ({sum(map(len, regex_results))} importações)")
+    print(f"Lexer: {lexer_time * 1000:8.2f} ms  ({sum(map(len, lexer_results))} importações)")
+    if regex_time:
+        print(f"Lexer / regex: {lexer_time / regex_time:.2f}x")
+
+    # Diferenças por arquivo
+    for (path, _), regex_found, lexer_found in zip(sources, regex_results, lexer_results):
+        only_regex = Counter(regex_found) - Counter(lexer_found)
+        only_lexer = Counter(lexer_found) - Counter(regex_found)
+        if only_regex or only_lexer:
+            print(f"\n{path}")
+            for specifier in only_regex.elements():
+                print(f"  só regex: {specifier}")
+            for specifier in only_lexer.elements():
+                print(f"  só lexer: {specifier}")
+
+    superlinear = measure_pathological(args.pathological_max, args.repeat)
+    if superlinear:
+        print(f"\nCusto superlinear em: {', '.join(superlinear)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
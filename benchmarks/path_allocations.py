@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark de alocações de caminhos na varredura e nas consultas por arquivo.
+
+Compara, com tracemalloc, sobre o mesmo projeto:
+1. Varredura antiga (Path(raiz) / arquivo, relative_to, str e Path.suffix por
+   arquivo, com o caminho guardado em cada entrada) contra WorkspaceScanner
+   com a PathTable (cada arquivo é id do diretório + nome, extensões da
+   configuração)
+2. Consultas antigas por arquivo (str(Path(arquivo).parent) da estrutura,
+   module_dir das importações, Path(...).parent do AuthContext mais próximo)
+   contra as mesmas consultas na PathTable
+
+Para cada etapa mostra a memória retida pelo resultado (KiB), os blocos
+retidos por arquivo, o pico e o tempo. Os .gitignore não são aplicados, para
+as duas varreduras verem os mesmos arquivos.
+
+Uso: python benchmarks/path_allocations.py [--root DIR] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backup_store import BACKUP_ROOT
+from module_index import module_dir
+from workspace_scanner import IGNORE_DIRS, SCAN_EXTENSIONS, WorkspaceScanner
+
+# Configurações
+AUTH_CONTEXT_DIRS = ['src/contexts', 'src/context']  # Diretórios de AuthContext simulados nas consultas
+
+# Entrada do inventário antes da PathTable: caminho relativo completo por arquivo
+LegacyEntry = namedtuple('LegacyEntry', ['path', 'name', 'ext', 'size', 'mtime'])
+
+
+def legacy_scan(root_dir):
+    """Varredura como antes: Path absoluto, relativo e sufixo novos por arquivo."""
+    root = Path(root_dir)
+    ignore_dirs = set(IGNORE_DIRS) | {BACKUP_ROOT}
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in ignore_dirs and not os.path.islink(os.path.join(dirpath, d))]
+        for filename in filenames:
+            file_path = Path(dirpath) / filename
+            if file_path.suffix in SCAN_EXTENSIONS:
+                stat = file_path.stat()
+                files.append(LegacyEntry(str(file_path.relative_to(root)), filename, file_path.suffix,
+                                         stat.st_size, stat.st_mtime))
+    return files
+
+
+def new_scan(root_dir):
+    scanner = WorkspaceScanner(root_dir, use_gitignore=False)
+    entries = scanner.scan()
+    return entries, scanner.paths
+
+
+def legacy_lookups(files, auth_dirs):
+    """Consultas como antes: cada uma embrulha o caminho em um Path novo."""
+    results = []
+    for file_path in files:
+        structure_dir = str(Path(file_path).parent)
+        import_dir = module_dir(file_path)
+        file_dir = str(Path(file_path).parent)
+        closest = next((d for d in auth_dirs if file_dir.startswith(d) or d.startswith(file_dir)), None)
+        results.append((structure_dir, import_dir, closest))
+    return results
+
+
+def new_lookups(files, auth_dirs, paths):
+    results = []
+    for file_path in files:
+        structure_dir = paths.display_dir(file_path)
+        import_dir = paths.module_dir(file_path)
+        closest = next((d for d in auth_dirs if structure_dir.startswith(d) or d.startswith(structure_dir)), None)
+        results.append((structure_dir, import_dir, closest))
+    return results
+
+
+def measure(function, *args):
+    """(resultado, KiB retidos, blocos retidos, KiB de pico, segundos) de uma chamada."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    retained = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    return result, retained / 1024, blocks, peak / 1024, elapsed
+
+
+def best_time(function, repeat, *args):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(label, files, retained, blocks, peak, elapsed):
+    per_file = blocks / files if files else 0
+    print(f"  {label:<8} {retained:>10.1f} {per_file:>14.2f} {peak:>10.1f} {elapsed * 1000:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alocações de caminhos na varredura e nas consultas")
+    parser.add_argument('--root', default='.', help="Raiz do projeto")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetições do tempo; vale o melhor")
+    args = parser.parse_args()
+
+    header = f"  {'':<8} {'retido KiB':>10} {'blocos/arquivo':>14} {'pico KiB':>10} {'tempo ms':>10}"
+
+    legacy_files, legacy_kib, legacy_blocks, legacy_peak, _ = measure(legacy_scan, args.root)
+    (entries, paths), new_kib, new_blocks, new_peak, _ = measure(new_scan, args.root)
+    if [entry.path for entry in legacy_files] != [entry.path for entry in entries]:
+        print("Aviso: as duas varreduras encontraram arquivos diferentes (ou em outra ordem)")
+
+    files = [entry.path for entry in entries]
+    print(f"Arquivos: {len(files)} em {len(paths.dirs)} diretórios")
+    print("\nVarredura")
+    print(header)
+    report('antiga', len(legacy_files), legacy_kib, legacy_blocks, legacy_peak,
+           best_time(legacy_scan, args.repeat, args.root))
+    report('nova', len(files), new_kib, new_blocks, new_peak,
+           best_time(new_scan, args.repeat, args.root))
+
+    auth_dirs = [os.path.normpath(directory) for directory in AUTH_CONTEXT_DIRS]
+    legacy_results, legacy_kib, legacy_blocks, legacy_peak, _ = measure(legacy_lookups, files, auth_dirs)
+    new_results, new_kib, new_blocks, new_peak, _ = measure(new_lookups, files, auth_dirs, paths)
+    if legacy_results != new_results:
+        print("Aviso: as consultas antigas e novas deram resultados diferentes")
+
+    print("\nConsultas por arquivo (diretório, diretório de módulo, AuthContext mais próximo)")
+    print(header)
+    report('antiga', len(files), legacy_kib, legacy_blocks, legacy_peak,
+           best_time(legacy_lookups, args.repeat, files, auth_dirs))
+    report('nova', len(files), new_kib, new_blocks, new_peak,
+           best_time(new_lookups, args.repeat, files, auth_dirs, paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks das ferramentas do projeto Agenda Livre.
+
+Para cada tamanho pedido (padrão: 1k, 10k e 50k arquivos):
+1. Gera um projeto sintético com a forma deste repositório (ver
+   synthetic_project.py)
+2. Roda cada ferramenta (ProjectAnalyzer, ComponentDeduplicator,
+   AuthContextFixer, UserTypeFixer) de ponta a ponta em uma cópia da árvore,
+   duas vezes: 'cold' (sem cache em .cache/) e 'warm' (cache preenchido).
+   Antes da execução 'warm' os arquivos do projeto são restaurados (só o
+   .cache/ fica), para os corretores receberem a mesma entrada da 'cold'
+3. Mede o tempo total e o de cada fase (métodos das ferramentas)
+
+Os resultados vão para um JSON em benchmarks/results/ (com o commit atual),
+para comparar versões; --baseline mostra a variação em relação a um JSON
+anterior.
+
+Uso: python benchmarks/run_suite.py [--sizes 1000 10000 50000] [--tools analyze dedupe ...]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from auth_context_fixer import AuthContextFixer
+from file_cache import CACHE_DIR
+from component_deduplicator import ComponentDeduplicator
+from project_analyzer import ProjectAnalyzer
+from synthetic_project import generate_project
+from user_type_fixer import UserTypeFixer
+from workspace_scanner import invalidate
+
+# Configurações
+DEFAULT_SIZES = [1000, 10000, 50000]
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmarks', 'results')
+REGRESSION_THRESHOLD = 0.10  # Mais lento que isso em relação à base é sinalizado
+
+
+def _run_analyzer(analyzer):
+    analyzer.scan_directory()
+    analyzer.analyze_imports()
+    analyzer.find_duplications()
+    analyzer.generate_report()
+
+
+def _run_fixer(fixer):
+    fixer.scan_directory()
+    fixer.run()
+
+
+# Ferramenta -> (construtor, execução, fases medidas). Fases aninhadas (ex.:
+# analyze_dependencies dentro de generate_report) também contam no tempo da
+# fase que as chama.
+TOOLS = {
+    'analyze': (
+        lambda jobs: ProjectAnalyzer('.', jobs=jobs),
+        _run_analyzer,
+        ['scan_directory', 'analyze_imports', 'find_duplications', 'generate_report',
+         'analyze_typescript_errors', 'analyze_structure', 'analyze_dependencies',
+         'analyze_similar_components'],
+    ),
+    'dedupe': (
+        lambda jobs: ComponentDeduplicator('.', jobs=jobs),
+        _run_fixer,
+        ['scan_directory', 'find_duplicates', 'choose_canonical_components', 'create_redirects',
+         'plan.apply', '_generate_report'],
+    ),
+    'fix-auth': (
+        lambda jobs: AuthContextFixer('.', jobs=jobs),
+        _run_fixer,
+        ['scan_directory', 'fix_auth_context', 'fix_useauth_imports', 'plan.apply', '_generate_report'],
+    ),
+    'fix-user-type': (
+        lambda jobs: UserTypeFixer('.', jobs=jobs),
+        _run_fixer,
+        ['scan_directory', 'update_user_type_definitions', 'create_user_type_if_missing',
+         'update_user_references', 'plan.apply', '_generate_report'],
+    ),
+}
+
+
+def _timed(method, name, timings):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+    return wrapper
+
+
+def _instrument(tool, phases, timings):
+    """Troca os métodos das fases (ex.: 'plan.apply') por versões cronometradas."""
+    for phase in phases:
+        target = tool
+        *parents, attribute = phase.split('.')
+        for parent in parents:
+            target = getattr(target, parent)
+        setattr(target, attribute, _timed(getattr(target, attribute), phase, timings))
+
+
+def run_tool(name, tree_dir, jobs):
+    """Roda uma ferramenta dentro de `tree_dir`; retorna (tempo total, tempos por fase)."""
+    factory, execute, phases = TOOLS[name]
+    cwd = os.getcwd()
+    timings = {}
+    os.chdir(tree_dir)
+    try:
+        # Inventário em memória descartado: cada execução varre o disco de novo
+        invalidate()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            tool = factory(jobs)
+            _instrument(tool, phases, timings)
+            execute(tool)
+            total = time.perf_counter() - started
+            cache = getattr(tool, 'cache', None)
+            if cache is not None:
+                cache.close()
+    finally:
+        os.chdir(cwd)
+    return total, timings
+
+
+def restore_tree(source_dir, tree_dir):
+    """Volta `tree_dir` ao conteúdo de `source_dir`, mantendo apenas o cache."""
+    for name in os.listdir(tree_dir):
+        if name == CACHE_DIR:
+            continue
+        path = os.path.join(tree_dir, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    # copy2 preserva os mtimes, então o cache reconhece os arquivos restaurados
+    shutil.copytree(source_dir, tree_dir, dirs_exist_ok=True)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Mostra a variação do tempo total em relação a um JSON de resultados anterior."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    previous = {(r['tool'], r['files'], r['run']): r['total_s'] for r in baseline['results']}
+    print(f"\nComparação com {baseline_path} (commit {baseline.get('commit')}):")
+    for result in results:
+        key = (result['tool'], result['files'], result['run'])
+        if key not in previous or not previous[key]:
+            continue
+        change = result['total_s'] / previous[key] - 1
+        flag = '  REGRESSÃO' if change > REGRESSION_THRESHOLD else ''
+        print(f"  {key[0]:14} {key[1]:>7} {key[2]:5} {previous[key]:8.2f}s -> {result['total_s']:8.2f}s "
+              f"({change:+.0%}){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks das ferramentas em projetos sintéticos')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Número de arquivos de cada projeto (padrão: 1000 10000 50000)')
+    parser.add_argument('--tools', nargs='+', choices=list(TOOLS), default=list(TOOLS),
+                        help='Ferramentas a medir (padrão: todas)')
+    parser.add_argument('--fanout', type=int, default=4, help='Importações por arquivo')
+    parser.add_argument('--duplicates', type=float, default=0.1, help='Fração de componentes duplicados')
+    parser.add_argument('--seed', type=int, default=0, help='Semente do gerador')
+    parser.add_argument('--jobs', type=int, default=1, help='Repassado às ferramentas')
+    parser.add_argument('--workdir', help='Onde gerar os projetos (padrão: diretório temporário)')
+    parser.add_argument('--output', help='Arquivo JSON de saída (padrão: benchmarks/results/<data>_<commit>.json)')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+
+    commit = git_commit()
+    workdir = args.workdir or tempfile.mkdtemp(prefix='agenda_bench_')
+    results = []
+
+    try:
+        for size in args.sizes:
+            source_dir = os.path.join(workdir, f'projeto_{size}')
+            shutil.rmtree(source_dir, ignore_errors=True)
+            started = time.perf_counter()
+            generated = generate_project(source_dir, files=size, fanout=args.fanout,
+                                         duplicate_ratio=args.duplicates, seed=args.seed)
+            print(f"Projeto de {size} arquivos gerado em {time.perf_counter() - started:.1f}s")
+
+            for name in args.tools:
+                # Cada ferramenta em uma cópia nova, porque os corretores alteram a árvore
+                tree_dir = os.path.join(workdir, f'execucao_{size}')
+                shutil.rmtree(tree_dir, ignore_errors=True)
+                shutil.copytree(source_dir, tree_dir)
+
+                for run in ('cold', 'warm'):
+                    if run == 'warm':
+                        restore_tree(source_dir, tree_dir)
+                    total, phases = run_tool(name, tree_dir, args.jobs)
+                    results.append({
+                        'tool': name,
+                        'files': size,
+                        'run': run,
+                        'total_s': round(total, 4),
+                        'phases': {phase: round(seconds, 4) for phase, seconds in phases.items()},
+                        'generated': generated,
+                    })
+                    print(f"  {name:14} {run:5} {total:8.2f}s")
+
+                shutil.rmtree(tree_dir, ignore_errors=True)
+            shutil.rmtree(source_dir, ignore_errors=True)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{commit or 'sem-commit'}.json")
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'options': {
+                'fanout': args.fanout,
+                'duplicates': args.duplicates,
+                'seed': args.seed,
+                'jobs': args.jobs,
+            },
+            'results': results,
+        }, f, indent=2)
+    print(f"\nResultados salvos em {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Gerador de projetos Next.js sintéticos para os benchmarks do projeto Agenda Livre.
+
+Cria uma árvore com a mesma forma deste repositório, com tamanho controlado:
+1. src/components/<grupo>/, components/<grupo>/, pages/<seção>/, src/utils,
+   src/services, hooks/ e estilos .css
+2. contexts/AuthContext.tsx, src/contexts/AuthContext.tsx, hooks/useAuth.ts
+   e src/types/user.ts (o que os corretores procuram)
+3. Importações relativas e pelo alias `@/` (tsconfig.json), com fan-out
+   configurável, algumas quebradas e alguns ciclos
+4. Páginas que importam useAuth de locais certos e errados e usam
+   user.firstName / user.first_name
+5. Componentes duplicados (cópias exatas e quase iguais) com a fração pedida
+6. Cópias antigas em backups/ e .history/ (aninhadas), que a varredura ignora
+
+Com a mesma semente a árvore gerada é sempre a mesma.
+
+Uso: python benchmarks/synthetic_project.py DESTINO [--files N] [--fanout N] ...
+"""
+
+import argparse
+import json
+import os
+import random
+
+# Configurações
+COMPONENT_GROUPS = ['ui', 'layouts', 'forms', 'dashboard', 'booking', 'profile', 'calendar', 'services']
+PAGE_SECTIONS = ['auth', 'client', 'professional', 'dashboard', 'admin', 'booking']
+LIB_DIRS = ['src/utils', 'src/services', 'src/hooks', 'utils', 'services']
+HISTORY_STAMP = '20250414_181421'
+
+# Proporção de cada tipo entre os arquivos gerados
+SHARE_COMPONENTS = 0.55
+SHARE_PAGES = 0.25
+SHARE_LIBS = 0.15
+# O restante são estilos .css
+
+WORDS = [
+    'agenda', 'horario', 'cliente', 'servico', 'profissional', 'reserva', 'pagamento',
+    'perfil', 'avaliacao', 'calendario', 'semana', 'mes', 'dia', 'inicio', 'fim',
+    'status', 'pendente', 'confirmado', 'cancelado', 'valor', 'desconto', 'categoria',
+    'endereco', 'telefone', 'email', 'senha', 'token', 'sessao', 'filtro', 'busca',
+    'lista', 'item', 'detalhe', 'resumo', 'total', 'parcial', 'nota', 'comentario',
+    'foto', 'galeria', 'mapa', 'cidade', 'bairro', 'estado', 'pais', 'idioma',
+    'tema', 'cor', 'tamanho', 'ordem', 'pagina', 'limite', 'offset', 'erro',
+    'aviso', 'sucesso', 'carregando', 'vazio', 'aberto', 'fechado', 'ativo', 'inativo',
+]
+
+# Arquivos fixos que os corretores esperam encontrar
+AUTH_CONTEXT = """import React, {{ createContext, useContext, useState }} from 'react';
+
+const AuthContext = createContext(undefined);
+
+export function AuthProvider({{ children }}) {{
+  const [user, setUser] = useState(null);
+  return <AuthContext.Provider value={{{{ user, setUser }}}}>{{children}}</AuthContext.Provider>;
+}}
+
+{use_auth}
+
+export default AuthContext;
+"""
+
+USE_AUTH_HOOK = """import {{ useContext }} from 'react';
+import AuthContext from '../contexts/AuthContext';
+
+export function useAuth() {{
+  return useContext(AuthContext);
+}}
+"""
+
+USER_TYPE = """export type User = {
+  id: string;
+  first_name: string;
+  last_name: string;
+  email: string;
+};
+"""
+
+TSCONFIG = {
+    'compilerOptions': {
+        'baseUrl': '.',
+        'paths': {'@/*': ['src/*']},
+        'jsx': 'preserve',
+        'allowJs': True,
+    },
+    'include': ['**/*.ts', '**/*.tsx'],
+    'exclude': ['node_modules'],
+}
+
+
+def _camel(rng, words=2):
+    return ''.join(rng.choice(WORDS).capitalize() for _ in range(words))
+
+
+def _body_lines(rng, lines):
+    """Corpo com palavras aleatórias, para que componentes diferentes não pareçam cópias."""
+    body = []
+    for _ in range(lines):
+        a, b, c = rng.choice(WORDS), rng.choice(WORDS), rng.choice(WORDS)
+        kind = rng.randrange(4)
+        if kind == 0:
+            body.append(f"  const {a}{b.capitalize()} = props.{c} ?? '{rng.choice(WORDS)}';")
+        elif kind == 1:
+            body.append(f"  if ({a} && {b}.length > {rng.randrange(100)}) {{ {c}({a}); }}")
+        elif kind == 2:
+            body.append(f"  // {a} {b} {c} {rng.choice(WORDS)}")
+        else:
+            body.append(f"  const [{a}, set{a.capitalize()}] = useState({rng.randrange(1000)});")
+    return body
+
+
+def _import_specifier(rng, source_path, target_path):
+    """Especificador de `source_path` para `target_path`: relativo ou pelo alias @/."""
+    target = os.path.splitext(target_path)[0]
+    if target.startswith('src/') and rng.random() < 0.3:
+        return '@/' + target[len('src/'):]
+    specifier = os.path.relpath(target, os.path.dirname(source_path)).replace(os.sep, '/')
+    return specifier if specifier.startswith('.') else './' + specifier
+
+
+def _plan_files(rng, files, duplicate_ratio):
+    """Lista de (caminho, tipo, nome) dos arquivos a gerar, sem os fixos."""
+    planned = []
+    used = set()
+
+    def unique(path):
+        base, ext = os.path.splitext(path)
+        candidate, n = path, 1
+        while candidate in used:
+            candidate = f"{base}{n}{ext}"
+            n += 1
+        used.add(candidate)
+        return candidate
+
+    n_components = int(files * SHARE_COMPONENTS)
+    n_pages = int(files * SHARE_PAGES)
+    n_libs = int(files * SHARE_LIBS)
+    n_styles = max(files - n_components - n_pages - n_libs, 0)
+    n_duplicates = int(n_components * duplicate_ratio)
+
+    for i in range(n_components - n_duplicates):
+        name = _camel(rng)
+        group = rng.choice(COMPONENT_GROUPS)
+        ext = rng.choice(['.tsx', '.tsx', '.jsx', '.js'])
+        planned.append((unique(f"src/components/{group}/{name}{ext}"), 'component', name))
+
+    # Duplicatas: mesmo nome em components/ (como neste repositório), conteúdo copiado
+    originals = [item for item in planned if item[1] == 'component']
+    for i in range(n_duplicates):
+        original = rng.choice(originals)
+        group = original[0].split('/')[2]
+        path = unique(f"components/{group}/{os.path.basename(original[0])}")
+        planned.append((path, 'duplicate', original[0]))
+
+    for i in range(n_pages):
+        section = rng.choice(PAGE_SECTIONS)
+        name = rng.choice(WORDS)
+        planned.append((unique(f"pages/{section}/{name}.js"), 'page', name))
+
+    for i in range(n_libs):
+        name = rng.choice(WORDS) + _camel(rng, 1)
+        planned.append((unique(f"{rng.choice(LIB_DIRS)}/{name}.ts"), 'lib', name))
+
+    for i in range(n_styles):
+        planned.append((unique(f"styles/{rng.choice(WORDS)}.css"), 'style', None))
+
+    return planned
+
+
+def _render(rng, path, kind, name, importables, fanout, broken_ratio, contents):
+    """Conteúdo de um arquivo; `importables` são os arquivos gerados antes dele."""
+    if kind == 'style':
+        return ''.join(f".{rng.choice(WORDS)} {{ color: #{rng.randrange(0xffffff):06x}; }}\n" for _ in range(10))
+
+    if kind == 'duplicate':
+        content = contents[name]
+        if rng.random() < 0.5:
+            return content  # Cópia exata
+        # Quase igual: uma linha do corpo trocada
+        lines = content.split('\n')
+        lines[len(lines) // 2] = f"  // ajuste {rng.choice(WORDS)} {rng.choice(WORDS)}"
+        return '\n'.join(lines)
+
+    lines = []
+    if kind in ('component', 'page'):
+        lines.append("import React, { useState } from 'react';")
+
+    targets = rng.sample(importables, min(fanout, len(importables))) if importables else []
+    for target in targets:
+        alias = 'M' + os.path.splitext(os.path.basename(target))[0]
+        lines.append(f"import {alias} from '{_import_specifier(rng, path, target)}';")
+    if rng.random() < broken_ratio:
+        lines.append(f"import Missing from './{_camel(rng)}Missing';")
+
+    if kind == 'page':
+        if rng.random() < 0.3:
+            lines.append(f"import {{ useAuth }} from '{_import_specifier(rng, path, 'hooks/useAuthOld.ts')}';")
+        else:
+            lines.append(f"import {{ useAuth }} from '{_import_specifier(rng, path, 'src/contexts/AuthContext.tsx')}';")
+
+    lines.append('')
+    component = name if kind == 'component' else _camel(rng)
+    lines.append(f"export default function {component}(props) {{")
+    if kind == 'page':
+        field = rng.choice(['user.firstName', 'user.first_name'])
+        lines.append("  const { user } = useAuth();")
+        lines.append(f"  const nome = {field};")
+    lines.extend(_body_lines(rng, rng.randrange(15, 40)))
+    lines.append(f"  return <div className=\"{rng.choice(WORDS)}\">{{props.{rng.choice(WORDS)}}}</div>;")
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def _write(root_dir, path, content):
+    full_path = os.path.join(root_dir, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def generate_project(root_dir, files=1000, fanout=4, duplicate_ratio=0.1, history_ratio=0.1,
+                     broken_ratio=0.02, cycle_ratio=0.01, seed=0):
+    """
+    Gera o projeto em `root_dir` (que deve estar vazio ou não existir).
+
+    `files` é o número de arquivos ativos (fora backups/.history). Retorna um
+    dicionário com as contagens do que foi gerado.
+    """
+    rng = random.Random(seed)
+    os.makedirs(root_dir, exist_ok=True)
+
+    _write(root_dir, 'tsconfig.json', json.dumps(TSCONFIG, indent=2))
+    _write(root_dir, 'package.json', json.dumps({'name': 'agenda-livre-sintetico', 'private': True}, indent=2))
+    _write(root_dir, 'contexts/AuthContext.tsx', AUTH_CONTEXT.format(use_auth=''))
+    _write(root_dir, 'src/contexts/AuthContext.tsx',
+           AUTH_CONTEXT.format(use_auth='function useAuth() {\n  return useContext(AuthContext);\n}'))
+    _write(root_dir, 'hooks/useAuth.ts', USE_AUTH_HOOK.format())
+    _write(root_dir, 'src/types/user.ts', USER_TYPE)
+
+    planned = _plan_files(rng, files, duplicate_ratio)
+    contents = {}
+    importables = []
+    stats = {'files': len(planned) + 4, 'duplicates': 0, 'history_files': 0}
+
+    for path, kind, name in planned:
+        content = _render(rng, path, kind, name, importables, fanout, broken_ratio, contents)
+        contents[path] = content
+        if kind in ('component', 'lib'):
+            importables.append(path)
+        if kind == 'duplicate':
+            stats['duplicates'] += 1
+
+    # Ciclos: alguns arquivos passam a importar um arquivo gerado depois deles
+    for i in range(int(len(importables) * cycle_ratio)):
+        first, second = sorted(rng.sample(range(len(importables)), 2))
+        source, target = importables[first], importables[second]
+        contents[source] = f"import Ciclo from '{_import_specifier(rng, source, target)}';\n" + contents[source]
+
+    for path, content in contents.items():
+        _write(root_dir, path, content)
+
+    # Cópias antigas, ignoradas pela varredura
+    for path in rng.sample(list(contents), int(len(contents) * history_ratio)):
+        base, ext = os.path.splitext(path)
+        if rng.random() < 0.5:
+            copy_path = f".history/{base}_{HISTORY_STAMP}{ext}"
+        else:
+            copy_path = f"backups/backup_{HISTORY_STAMP}/.history/{path}"
+        _write(root_dir, copy_path, contents[path])
+        stats['history_files'] += 1
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera um projeto Next.js sintético para benchmarks')
+    parser.add_argument('destination', help='Diretório a criar')
+    parser.add_argument('--files', type=int, default=1000, help='Arquivos ativos (padrão: 1000)')
+    parser.add_argument('--fanout', type=int, default=4, help='Importações por arquivo (padrão: 4)')
+    parser.add_argument('--duplicates', type=float, default=0.1, help='Fração de componentes duplicados (padrão: 0.1)')
+    parser.add_argument('--history', type=float, default=0.1, help='Fração de arquivos com cópia em backups/.history')
+    parser.add_argument('--seed', type=int, default=0, help='Semente do gerador')
+    args = parser.parse_args()
+
+    if os.path.exists(args.destination) and os.listdir(args.destination):
+        parser.error(f"{args.destination} já existe e não está vazio")
+
+    stats = generate_project(args.destination, files=args.files, fanout=args.fanout,
+                             duplicate_ratio=args.duplicates, history_ratio=args.history, seed=args.seed)
+    print(f"Projeto gerado em {args.destination}: {stats['files']} arquivos, "
+          f"{stats['duplicates']} duplicatas, {stats['history_files']} cópias em backups/.history")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,139 +2,106 @@
 """
 Script para resolver o problema de componentes duplicados no projeto Agenda Livre.
 Este script:
-1. Identifica componentes duplicados
+1. Identifica componentes duplicados pelo conteúdo (idênticos ou quase idênticos)
 2. Escolhe a melhor versão (canônica) para cada componente
-3. Cria redirecionamentos nos outros locais
+3. Cria redirecionamentos nos outros locais dos grupos idênticos; os apenas
+   similares vão para revisão manual no relatório (ou --include-similar)
 """
 
 import os
 import re
-import json
-import shutil
 from pathlib import Path
 
+from apply_engine import ChangePlan
+from file_cache import FileFactsCache
+from metrics import Metrics, measured, profiled
+from report_sink import ReportSink, write_json_report
+from similarity_index import SimilarityIndex
+from workspace_scanner import iter_files
+
 # Configurações
 PROJECT_ROOT = '.'  # Diretório atual
-IGNORE_DIRS = ['.git', '.next', 'node_modules', 'coverage', 'backups', '.history']
-BACKUP_DIR = './backups/component_deduplication'
 SUPPORTED_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx']
 
 class ComponentDeduplicator:
-    def __init__(self, root_dir, dry_run=False):
+    def __init__(self, root_dir, dry_run=False, use_cache=True, jobs=1, workspace=None, include_similar=False):
         self.root_dir = Path(root_dir)
         self.dry_run = dry_run
+        # Grupos apenas similares têm código diferente: só viram redirecionamento se pedido
+        self.include_similar = include_similar
+        # Com um Workspace (ver shared_workspace.py), cache e conteúdos são os mesmos das outras etapas
+        self.cache = workspace.cache if workspace else FileFactsCache(root_dir, enabled=use_cache)
+        self.backup_manifest = None
+        self.jobs = jobs  # Threads para gravar os arquivos no fim
+        # Mudanças acumuladas e aplicadas de uma vez no fim (ver apply_engine.py)
+        self.plan = ChangePlan(root_dir, 'component_deduplication', dry_run=dry_run)
+        self.metrics = Metrics()  # Tempos por fase e contadores (bloco 'metrics' do relatório)
+        self.metrics.track('cache', self.cache.stats)
         self.files = []
-        self.file_contents = {}
-        self.changes_made = []
+        # Mudanças gravadas no .jsonl à medida que acontecem (ver report_sink.py)
+        self.changes = ReportSink('component_deduplication_report.jsonl', 'component_deduplication', enabled=not dry_run)
         self.component_files = []
-        self.duplicated_components = {}
-        self.canonical_components = {}
+        self.signatures = {}  # Componente -> (hash do conteúdo, assinatura MinHash)
+        self.similarity = None
+        self.duplicate_groups = []  # Grupos com 'files', 'match', 'canonical' e 'similarity'
+        self.review_groups = []  # Grupos similares deixados para revisão manual
         
+    @measured
     def scan_directory(self):
         """Escaneia o diretório do projeto e carrega os arquivos relevantes."""
         print(f"Escaneando diretório: {self.root_dir}")
         
-        for root, dirs, files in os.walk(self.root_dir):
-            # Ignorar diretórios específicos
-            dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+        for entry in iter_files(self.root_dir, SUPPORTED_EXTENSIONS):
+            str_path = entry.path
+            self.files.append(str_path)
             
-            for file in files:
-                file_path = Path(root) / file
-                rel_path = file_path.relative_to(self.root_dir)
-                str_path = str(rel_path)
-                
-                # Verificar se é um arquivo relevante (componente React)
-                if file_path.suffix in SUPPORTED_EXTENSIONS:
-                    self.files.append(str_path)
-                    
-                    # Carregar o conteúdo do arquivo
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            self.file_contents[str_path] = content
-                            
-                            # Verificar se é um componente React
-                            if self._is_react_component(content):
-                                self.component_files.append(str_path)
-                    except Exception as e:
-                        print(f"Erro ao ler arquivo {file_path}: {e}")
+            # Verificar se é um componente React (classificação em cache)
+            facts, _ = self.cache.facts_for(entry)
+            if facts is not None and facts['looks_like_component']:
+                self.component_files.append(str_path)
+                self.signatures[str_path] = (facts['content_hash'], facts['minhash'])
+        
+        self.metrics.count('files_scanned', len(self.files))
+        self.cache.save()
         
         print(f"Total de arquivos encontrados: {len(self.files)}")
         print(f"Componentes React encontrados: {len(self.component_files)}")
     
-    def _is_react_component(self, content):
-        """Verifica se o conteúdo é um componente React."""
-        # Padrões comuns de componentes React
-        patterns = [
-            r'(import React|from [\'"]react[\'"](;|,))',  # Importa React
-            r'function\s+\w+\s*\(\s*{\s*.*?\s*}\s*\)',   # Componente funcional
-            r'const\s+\w+\s*=\s*\(\s*{\s*.*?\s*}\s*\)',  # Const function
-            r'class\s+\w+\s+extends\s+(React\.)?Component', # Class component
-            r'export\s+(default\s+)?function\s+\w+',      # Export function
-            r'export\s+(default\s+)?const\s+\w+\s*=\s*\(' # Export const
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, content, re.DOTALL):
-                return True
-        
-        return False
-    
-    def _backup_file(self, file_path):
-        """Cria um backup de um arquivo antes de modificá-lo."""
-        if self.dry_run:
-            return
-            
-        backup_path = Path(BACKUP_DIR) / file_path
-        os.makedirs(backup_path.parent, exist_ok=True)
-        
-        src_path = self.root_dir / file_path
-        shutil.copy2(src_path, backup_path)
-        
-        return backup_path
-    
     def _save_file(self, file_path, content):
-        """Salva o conteúdo em um arquivo."""
-        if self.dry_run:
-            return
-            
-        full_path = self.root_dir / file_path
-        os.makedirs(full_path.parent, exist_ok=True)
-        
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        """Agenda a gravação de um arquivo no plano de mudanças."""
+        self.plan.write(file_path, content)
     
+    @measured
     def find_duplicates(self):
-        """Encontra componentes duplicados no projeto."""
+        """Encontra componentes duplicados no projeto, pelo conteúdo."""
         print("Procurando componentes duplicados...")
         
-        # Agrupar componentes por nome de arquivo (sem caminho)
-        grouped_files = {}
+        # Duplicatas exatas pelo hash do conteúdo e quase duplicatas por
+        # MinHash/LSH (ver similarity_index.py); o nome do arquivo não importa
+        self.similarity = SimilarityIndex()
         for component_file in self.component_files:
-            filename = Path(component_file).name
-            if filename not in grouped_files:
-                grouped_files[filename] = []
-            grouped_files[filename].append(component_file)
+            content_hash, signature = self.signatures.get(component_file, (None, None))
+            self.similarity.add(component_file, content_hash, signature)
         
-        # Filtrar apenas os que têm duplicatas
-        self.duplicated_components = {
-            filename: paths for filename, paths in grouped_files.items() 
-            if len(paths) > 1
-        }
+        self.duplicate_groups = self.similarity.groups()
         
-        print(f"Encontrados {len(self.duplicated_components)} componentes duplicados.")
+        print(f"Encontrados {len(self.duplicate_groups)} componentes duplicados.")
         
-        for filename, paths in self.duplicated_components.items():
-            print(f"  {filename}:")
-            for path in paths:
+        for group in self.duplicate_groups:
+            print(f"  {Path(group['files'][0]).name} ({'idênticos' if group['match'] == 'exact' else 'similares'}):")
+            for path in group['files']:
                 print(f"    - {path}")
             print()
     
+    @measured
     def choose_canonical_components(self):
-        """Escolhe a versão canônica para cada componente duplicado."""
+        """Escolhe a versão canônica para cada grupo de componentes duplicados."""
         print("Escolhendo versões canônicas para componentes duplicados...")
         
-        for filename, paths in self.duplicated_components.items():
+        groups = []
+        for group in self.duplicate_groups:
+            paths = group['files']
+            
             # Preferir:
             # 1. Arquivos .tsx sobre .jsx
             # 2. Arquivos em src/ sobre arquivos na raiz
@@ -162,22 +129,56 @@ class ComponentDeduplicator:
                 candidates = component_dir_files
             
             # Se ainda houver mais de um candidato, escolher o primeiro
-            self.canonical_components[filename] = candidates[0]
+            canonical_path = candidates[0]
+            
+            # O grupo junta pares parecidos em cadeia (A~B, B~C): um membro pode
+            # estar abaixo do limiar em relação ao canônico e não entra
+            similarities = {
+                path: self.similarity.similarity(canonical_path, path)
+                for path in paths if path != canonical_path
+            }
+            dropped = [path for path, value in similarities.items() if value < self.similarity.threshold]
+            if dropped:
+                print(f"  {Path(canonical_path).name}: {len(dropped)} arquivos abaixo do limiar de similaridade "
+                      f"com {canonical_path} ficaram fora do grupo")
+                group['files'] = [path for path in paths if path not in dropped]
+                if len(group['files']) < 2:
+                    continue
+                exact = len({self.signatures[path][0] for path in group['files']}) == 1
+                group['match'] = 'exact' if exact else 'similar'
+            
+            group['canonical'] = canonical_path
+            group['similarity'] = {
+                path: round(similarities[path], 2) for path in group['files'] if path != canonical_path
+            }
+            groups.append(group)
             
-            print(f"  {filename} => {candidates[0]} (escolhido entre {len(paths)} arquivos)")
+            print(f"  {Path(canonical_path).name} => {canonical_path} (escolhido entre {len(group['files'])} arquivos)")
+        
+        self.duplicate_groups = groups
     
+    @measured
     def create_redirects(self):
         """Cria redirecionamentos para as versões canônicas."""
         print("Criando redirecionamentos...")
         
-        for filename, paths in self.duplicated_components.items():
-            canonical_path = self.canonical_components[filename]
+        for group in self.duplicate_groups:
+            canonical_path = group['canonical']
+            
+            # Um redirecionamento descartaria o código que difere do canônico
+            if group['match'] == 'similar' and not self.include_similar:
+                self.review_groups.append(group)
+                continue
             
-            for path in paths:
+            for path in group['files']:
                 if path != canonical_path:
-                    self._create_redirect(path, canonical_path)
+                    self._create_redirect(path, canonical_path, group['similarity'][path])
+        
+        if self.review_groups:
+            print(f"  {len(self.review_groups)} grupos similares (não idênticos) deixados para revisão manual; "
+                  "use --include-similar para redirecioná-los também")
     
-    def _create_redirect(self, redirect_path, canonical_path):
+    def _create_redirect(self, redirect_path, canonical_path, similarity):
         """Cria um arquivo de redirecionamento que aponta para o componente canônico."""
         # Calcular caminho relativo para importação
         redirect_dir = Path(redirect_path).parent
@@ -218,61 +219,71 @@ export {{ default }} from "{import_path}";
 // Versão canônica: {canonical_path}
 
 export * from "{import_path}";
-export { default } from "{import_path}";
+export {{ default }} from "{import_path}";
 """
         
-        # Fazer backup e salvar
-        self._backup_file(redirect_path)
+        # Agendar no plano de mudanças
         self._save_file(redirect_path, redirect_content)
         
-        self.changes_made.append({
+        self.changes.add({
             'file': redirect_path,
-            'change': f"Criado redirecionamento para {canonical_path}"
+            'change': f"Criado redirecionamento para {canonical_path}",
+            'similarity': similarity
         })
     
     def run(self):
         """Executa todo o processo de deduplimação."""
-        print(f"Iniciando processo de deduplimação (modo {'simulação' if self.dry_run else 'aplicação'})...")
-        
-        # Criar diretório de backup
-        if not self.dry_run:
-            os.makedirs(BACKUP_DIR, exist_ok=True)
-        
-        # Encontrar duplicatas
-        self.find_duplicates()
-        
-        # Escolher versões canônicas
-        self.choose_canonical_components()
-        
-        # Criar redirecionamentos
-        self.create_redirects()
+        with self.metrics.phase('run'):
+            print(f"Iniciando processo de deduplimação (modo {'simulação' if self.dry_run else 'aplicação'})...")
+            
+            # Encontrar duplicatas
+            self.find_duplicates()
+            
+            # Escolher versões canônicas
+            self.choose_canonical_components()
+            
+            # Criar redirecionamentos
+            self.create_redirects()
+            
+            # Aplicar todas as mudanças de uma vez: backups em lote e escrita atômica
+            with self.metrics.phase('apply'):
+                self.backup_manifest = self.plan.apply(workers=self.jobs)
+            self.metrics.count('files_planned', len(self.plan))
+            if self.backup_manifest:
+                print(f"Mudanças aplicadas. Para desfazer: python apply_engine.py rollback {self.backup_manifest}")
         
-        # Gerar relatório
+        # Gerar relatório depois de fechar a fase 'run', para o bloco metrics sair completo
         self._generate_report()
         
-        print(f"Processo concluído. {len(self.changes_made)} redirecionamentos {'simulados' if self.dry_run else 'criados'}.")
+        print(f"Processo concluído. {len(self.changes)} redirecionamentos {'simulados' if self.dry_run else 'criados'}.")
         if not self.dry_run:
-            print("Relatório salvo em component_deduplication_report.json e component_deduplication_report.txt")
+            print("Relatório salvo em component_deduplication_report.jsonl, component_deduplication_report.json e component_deduplication_report.txt")
     
     def _generate_report(self):
         """Gera um relatório das mudanças feitas ou simuladas."""
         report = {
             'summary': {
                 'component_files': len(self.component_files),
-                'duplicated_components': len(self.duplicated_components),
-                'redirects_created': len(self.changes_made),
+                'duplicated_components': len(self.duplicate_groups),
+                'exact_duplicates': sum(1 for group in self.duplicate_groups if group['match'] == 'exact'),
+                'similar_components': sum(1 for group in self.duplicate_groups if group['match'] == 'similar'),
+                'redirects_created': len(self.changes),
+                'similar_for_review': len(self.review_groups),
                 'dry_run': self.dry_run
             },
-            'canonical_components': self.canonical_components,
-            'changes': self.changes_made,
-            'duplicated_components': {k: v for k, v in self.duplicated_components.items()}
+            'canonical_components': [group['canonical'] for group in self.duplicate_groups],
+            'backups': dict(self.plan.backups.stats, manifest=self.backup_manifest),
+            'changes': self.changes,
+            'duplicated_components': self.duplicate_groups,
+            'similar_for_review': [group['canonical'] for group in self.review_groups],
+            'metrics': self.metrics.as_dict()
         }
         
         # Salvar o relatório
         if not self.dry_run:
-            # Formato JSON
-            with open('component_deduplication_report.json', 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2)
+            # Resumo no fim do .jsonl; o JSON é gerado relendo as mudanças
+            self.changes.close(report)
+            write_json_report('component_deduplication_report.json', report)
             
             # Formato texto
             with open('component_deduplication_report.txt', 'w', encoding='utf-8') as f:
@@ -281,25 +292,37 @@ export { default } from "{import_path}";
                 f.write("== RESUMO ==\n")
                 f.write(f"Componentes React encontrados: {report['summary']['component_files']}\n")
                 f.write(f"Componentes duplicados: {report['summary']['duplicated_components']}\n")
-                f.write(f"Redirecionamentos criados: {report['summary']['redirects_created']}\n\n")
+                f.write(f"  Idênticos: {report['summary']['exact_duplicates']}\n")
+                f.write(f"  Similares: {report['summary']['similar_components']}\n")
+                f.write(f"Redirecionamentos criados: {report['summary']['redirects_created']}\n")
+                f.write(f"Similares para revisão manual: {report['summary']['similar_for_review']}\n\n")
                 
                 f.write("== COMPONENTES CANÔNICOS ==\n")
-                for filename, path in self.canonical_components.items():
-                    f.write(f"  {filename} => {path}\n")
+                for group in self.duplicate_groups:
+                    f.write(f"  {Path(group['canonical']).name} => {group['canonical']}\n")
                 f.write("\n")
                 
                 f.write("== COMPONENTES DUPLICADOS ==\n")
-                for filename, paths in self.duplicated_components.items():
-                    f.write(f"  {filename}:\n")
-                    for path in paths:
-                        if path == self.canonical_components[filename]:
+                for group in self.duplicate_groups:
+                    match = 'idênticos' if group['match'] == 'exact' else 'similares'
+                    f.write(f"  {Path(group['canonical']).name} ({match}):\n")
+                    for path in group['files']:
+                        if path == group['canonical']:
                             f.write(f"    - {path} (CANÔNICO)\n")
                         else:
-                            f.write(f"    - {path}\n")
+                            f.write(f"    - {path} (similaridade {group['similarity'][path]:.0%})\n")
                     f.write("\n")
                 
+                f.write("== SIMILARES PARA REVISÃO MANUAL ==\n")
+                for group in self.review_groups:
+                    f.write(f"  {Path(group['canonical']).name}:\n")
+                    for path in group['files']:
+                        if path != group['canonical']:
+                            f.write(f"    - {path} (similaridade {group['similarity'][path]:.0%} com {group['canonical']})\n")
+                f.write("\n")
+                
                 f.write("== REDIRECIONAMENTOS CRIADOS ==\n")
-                for change in self.changes_made:
+                for change in self.changes:
                     f.write(f"  {change['file']} => {change['change']}\n")
                 
                 f.write("\n=== FIM DO RELATÓRIO ===\n")
@@ -311,12 +334,19 @@ def main():
     
     parser = argparse.ArgumentParser(description='Deduplimação de componentes React do projeto Agenda Livre')
     parser.add_argument('--dry-run', action='store_true', help='Apenas mostrar mudanças sem aplicá-las')
+    parser.add_argument('--include-similar', action='store_true',
+                        help='Redirecionar também componentes apenas similares (descarta o código que difere)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignorar o cache de análise em .cache/')
+    parser.add_argument('--jobs', type=int, default=1, help='Threads para gravar os arquivos alterados (padrão: 1)')
+    parser.add_argument('--profile', metavar='ARQUIVO', help='Gravar um perfil cProfile da execução em ARQUIVO')
     
     args = parser.parse_args()
     
-    deduplicator = ComponentDeduplicator(PROJECT_ROOT, dry_run=args.dry_run)
-    deduplicator.scan_directory()
-    deduplicator.run()
+    deduplicator = ComponentDeduplicator(PROJECT_ROOT, dry_run=args.dry_run, use_cache=not args.no_cache,
+                                         jobs=args.jobs, include_similar=args.include_similar)
+    with profiled(args.profile):
+        deduplicator.scan_directory()
+        deduplicator.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
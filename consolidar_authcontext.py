@@ -3,15 +3,16 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+from apply_engine import ChangePlan
+from file_cache import FileFactsCache
+from workspace_scanner import iter_files
+
 ROOT_DIR = Path(".").resolve()
 
 def listar_auth_contexts(root_dir):
     return [
-        f for f in root_dir.rglob("*AuthContext*.js")
-        if "node_modules" not in str(f) and "dist" not in str(f)
-    ] + [
-        f for f in root_dir.rglob("*AuthContext*.tsx")
-        if "node_modules" not in str(f) and "dist" not in str(f)
+        root_dir / entry.path for entry in iter_files(root_dir, ['.js', '.tsx'])
+        if "AuthContext" in entry.name
     ]
 
 def authcontext_mais_recente(files):
@@ -23,38 +24,72 @@ def authcontext_mais_recente(files):
     
     return max(files, key=extrair_timestamp)
 
-def corrigir_importacoes_useauth(authcontext_path, root_dir):
-    for file in root_dir.rglob("*.[jt]s*"):
-        if file.name.startswith("AuthContext"):
-            continue
-        if not file.suffix in ['.js', '.jsx', '.ts', '.tsx']:
+# Importação nomeada de useAuth; o caminho (entre aspas) é trocado pelo do AuthContext
+USEAUTH_IMPORT_RE = re.compile(r'(import\s+[^;]*?{\s*[^}]*?useAuth[^}]*?}\s+from\s+[\'"]).+?([\'"])')
+
+def indice_candidatos(root_dir, cache):
+    """
+    Arquivos que importam useAuth, pelos fatos em cache (ver file_cache.py):
+    em uma execução repetida nenhum arquivo é lido só para saber se é candidato.
+    Retorna [(FileEntry, conteúdo ou None)]; o conteúdo vem junto quando o
+    arquivo precisou ser lido para extrair os fatos.
+    """
+    candidatos = []
+    for entry in iter_files(root_dir, ['.js', '.jsx', '.ts', '.tsx']):
+        if entry.name.startswith("AuthContext"):
             continue
+        facts, content = cache.facts_for(entry)
+        if facts is not None and facts['imports_useauth']:
+            candidatos.append((entry, content))
+    cache.save()
+    return candidatos
+
+def corrigir_importacoes_useauth(authcontext_path, root_dir, contents=None, cache=None):
+    # contents / cache: ContentStore e FileFactsCache compartilhados (ver agenda_tools.py)
+    plan = ChangePlan(root_dir, 'consolidar_authcontext')
+    own_cache = cache is None
+    if own_cache:
+        cache = FileFactsCache(root_dir)
+    try:
+        candidatos = indice_candidatos(root_dir, cache)
+    finally:
+        if own_cache:
+            cache.close()
+
+    # Caminho relativo até o AuthContext, calculado uma vez por diretório
+    caminhos = {}
+    for entry, content in candidatos:
+        path = entry.path
+        file = root_dir / path
         try:
-            content = file.read_text(encoding="utf-8")
+            if content is None:
+                content = contents.get(path) if contents is not None else file.read_text(encoding="utf-8")
         except:
             continue
-        if "useAuth" not in content:
-            continue
 
-        # Construir caminho relativo novo
-        novo_caminho = os.path.relpath(authcontext_path, file.parent).replace(os.sep, '/')
-        if not novo_caminho.startswith('.'):
-            novo_caminho = './' + novo_caminho
+        diretorio = os.path.dirname(path)
+        novo_caminho = caminhos.get(diretorio)
+        if novo_caminho is None:
+            novo_caminho = os.path.relpath(authcontext_path, file.parent).replace(os.sep, '/')
+            if not novo_caminho.startswith('.'):
+                novo_caminho = './' + novo_caminho
+            caminhos[diretorio] = novo_caminho
 
         # Corrigir import
-        novo_conteudo = re.sub(
-            r'(import\s+[^;]*?{\s*[^}]*?useAuth[^}]*?}\s+from\s+[\'"]).+?([\'"])',
-            r'\1' + novo_caminho + r'\2',
-            content
-        )
+        novo_conteudo = USEAUTH_IMPORT_RE.sub(lambda m: m.group(1) + novo_caminho + m.group(2), content)
 
         if novo_conteudo != content:
-            file.with_suffix(file.suffix + ".bak").write_text(content, encoding="utf-8")
-            file.write_text(novo_conteudo, encoding="utf-8")
+            plan.write(path, novo_conteudo)
             print(f"Corrigido: {file} -> {novo_caminho}")
         else:
             print(f"Sem alterações: {file}")
 
+    # Backups e escritas de uma vez, com rollback se algo falhar
+    manifest = plan.apply()
+    if manifest:
+        print(f"Mudanças aplicadas. Para desfazer: python apply_engine.py rollback {manifest}")
+    return plan
+
 def main():
     print("Buscando arquivos AuthContext...")
     auth_files = listar_auth_contexts(ROOT_DIR)
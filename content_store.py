@@ -0,0 +1,84 @@
+"""
+Conteúdo dos arquivos sob demanda para as ferramentas do projeto Agenda Livre.
+
+Os corretores guardavam o conteúdo dos arquivos em um dicionário que só
+crescia até o fim da execução. O ContentStore troca esse dicionário:
+1. O conteúdo é lido só quando pedido (get)
+2. Arquivos grandes são lidos via mmap e decodificados direto do mapeamento,
+   sem uma cópia intermediária em bytes
+3. Os textos decodificados ficam em um cache LRU limitado por tamanho; os
+   menos usados saem quando o limite é atingido
+4. release() descarta um arquivo que não vai mais ser usado
+
+O pico de memória com conteúdos fica limitado pelo tamanho do cache, não
+pelo tamanho do repositório.
+"""
+
+import mmap
+import os
+from collections import OrderedDict
+
+from file_cache import decode_text
+
+# Configurações
+MAX_CACHE_CHARS = 32 * 1024 * 1024  # Total de caracteres mantidos em memória
+MMAP_THRESHOLD = 1024 * 1024        # Arquivos a partir deste tamanho (bytes) usam mmap
+
+
+def read_content(full_path):
+    """Lê e decodifica um arquivo; arquivos grandes passam por mmap. Retorna (conteúdo, bytes)."""
+    with open(full_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return decode_text(f.read()), size
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_text(mapped), size
+
+
+class ContentStore:
+    def __init__(self, root_dir, max_chars=MAX_CACHE_CHARS):
+        self.root_dir = root_dir
+        self.max_chars = max_chars
+        self.entries = OrderedDict()  # caminho -> conteúdo, do menos para o mais recente
+        self.chars = 0
+        self.stats = {'hits': 0, 'misses': 0, 'bytes_read': 0, 'evictions': 0, 'peak_chars': 0}
+
+    def get(self, file_path):
+        """Conteúdo do arquivo (caminho relativo à raiz), lendo do disco se preciso."""
+        content = self.entries.get(file_path)
+        if content is not None:
+            self.stats['hits'] += 1
+            self.entries.move_to_end(file_path)
+            return content
+
+        content, size = read_content(os.path.join(self.root_dir, file_path))
+        self.stats['misses'] += 1
+        self.stats['bytes_read'] += size
+        self.put(file_path, content)
+        return content
+
+    def put(self, file_path, content):
+        """Guarda um conteúdo já lido (ex.: durante a varredura) no cache."""
+        self.release(file_path)
+        if len(content) > self.max_chars:
+            return  # Maior que o cache inteiro: não fica guardado
+
+        self.entries[file_path] = content
+        self.chars += len(content)
+        while self.chars > self.max_chars:
+            _, evicted = self.entries.popitem(last=False)
+            self.chars -= len(evicted)
+            self.stats['evictions'] += 1
+        self.stats['peak_chars'] = max(self.stats['peak_chars'], self.chars)
+
+    def release(self, file_path):
+        """Descarta o conteúdo de um arquivo que não vai mais ser usado."""
+        content = self.entries.pop(file_path, None)
+        if content is not None:
+            self.chars -= len(content)
+
+    def __contains__(self, file_path):
+        return file_path in self.entries
+
+    def __len__(self):
+        return len(self.entries)
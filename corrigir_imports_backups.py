@@ -2,20 +2,20 @@ import os
 import re
 from pathlib import Path
 
+from apply_engine import ChangePlan
+from workspace_scanner import iter_files
+
 ROOT_DIR = Path(".").resolve()
 
-def ignorar_caminho(path: Path):
-    return any(p in path.parts for p in ['node_modules', 'dist', 'backups', '.history'])
-
-def corrigir_imports_de_backup(root_dir):
-    for file in root_dir.rglob("*.[jt]s*"):
-        if ignorar_caminho(file):
-            continue
-        if not file.suffix in ['.js', '.jsx', '.ts', '.tsx']:
-            continue
+def corrigir_imports_de_backup(root_dir, contents=None):
+    # contents: ContentStore compartilhado (ver agenda_tools.py); sem ele, lê do disco
+    plan = ChangePlan(root_dir, 'corrigir_imports_backups')
+    # node_modules, dist, backups e .history são podados pela varredura compartilhada
+    for entry in iter_files(root_dir, ['.js', '.jsx', '.ts', '.tsx']):
+        file = root_dir / entry.path
 
         try:
-            content = file.read_text(encoding="utf-8")
+            content = contents.get(entry.path) if contents is not None else file.read_text(encoding="utf-8")
         except:
             continue
 
@@ -38,10 +38,15 @@ def corrigir_imports_de_backup(root_dir):
                 alterado = True
 
         if alterado:
-            file.with_suffix(file.suffix + ".bak").write_text(content, encoding="utf-8")
-            file.write_text('\n'.join(linhas), encoding="utf-8")
+            plan.write(entry.path, '\n'.join(linhas))
             print(f"✅ Arquivo corrigido: {file}")
 
+    # Backups e escritas de uma vez, com rollback se algo falhar
+    manifest = plan.apply()
+    if manifest:
+        print(f"📦 Mudanças aplicadas. Para desfazer: python apply_engine.py rollback {manifest}")
+    return plan
+
 def main():
     print("🔍 Procurando imports com backups em arquivos ativos...")
     corrigir_imports_de_backup(ROOT_DIR)
@@ -0,0 +1,154 @@
+"""
+Tabela colunar dos fatos por arquivo do analisador do projeto Agenda Livre.
+
+As seções de estrutura do relatório (diretórios com mais arquivos, arquivos
+por extensão, localização dos componentes) eram montadas percorrendo todos
+os caminhos e criando um Path para cada um. Aqui cada arquivo é uma linha de
+colunas compactas (array):
+1. Diretório e extensão viram ids inteiros; cada nome distinto é guardado uma
+   única vez
+2. Classificações (componente, useAuth...) viram bits de uma coluna de flags
+3. Contagens (importações, usos de any) ficam em colunas de inteiros
+
+As agregações são contagens por id (group-by). Com NumPy instalado elas são
+vetorizadas (numpy.bincount); sem ele, um laço simples sobre os arrays. Em
+ambos os casos a ordem dos grupos é a de primeira aparição, como nos
+dicionários montados antes.
+"""
+
+import os
+from array import array
+
+try:
+    import numpy
+except ImportError:  # NumPy é opcional
+    numpy = None
+
+# Bits da coluna de flags
+IS_COMPONENT = 1
+LOOKS_LIKE_COMPONENT = 2
+IMPORTS_USEAUTH = 4
+HAS_TYPESCRIPT_HINTS = 8
+
+
+def _flags(facts):
+    flags = 0
+    if facts['is_component']:
+        flags |= IS_COMPONENT
+    if facts['looks_like_component']:
+        flags |= LOOKS_LIKE_COMPONENT
+    if facts['imports_useauth']:
+        flags |= IMPORTS_USEAUTH
+    if facts['untyped_params'] or facts['any_count']:
+        flags |= HAS_TYPESCRIPT_HINTS
+    return flags
+
+
+class FactsTable:
+    def __init__(self):
+        self.paths = []
+        self.dir_names = []   # id -> diretório ('.' para a raiz, como Path(...).parent)
+        self.dir_ids = {}
+        self.ext_names = []   # código -> extensão
+        self.ext_codes = {}
+        self.path_table = None
+        self.dir_id = array('I')
+        self.ext_code = array('H')
+        self.flags = array('B')
+        self.import_count = array('I')
+        self.any_count = array('I')
+
+    @classmethod
+    def build(cls, paths, facts_by_path, path_table=None):
+        """
+        Tabela com uma linha por caminho, na ordem dada; arquivos sem fatos
+        ficam sem flags. Com a PathTable da varredura (ver path_table.py), os
+        ids de diretório são os dela e nenhum caminho é dividido de novo.
+        """
+        table = cls()
+        table.path_table = path_table
+        if path_table is not None:
+            table.dir_names = path_table.display_dirs
+        for path in paths:
+            table.append(path, facts_by_path.get(path))
+        return table
+
+    def _intern(self, name, names, ids):
+        code = ids.get(name)
+        if code is None:
+            code = len(names)
+            ids[name] = code
+            names.append(name)
+        return code
+
+    def append(self, path, facts):
+        self.paths.append(path)
+        if self.path_table is not None:
+            self.dir_id.append(self.path_table.dir_id(path))
+        else:
+            self.dir_id.append(self._intern(os.path.dirname(path) or '.', self.dir_names, self.dir_ids))
+        self.ext_code.append(self._intern(os.path.splitext(path)[1], self.ext_names, self.ext_codes))
+        if facts is None:
+            self.flags.append(0)
+            self.import_count.append(0)
+            self.any_count.append(0)
+        else:
+            self.flags.append(_flags(facts))
+            self.import_count.append(len(facts['imports']))
+            self.any_count.append(facts['any_count'])
+
+    def __len__(self):
+        return len(self.paths)
+
+    @property
+    def nbytes(self):
+        """Bytes das colunas numéricas (sem os caminhos e nomes)."""
+        columns = (self.dir_id, self.ext_code, self.flags, self.import_count, self.any_count)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def _mask(self, flag):
+        """Linhas com o bit `flag` ligado (array NumPy de bool, ou lista de índices sem NumPy)."""
+        if numpy is not None and self.flags:
+            return (_as_numpy(self.flags) & flag) != 0
+        return [row for row, flags in enumerate(self.flags) if flags & flag]
+
+    def rows_with(self, flag):
+        """Caminhos das linhas com o bit `flag` ligado, na ordem da tabela."""
+        mask = self._mask(flag)
+        if numpy is not None and self.flags:
+            return [self.paths[row] for row in numpy.flatnonzero(mask)]
+        return [self.paths[row] for row in mask]
+
+    def count_by_directory(self, flag=None):
+        """{diretório: arquivos}, opcionalmente só das linhas com o bit `flag`."""
+        return self._count_by(self.dir_id, self.dir_names, flag)
+
+    def count_by_extension(self, flag=None):
+        """{extensão: arquivos}, opcionalmente só das linhas com o bit `flag`."""
+        return self._count_by(self.ext_code, self.ext_names, flag)
+
+    def _count_by(self, column, names, flag):
+        if not column:
+            return {}
+        if numpy is not None:
+            codes = _as_numpy(column)
+            if flag is not None:
+                codes = codes[self._mask(flag)]
+            counts = numpy.bincount(codes, minlength=len(names))
+            # Ordem de primeira aparição dos códigos (em um filtro ela pode
+            # diferir da ordem dos ids)
+            present, first = numpy.unique(codes, return_index=True)
+            order = present[numpy.argsort(first, kind='stable')]
+            return {names[code]: int(counts[code]) for code in order}
+
+        rows = range(len(column)) if flag is None else self._mask(flag)
+        counts = {}
+        for row in rows:
+            code = column[row]
+            counts[code] = counts.get(code, 0) + 1
+        return {names[code]: count for code, count in counts.items()}
+
+
+def _as_numpy(column):
+    """Visão NumPy de um array, sem cópia."""
+    return numpy.frombuffer(column, dtype=f'u{column.itemsize}')
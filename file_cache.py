@@ -0,0 +1,246 @@
+"""
+Cache persistente dos fatos por arquivo do projeto Agenda Livre.
+
+Os fatos extraídos por file_facts.py ficam em um banco SQLite em .cache/,
+indexados pelo caminho do arquivo:
+1. Se mtime e tamanho batem com o registro, o arquivo nem é aberto
+2. Se não batem, o arquivo é lido e o hash do conteúdo é comparado;
+   conteúdo idêntico reaproveita os fatos (ex.: arquivo apenas "tocado")
+3. Caso contrário os fatos são extraídos novamente e gravados
+
+Assim uma nova execução em uma árvore onde 5 arquivos mudaram só lê esses 5.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from file_facts import FACTS_VERSION, extract_facts
+
+# Configurações
+CACHE_DIR = '.cache'
+CACHE_FILE = 'file_facts.sqlite'
+
+
+def decode_text(data):
+    """Decodifica bytes (ou qualquer buffer, como um mmap) como o modo texto do Python."""
+    content = str(data, 'utf-8')
+    # Mesma normalização de quebras de linha do open(..., 'r')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def read_text(full_path):
+    """Lê um arquivo como o modo texto do Python faria, retornando também o hash dos bytes."""
+    with open(full_path, 'rb') as f:
+        data = f.read()
+
+    return decode_text(data), hashlib.sha1(data).hexdigest()
+
+
+def _extract_chunk(root_dir, items):
+    """
+    Executado nos processos do pool: lê e extrai os fatos de um lote de arquivos.
+
+    Cada item é (caminho, hash conhecido ou None). Retorna, na mesma ordem,
+    (caminho, hash, fatos em JSON ou None se o hash bateu, erro ou None), e
+    as buscas de regex feitas no lote.
+    """
+    results = []
+    stats = {'regex_calls': 0}
+    for path, known_digest in items:
+        full_path = os.path.join(root_dir, path)
+        try:
+            content, digest = read_text(full_path)
+        except Exception as e:
+            results.append((path, None, None, f"Erro ao ler arquivo {full_path}: {e}"))
+            continue
+
+        if digest == known_digest:
+            results.append((path, digest, None, None))
+        else:
+            results.append((path, digest, json.dumps(extract_facts(path, content, stats)), None))
+
+    return results, stats['regex_calls']
+
+
+class FileFactsCache:
+    def __init__(self, root_dir, cache_path=None, enabled=True):
+        self.root_dir = root_dir
+        self.enabled = enabled
+        self.cache_path = cache_path or os.path.join(root_dir, CACHE_DIR, CACHE_FILE)
+        self.rows = {}
+        self.pending = []
+        self.stats = {'hits': 0, 'hash_hits': 0, 'misses': 0, 'errors': 0, 'bytes_read': 0, 'regex_calls': 0}
+        self._db = None
+
+        if self.enabled:
+            self._load()
+
+    def _load(self):
+        """Abre o banco e carrega todos os registros em memória de uma vez."""
+        if os.path.dirname(self.cache_path):
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        self._db = sqlite3.connect(self.cache_path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS file_facts ('
+            'path TEXT PRIMARY KEY, mtime REAL, size INTEGER, '
+            'digest TEXT, version INTEGER, facts TEXT)'
+        )
+
+        for path, mtime, size, digest, version, facts in self._db.execute(
+                'SELECT path, mtime, size, digest, version, facts FROM file_facts'):
+            if version == FACTS_VERSION:
+                self.rows[path] = (mtime, size, digest, facts)
+
+    def facts_for(self, entry):
+        """
+        Retorna (fatos, conteúdo) para um FileEntry do inventário.
+
+        O conteúdo só é retornado quando o arquivo precisou ser lido; em um
+        acerto por mtime/tamanho ele é None. Em caso de erro de leitura,
+        retorna (None, None).
+        """
+        path = entry.path
+        row = self.rows.get(path)
+        if row is not None and row[0] == entry.mtime and row[1] == entry.size:
+            self.stats['hits'] += 1
+            return json.loads(row[3]), None
+
+        full_path = os.path.join(self.root_dir, path)
+        try:
+            content, digest = read_text(full_path)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"Erro ao ler arquivo {full_path}: {e}")
+            return None, None
+        self.stats['bytes_read'] += entry.size
+
+        if row is not None and row[2] == digest:
+            self.stats['hash_hits'] += 1
+            facts_json = row[3]
+            facts = json.loads(facts_json)
+        else:
+            self.stats['misses'] += 1
+            facts = extract_facts(path, content, self.stats)
+            facts_json = json.dumps(facts)
+
+        if self.enabled:
+            self.rows[path] = (entry.mtime, entry.size, digest, facts_json)
+            self.pending.append((path, entry.mtime, entry.size, digest, FACTS_VERSION, facts_json))
+
+        return facts, content
+
+    def record(self, entry, content):
+        """
+        Registra os fatos de um arquivo que acabou de ser escrito com `content`
+        (em modo texto), sem relê-lo do disco. `entry` deve ter o novo mtime.
+        """
+        if not self.enabled:
+            return
+
+        path = entry.path
+        digest = hashlib.sha1(content.replace('\n', os.linesep).encode('utf-8')).hexdigest()
+        facts_json = json.dumps(extract_facts(path, content, self.stats))
+        self.rows[path] = (entry.mtime, entry.size, digest, facts_json)
+        self.pending.append((path, entry.mtime, entry.size, digest, FACTS_VERSION, facts_json))
+
+    def facts_for_all(self, entries, jobs=1):
+        """
+        Retorna {caminho: fatos} para todos os FileEntry, na ordem do inventário.
+
+        Com jobs > 1, os arquivos que precisam ser lidos são distribuídos em
+        lotes por um ProcessPoolExecutor; o resultado é idêntico ao modo serial.
+        """
+        if jobs <= 1:
+            results = {}
+            for entry in entries:
+                facts, _ = self.facts_for(entry)
+                if facts is not None:
+                    results[entry.path] = facts
+            return results
+
+        # Caminhos montados uma vez por arquivo (ver FileEntry)
+        paths = [entry.path for entry in entries]
+
+        # Acertos por mtime/tamanho são resolvidos aqui mesmo, sem ler o arquivo
+        facts_json_by_path = {}
+        to_read = []
+        for entry, path in zip(entries, paths):
+            row = self.rows.get(path)
+            if row is not None and row[0] == entry.mtime and row[1] == entry.size:
+                self.stats['hits'] += 1
+                facts_json_by_path[path] = row[3]
+            else:
+                to_read.append((path, entry))
+
+        if to_read:
+            chunk_size = max(1, min(256, len(to_read) // (jobs * 4)))
+            chunks = [
+                [(path, self.rows[path][2] if path in self.rows else None)
+                 for path, _ in to_read[i:i + chunk_size]]
+                for i in range(0, len(to_read), chunk_size)
+            ]
+            entries_by_path = dict(to_read)
+
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                for chunk_results, regex_calls in pool.map(_extract_chunk, [self.root_dir] * len(chunks), chunks):
+                    self.stats['regex_calls'] += regex_calls
+                    for path, digest, facts_json, error in chunk_results:
+                        if error is not None:
+                            self.stats['errors'] += 1
+                            print(error)
+                            continue
+
+                        if facts_json is None:
+                            self.stats['hash_hits'] += 1
+                            facts_json = self.rows[path][3]
+                        else:
+                            self.stats['misses'] += 1
+
+                        entry = entries_by_path[path]
+                        self.stats['bytes_read'] += entry.size
+                        facts_json_by_path[path] = facts_json
+                        if self.enabled:
+                            self.rows[path] = (entry.mtime, entry.size, digest, facts_json)
+                            self.pending.append((path, entry.mtime, entry.size, digest, FACTS_VERSION, facts_json))
+
+        return {
+            path: json.loads(facts_json_by_path[path])
+            for path in paths if path in facts_json_by_path
+        }
+
+    def save(self):
+        """Grava as entradas novas ou atualizadas em uma única transação."""
+        if not self.enabled or not self.pending:
+            return
+
+        with self._db:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO file_facts (path, mtime, size, digest, version, facts) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                self.pending
+            )
+        self.pending = []
+
+    def prune(self, paths):
+        """Remove do cache arquivos que não existem mais no inventário."""
+        if not self.enabled:
+            return
+
+        alive = set(paths)
+        stale = [(path,) for path in self.rows if path not in alive]
+        if stale:
+            with self._db:
+                self._db.executemany('DELETE FROM file_facts WHERE path = ?', stale)
+            for (path,) in stale:
+                del self.rows[path]
+
+    def close(self):
+        self.save()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
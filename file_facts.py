@@ -0,0 +1,157 @@
+"""
+Extração dos fatos por arquivo usados pelas ferramentas do projeto Agenda Livre.
+
+Cada arquivo é lido e analisado uma única vez; o resultado (importações,
+classificação como componente, uso de useAuth, contagens de firstName /
+first_name, heurísticas de TypeScript, assinatura de conteúdo) é um
+dicionário simples que pode ser guardado no cache persistente (ver
+file_cache.py).
+"""
+
+import os
+import re
+
+from import_lexer import scan_imports
+from similarity_index import content_signature
+
+# Incrementar sempre que as regras abaixo mudarem, para invalidar o cache
+FACTS_VERSION = 5
+
+# Arquivos cujas importações são extraídas pelo lexer (ver import_lexer.py)
+LEXED_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx']
+
+# Sinais de componente React usados pelo deduplicador. Nenhuma alternativa
+# tem .* nem quantificadores aninhados: o custo de uma busca é linear no
+# tamanho do texto, mesmo em arquivos empacotados ou minificados. Todas
+# começam por um literal, o que deixa o re pular direto para os candidatos.
+HEADER_SIGNALS = [
+    r'import\s+React\b',                                              # Importa React
+    r'from\s*[\'"]react[\'"]',                                        # Importa de 'react'
+    r'(?:return|=>)\s*(?:\(\s*)?<(?:[A-Za-z]|>)',                     # Retorna JSX
+]
+DECLARATION_SIGNALS = [
+    r'function\s+\w+\s*\(\s*\{',                                      # Função com props desestruturadas
+    r'const\s+\w+\s*=\s*\(\s*\{',                                     # Arrow com props desestruturadas
+    r'class\s+\w+\s+extends\s+(?:React\.)?(?:Pure)?Component\b',      # Class component
+    r'export\s+(?:default\s+)?function\s+\w',                         # Export function
+    r'export\s+(?:default\s+)?const\s+\w+\s*=\s*\(',                  # Export const
+]
+# O cabeçalho do módulo (importações e primeiras declarações) é inspecionado
+# inteiro; depois dele, só declarações no início de linha (nível superior)
+COMPONENT_HEADER_CHARS = 16 * 1024
+
+# Importação de useAuth via import nomeado
+USEAUTH_IMPORT_PATTERN = r'import\s+[^;]*?{[^}]*?useAuth[^}]*?}\s+from'
+
+# Padrões compilados uma vez. Cada classificação é uma única busca: os
+# sinais do deduplicador viram uma alternância, e as duas condições do
+# analisador (importa React e define função/const/classe) viram lookaheads a
+# partir do início do arquivo.
+COMPONENT_HEADER_RE = re.compile('|'.join(HEADER_SIGNALS + DECLARATION_SIGNALS))
+COMPONENT_DECLARATION_RE = re.compile('^(?:' + '|'.join(DECLARATION_SIGNALS) + ')', re.MULTILINE)
+REACT_COMPONENT_RE = re.compile(
+    r'\A(?=.*?(?:import React|from [\'"]react[\'"](;|,)))'
+    r'(?=.*?(?:function\s+\w+\s*\(|const\s+\w+\s*=\s*\(|class\s+\w+\s+extends\s+React\.Component))',
+    re.DOTALL
+)
+USEAUTH_IMPORT_RE = re.compile(USEAUTH_IMPORT_PATTERN)
+UNTYPED_FUNCTION_RE = re.compile(r'function\s+\w+\s*\(([^:)]+)\)')
+UNTYPED_CONST_RE = re.compile(r'const\s+\w+\s*=\s*\(([^:)]+)\)')
+ANY_RE = re.compile(r':\s*any')
+
+
+def _count_regex(stats, calls):
+    """Soma `calls` buscas de regex em stats['regex_calls'] (se houver stats)."""
+    if stats is not None:
+        stats['regex_calls'] = stats.get('regex_calls', 0) + calls
+
+
+def extract_import_records(file_path, content, stats=None):
+    """
+    Retorna as importações do arquivo como listas [tipo, especificador, linha,
+    só de tipo], na ordem do código (listas para caberem no cache em JSON).
+    """
+    if os.path.splitext(file_path)[1] not in LEXED_EXTENSIONS:
+        return []
+    return [list(record) for record in scan_imports(content, stats)]
+
+
+def is_react_component(file_path, content, stats=None):
+    """Classificação de componentes usada pelo analisador de projeto."""
+    if file_path.endswith('.jsx') or file_path.endswith('.tsx'):
+        return True
+
+    # Também verificar arquivos .js e .ts que podem ser componentes
+    if file_path.endswith('.js') or file_path.endswith('.ts'):
+        _count_regex(stats, 1)
+        if REACT_COMPONENT_RE.match(content):
+            return True
+
+    return False
+
+
+def looks_like_component(content, stats=None):
+    """
+    Classificação de componentes usada pelo deduplicador (mais permissiva).
+
+    Custo linear: busca todos os sinais nos primeiros COMPONENT_HEADER_CHARS
+    caracteres e, no restante, só declarações de nível superior.
+    """
+    _count_regex(stats, 1)
+    if COMPONENT_HEADER_RE.search(content, 0, COMPONENT_HEADER_CHARS) is not None:
+        return True
+    if len(content) <= COMPONENT_HEADER_CHARS:
+        return False
+    _count_regex(stats, 1)
+    return COMPONENT_DECLARATION_RE.search(content, COMPONENT_HEADER_CHARS) is not None
+
+
+def typescript_hints(file_path, content, stats=None):
+    """Heurísticas de erros de TypeScript: parâmetros sem tipo e uso de any."""
+    if not (file_path.endswith('.ts') or file_path.endswith('.tsx')):
+        return [], 0
+
+    _count_regex(stats, 3)
+    untyped_params = UNTYPED_FUNCTION_RE.findall(content)
+    untyped_params.extend(UNTYPED_CONST_RE.findall(content))
+    any_count = sum(1 for _ in ANY_RE.finditer(content))
+
+    return untyped_params, any_count
+
+
+def extract_facts(file_path, content, stats=None):
+    """
+    Extrai todos os fatos de um arquivo em uma única chamada.
+
+    Com `stats` (dicionário), soma em stats['regex_calls'] as buscas de regex
+    feitas na extração, incluindo as do lexer.
+    """
+    untyped_params, any_count = typescript_hints(file_path, content, stats)
+    import_records = extract_import_records(file_path, content, stats)
+
+    # Assinatura de conteúdo para a detecção de duplicatas (ver similarity_index.py)
+    if os.path.splitext(file_path)[1] in LEXED_EXTENSIONS:
+        _count_regex(stats, 1)
+        content_hash, signature = content_signature(content)
+    else:
+        content_hash, signature = None, None
+
+    _count_regex(stats, 1)  # useAuth
+    return {
+        'imports': [record[1] for record in import_records],
+        'import_records': import_records,
+        'is_component': is_react_component(file_path, content, stats),
+        'looks_like_component': looks_like_component(content, stats),
+        'imports_useauth': USEAUTH_IMPORT_RE.search(content) is not None,
+        'camel_case_count': content.count('firstName'),
+        'snake_case_count': content.count('first_name'),
+        'defines_user_type': ('interface User' in content or
+                              'type User' in content or
+                              'User:' in content),
+        'has_user_refs': ('user.first_name' in content or 'user.firstName' in content or
+                          'user.last_name' in content or 'user.lastName' in content),
+        'untyped_params': untyped_params,
+        'any_count': any_count,
+        'content_hash': content_hash,
+        'minhash': signature,
+    }
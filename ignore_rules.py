@@ -0,0 +1,169 @@
+"""
+Regras de .gitignore para as varreduras do projeto Agenda Livre.
+
+As varreduras tinham só listas fixas de nomes de diretório (com entradas
+datadas como backup_20250414_181421). Aqui:
+1. Cada .gitignore é lido quando a varredura entra no diretório dele, e as
+   regras valem para esse diretório e tudo abaixo
+2. Cada padrão é compilado uma vez em uma expressão regular
+3. Suporta comentários, negação (!), padrões ancorados (com / no início ou no
+   meio), só-diretório (/ no final), *, ?, [classes] e **
+4. As varreduras consultam o IgnoreMatcher antes de descer em um diretório,
+   então uma subárvore ignorada nunca é listada
+
+Como no git, a última regra que casa decide, e as regras de um .gitignore
+mais fundo têm precedência sobre as de cima. Um arquivo dentro de um
+diretório ignorado não pode ser reincluído com !, já que o diretório nem é
+percorrido.
+"""
+
+import os
+import re
+
+# Configurações
+IGNORE_FILE = '.gitignore'
+# Padrões aplicados na raiz antes de qualquer .gitignore (um .gitignore pode negá-los);
+# ancorados, para só excluir as pastas de histórico da raiz e não, por exemplo,
+# src/components/backup_settings/
+IGNORE_PATTERNS = ['/backup_*/', '/broken_state_*/']
+
+
+def _translate(glob):
+    """Traduz um padrão de .gitignore (sem ! e sem / final) para regex."""
+    parts = []
+    i = 0
+    n = len(glob)
+
+    while i < n:
+        c = glob[i]
+        if c == '*':
+            if glob.startswith('**', i):
+                at_start = i == 0 or glob[i - 1] == '/'
+                at_end = i + 2 == n
+                if at_start and at_end:
+                    parts.append('.*')  # '**' sozinho ou '/**' no final
+                    i += 2
+                    continue
+                if at_start and glob[i + 2] == '/':
+                    parts.append('(?:.*/)?')  # '**/' no início ou '/**/' no meio
+                    i += 3
+                    continue
+                i += 2  # Outros '**' valem como um '*' comum
+            else:
+                i += 1
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+            i += 1
+        elif c == '[':
+            end = glob.find(']', i + 2)
+            if end == -1:
+                parts.append(re.escape(c))
+                i += 1
+                continue
+            body = glob[i + 1:end]
+            if body[0] in '!^':
+                body = '^' + body[1:]
+            parts.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end + 1
+        elif c == '\\' and i + 1 < n:
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(c))
+            i += 1
+
+    return ''.join(parts)
+
+
+class IgnoreRule:
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.negated = pattern.startswith('!')
+        if self.negated:
+            pattern = pattern[1:]
+        elif pattern.startswith('\\!') or pattern.startswith('\\#'):
+            pattern = pattern[1:]
+
+        # 'build/' só casa com diretórios
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+
+        # Com / no início ou no meio, o padrão é relativo ao diretório do
+        # .gitignore; sem /, casa com o nome em qualquer nível abaixo dele
+        self.anchored = '/' in pattern
+        self.regex = re.compile(_translate(pattern.lstrip('/')), re.DOTALL)
+
+    def matches(self, rel_path, name, is_dir):
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.fullmatch(rel_path if self.anchored else name) is not None
+
+
+def parse_lines(lines):
+    """Regras de um .gitignore, na ordem do arquivo."""
+    rules = []
+    for line in lines:
+        line = line.rstrip('\n').rstrip('\r')
+        # Espaços no final são ignorados, a não ser que escapados com \
+        stripped = line.rstrip(' ')
+        if stripped.endswith('\\') and len(stripped) < len(line):
+            stripped += ' '
+        if not stripped or stripped.startswith('#') or stripped in ('!', '/'):
+            continue
+        rules.append(IgnoreRule(stripped))
+    return rules
+
+
+def read_ignore_file(path):
+    """Regras de um arquivo de ignore, ou [] se ele não existe ou não pode ser lido."""
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return parse_lines(f)
+    except OSError:
+        return []
+
+
+class IgnoreMatcher:
+    """
+    Regras válidas em um diretório: as do .gitignore dele mais as dos
+    diretórios acima (via `parent`). Os caminhos são relativos à raiz da
+    varredura.
+    """
+
+    def __init__(self, rules=(), base='', parent=None):
+        self.rules = list(rules)
+        self.base = base  # Diretório (relativo à raiz) do .gitignore destas regras
+        self.parent = parent
+        # Níveis com regras, do mais fundo para a raiz; vazio = nada a conferir
+        self.levels = ([self] if self.rules else []) + (parent.levels if parent else [])
+        # Se alguma regra vale para arquivos (as padrão são só de diretórios)
+        self.checks_files = any(not rule.dir_only for level in self.levels for rule in level.rules)
+
+    @classmethod
+    def for_root(cls, root_dir, patterns=None):
+        """Regras da raiz: IGNORE_PATTERNS, .git/info/exclude e o .gitignore da raiz."""
+        defaults = cls(parse_lines(IGNORE_PATTERNS if patterns is None else patterns))
+        exclude = read_ignore_file(os.path.join(root_dir, '.git', 'info', 'exclude'))
+        base = cls(exclude, parent=defaults) if exclude else defaults
+        return base.child(root_dir, '')
+
+    def child(self, dir_path, rel_dir):
+        """Matcher de um subdiretório; só cria um nível novo se ele tiver .gitignore."""
+        rules = read_ignore_file(os.path.join(dir_path, IGNORE_FILE))
+        if not rules:
+            return self
+        return IgnoreMatcher(rules, rel_dir.replace(os.sep, '/'), self)
+
+    def ignored(self, rel_path, name, is_dir):
+        """Se o item (caminho relativo à raiz) é ignorado."""
+        if not self.levels:
+            return False
+
+        rel_path = rel_path.replace(os.sep, '/')
+        for level in self.levels:
+            local = rel_path[len(level.base) + 1:] if level.base else rel_path
+            for rule in reversed(level.rules):
+                if rule.matches(local, name, is_dir):
+                    return not rule.negated
+        return False
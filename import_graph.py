@@ -0,0 +1,179 @@
+"""
+Grafo de dependências de importação do projeto Agenda Livre.
+
+Cada arquivo vira um nó com id inteiro; as arestas (importações resolvidas
+para arquivos do projeto) ficam em arrays no formato CSR, nos dois sentidos:
+1. successors(i): arquivos que i importa
+2. predecessors(i): arquivos que importam i
+3. strongly_connected_components(): componentes fortemente conexas (Tarjan)
+4. reachable(i): fecho transitivo a partir de um nó, em qualquer sentido
+
+Com arrays de inteiros o grafo continua compacto para dezenas de milhares de
+módulos.
+"""
+
+from array import array
+
+
+def _csr(edge_lists):
+    """Monta (offsets, targets) a partir de uma lista de listas de ids."""
+    offsets = array('i', [0])
+    targets = array('i')
+    for edges in edge_lists:
+        targets.extend(edges)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+class ImportGraph:
+    def __init__(self, nodes, edges_by_node):
+        """
+        `nodes` é a lista de arquivos (define os ids) e `edges_by_node` um mapa
+        arquivo -> arquivos importados. Arestas para fora de `nodes` e arestas
+        repetidas são descartadas.
+        """
+        self.nodes = list(nodes)
+        self.ids = {path: node_id for node_id, path in enumerate(self.nodes)}
+        node_count = len(self.nodes)
+
+        edge_lists = []
+        for path in self.nodes:
+            seen = set()
+            edges = []
+            for target in edges_by_node.get(path, ()):
+                target_id = self.ids.get(target)
+                if target_id is not None and target_id not in seen:
+                    seen.add(target_id)
+                    edges.append(target_id)
+            edge_lists.append(edges)
+        self.offsets, self.targets = _csr(edge_lists)
+
+        # Arestas reversas por contagem (sem listas intermediárias por nó)
+        in_degree = array('i', [0]) * node_count
+        for target_id in self.targets:
+            in_degree[target_id] += 1
+        self.reverse_offsets = array('i', [0]) * (node_count + 1)
+        for node_id in range(node_count):
+            self.reverse_offsets[node_id + 1] = self.reverse_offsets[node_id] + in_degree[node_id]
+        self.sources = array('i', [0]) * len(self.targets)
+        cursor = self.reverse_offsets[:-1]
+        for source_id in range(node_count):
+            for position in range(self.offsets[source_id], self.offsets[source_id + 1]):
+                target_id = self.targets[position]
+                self.sources[cursor[target_id]] = source_id
+                cursor[target_id] += 1
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def successors(self, node_id):
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def predecessors(self, node_id):
+        return self.sources[self.reverse_offsets[node_id]:self.reverse_offsets[node_id + 1]]
+
+    def in_degree(self, node_id):
+        return self.reverse_offsets[node_id + 1] - self.reverse_offsets[node_id]
+
+    def out_degree(self, node_id):
+        return self.offsets[node_id + 1] - self.offsets[node_id]
+
+    def reachable(self, node_id, reverse=False):
+        """Ids alcançáveis a partir de um nó (sem incluí-lo), seguindo importações ou importadores."""
+        offsets, targets = (self.reverse_offsets, self.sources) if reverse else (self.offsets, self.targets)
+        visited = bytearray(len(self.nodes))
+        visited[node_id] = 1
+        pending = [node_id]
+        found = []
+
+        while pending:
+            current = pending.pop()
+            for position in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[position]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    found.append(neighbor)
+                    pending.append(neighbor)
+
+        return found
+
+    def strongly_connected_components(self):
+        """Componentes fortemente conexas pelo algoritmo de Tarjan (versão iterativa)."""
+        node_count = len(self.nodes)
+        offsets, targets = self.offsets, self.targets
+        index_of = array('i', [-1]) * node_count
+        low = array('i', [0]) * node_count
+        on_stack = bytearray(node_count)
+        stack = []
+        components = []
+        counter = 0
+
+        for root in range(node_count):
+            if index_of[root] != -1:
+                continue
+
+            index_of[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [[root, offsets[root]]]
+
+            while work:
+                frame = work[-1]
+                node, position = frame
+                if position < offsets[node + 1]:
+                    frame[1] = position + 1
+                    neighbor = targets[position]
+                    if index_of[neighbor] == -1:
+                        index_of[neighbor] = low[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack[neighbor] = 1
+                        work.append([neighbor, offsets[neighbor]])
+                    elif on_stack[neighbor] and index_of[neighbor] < low[node]:
+                        low[node] = index_of[neighbor]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def cycles(self):
+        """Ciclos de importação: componentes com mais de um arquivo ou que importam a si mesmos."""
+        cycles = []
+        for component in self.strongly_connected_components():
+            if len(component) > 1 or component[0] in self.successors(component[0]):
+                cycles.append(sorted(component))
+        cycles.sort(key=lambda component: (-len(component), component[0]))
+        return [[self.nodes[node_id] for node_id in component] for component in cycles]
+
+    def most_depended_on(self, limit=10):
+        """Arquivos com mais importadores diretos, com o total de dependentes transitivos."""
+        ranked = sorted(
+            (node_id for node_id in range(len(self.nodes)) if self.in_degree(node_id)),
+            key=lambda node_id: (-self.in_degree(node_id), node_id)
+        )[:limit]
+
+        return [{
+            'file': self.nodes[node_id],
+            'direct_importers': self.in_degree(node_id),
+            'transitive_importers': len(self.reachable(node_id, reverse=True)),
+        } for node_id in ranked]
@@ -0,0 +1,227 @@
+"""
+Lexer de importações JS/TS do projeto Agenda Livre.
+
+Substitui os regex de importação (um por forma, cada um relendo o arquivo
+inteiro) por uma única passada linear sobre o código:
+1. Comentários, strings, template literals e regex literais são pulados, então
+   importações dentro deles não contam
+2. Importações em várias linhas, `export ... from`, `import type` e imports
+   só de efeito (`import './estilos.css'`) são reconhecidos
+3. Cada importação vira um ImportRecord com o número da linha
+
+Não é um parser completo: a passada salta direto (via re.search) para o
+próximo trecho que muda o contexto léxico ou para as palavras `import`,
+`export` e `require`; o código entre eles nem chega ao Python. A passada
+também termina na última posição em que uma importação poderia começar,
+então o corpo dos componentes (depois das importações) normalmente nem é lido.
+"""
+
+import re
+from collections import namedtuple
+
+# Uma importação encontrada no código.
+# kind: 'import', 'export' (export ... from), 'require' ou 'dynamic' (import('x'))
+ImportRecord = namedtuple('ImportRecord', ['kind', 'specifier', 'line', 'type_only'])
+
+# Trechos que interessam à passada principal; o resto é pulado pelo re.search.
+# O lookahead inicial deixa o re descartar rápido as posições que não começam
+# com nenhum desses caracteres
+_SIGNIFICANT = r'''
+    (?=[/'"`{}ier])
+    (?:
+      //[^\n]*
+    | /\*.*?(?:\*/|\Z)
+    | '(?:[^'\\\n]|\\.)*'?
+    | "(?:[^"\\\n]|\\.)*"?
+    | `
+    | /
+    | (?<![\w$.])(?:import|export|require)(?![\w$])
+'''
+_CODE_RE = re.compile(_SIGNIFICANT + ')', re.VERBOSE | re.DOTALL)
+
+# Dentro de `${ ... }` as chaves também contam, para saber onde o template volta
+_TEMPLATE_CODE_RE = re.compile(_SIGNIFICANT + '| [{}])', re.VERBOSE | re.DOTALL)
+
+# Reexportações (as únicas formas de `export` que importam algo)
+_REEXPORT_RE = re.compile(r'export\s+(?:type\s+)?[*{]')
+
+# Trecho de template literal até o próximo '`' ou '${'
+_TEMPLATE_RE = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*(`|\$\{)?', re.DOTALL)
+
+# Corpo de uma regex literal (depois da '/' inicial), com classes [...]
+_REGEX_RE = re.compile(r'(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[\w$]*')
+
+# Especificador entre aspas (grupo 'quote' + grupo 'specifier')
+_SPECIFIER = r'''(?P<quote>['"`])(?P<specifier>(?:(?!(?P=quote))[^\\\n])*)(?P=quote)'''
+
+# require('x') / import('x'), só com string literal
+_CALL_RE = re.compile(r'\s*\(\s*' + _SPECIFIER + r'\s*[),]')
+
+# import './estilos.css'
+_SIDE_EFFECT_RE = re.compile(r'\s*' + _SPECIFIER)
+
+# import [type] X, { a, b as c } / * as X from 'x' (comentários permitidos no meio).
+# A cláusula é lida por identificadores inteiros e para antes de outro
+# import/export: um `import a` sem from não percorre o resto do arquivo
+_IMPORT_CLAUSE_RE = re.compile(
+    r'(?P<type>\s*type\s+(?!from\b))?'
+    r'(?:[\s{},*]|(?!(?:import|export)(?![\w$]))[\w$]+(?![\w$])|/\*.*?\*/|//[^\n]*)*?'
+    r'\bfrom\s*' + _SPECIFIER,
+    re.DOTALL)
+
+# export [type] * [as X] from 'x' / export [type] { a, b } from 'x'
+_EXPORT_CLAUSE_RE = re.compile(
+    r'\s*(?P<type>type\s+)?(?:\*(?:\s*as\s+[\w$]+)?|\{[^}]*\})\s*from\s*' + _SPECIFIER)
+
+# Depois destas palavras uma '/' abre uma regex, não uma divisão
+_REGEX_KEYWORDS = frozenset([
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+])
+
+
+def _last_candidate(source):
+    """
+    Posição da última ocorrência que pode iniciar uma importação, ou -1, e
+    quantas buscas de regex foram feitas.
+
+    Usa str.rfind (busca em C, do fim para o começo); `export` só conta
+    quando é uma reexportação.
+    """
+    last = max(source.rfind('import'), source.rfind('require'))
+    position = len(source)
+    calls = 0
+    while True:
+        position = source.rfind('export', 0, position)
+        if position <= last:
+            return last, calls
+        calls += 1
+        if _REEXPORT_RE.match(source, position):
+            return position, calls
+
+
+def scan_imports(source, stats=None):
+    """
+    Retorna os ImportRecord do código, na ordem em que aparecem.
+
+    Com `stats` (dicionário), soma em stats['regex_calls'] as buscas de
+    regex feitas na passada.
+    """
+    records = []
+    limit, calls = _last_candidate(source)
+    if limit < 0:
+        if stats is not None:
+            stats['regex_calls'] = stats.get('regex_calls', 0) + calls
+        return records
+
+    position = 0
+    line = 1
+    line_position = 0  # Até onde as quebras de linha já foram contadas
+    braces = []        # Chaves abertas dentro de cada `${` pendente
+
+    while True:
+        match = (_TEMPLATE_CODE_RE if braces else _CODE_RE).search(source, position)
+        calls += 1
+        if match is None or match.start() > limit:
+            break
+
+        token = match.group()
+        position = match.end()
+        first = token[0]
+
+        if first == '`':
+            position = _skip_template(source, position, braces)
+            calls += 1
+        elif token == '/':
+            if _regex_allowed(source, match.start()):
+                regex = _REGEX_RE.match(source, position)
+                calls += 1
+                if regex:
+                    position = regex.end()
+        elif token == '{':
+            braces[-1] += 1
+        elif token == '}':
+            if braces[-1]:
+                braces[-1] -= 1
+            else:
+                braces.pop()
+                position = _skip_template(source, position, braces)
+                calls += 1
+        elif first in 'ier':
+            start = match.start()
+            line += source.count('\n', line_position, start)
+            line_position = start
+            position, tried = _parse_statement(token, source, position, line, records)
+            calls += tried
+        # Comentários e strings: nada a fazer, já foram pulados
+
+    if stats is not None:
+        stats['regex_calls'] = stats.get('regex_calls', 0) + calls
+    return records
+
+
+def _skip_template(source, position, braces):
+    """Pula o texto de um template literal; ao encontrar `${` volta ao código."""
+    chunk = _TEMPLATE_RE.match(source, position)
+    if chunk.group(1) == '${':
+        braces.append(0)
+    return chunk.end()
+
+
+def _regex_allowed(source, slash):
+    """Uma '/' abre regex se o que vem antes dela não pode terminar uma expressão."""
+    i = slash - 1
+    while i >= 0 and source[i] in ' \t\r\n':
+        i -= 1
+    if i < 0:
+        return True
+
+    char = source[i]
+    if char in ')]}\'"`':
+        return False
+    if char.isalnum() or char in '_$':
+        start = i
+        while start > 0 and (source[start - 1].isalnum() or source[start - 1] in '_$'):
+            start -= 1
+        return source[start:i + 1] in _REGEX_KEYWORDS
+    return True
+
+
+def _parse_statement(keyword, source, position, line, records):
+    """
+    Reconhece a importação que começa em `keyword`; retorna onde continuar e
+    quantos padrões foram tentados.
+    """
+    if keyword == 'require':
+        call = _CALL_RE.match(source, position)
+        if call and '${' not in call.group('specifier'):
+            records.append(ImportRecord('require', call.group('specifier'), line, False))
+        return position, 1
+
+    if keyword == 'export':
+        clause = _EXPORT_CLAUSE_RE.match(source, position)
+        if clause:
+            records.append(ImportRecord('export', clause.group('specifier'), line, clause.group('type') is not None))
+            return clause.end(), 1
+        return position, 1
+
+    call = _CALL_RE.match(source, position)
+    if call:
+        if '${' not in call.group('specifier'):
+            records.append(ImportRecord('dynamic', call.group('specifier'), line, False))
+        return position, 1
+
+    side_effect = _SIDE_EFFECT_RE.match(source, position)
+    if side_effect:
+        if side_effect.group('quote') != '`':
+            records.append(ImportRecord('import', side_effect.group('specifier'), line, False))
+            return side_effect.end(), 2
+        return position, 2
+
+    clause = _IMPORT_CLAUSE_RE.match(source, position)
+    if clause and clause.group('quote') != '`':
+        records.append(ImportRecord('import', clause.group('specifier'), line, clause.group('type') is not None))
+        return clause.end(), 3
+
+    # import.meta, `import x = require(...)`: o laço principal segue a partir daqui
+    return position, 3
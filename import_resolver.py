@@ -0,0 +1,269 @@
+"""
+Resolução de importações com aliases do tsconfig/jsconfig do projeto Agenda Livre.
+
+Lê `compilerOptions.baseUrl` e `compilerOptions.paths` do tsconfig.json (ou
+jsconfig.json) uma única vez e resolve qualquer especificador pelo mesmo índice
+de módulos das importações relativas (ver module_index.py):
+1. `./x` e `../x` são relativos ao arquivo que importa
+2. `@/components/x` passa pelos padrões de `paths`, compilados em uma trie
+   de prefixos; os padrões que casam são tentados do prefixo mais longo
+   para o mais curto até um alvo existir (`@/components/*` e depois `@/*`)
+3. Outros especificadores são tentados a partir de `baseUrl`; se não
+   existirem no projeto, são tratados como pacotes
+
+Os resultados ficam em uma tabela de memo indexada por (diretório, especificador).
+"""
+
+import json
+import os
+import posixpath
+import re
+
+from module_index import ASSET_EXTENSIONS, build_module_index
+
+# Configurações
+CONFIG_FILES = ['tsconfig.json', 'jsconfig.json']
+
+_EXTENSION_RE = re.compile(r'\.(js|jsx|ts|tsx)$')
+
+_resolvers = {}
+
+
+def _strip_json_comments(text):
+    """Remove comentários e vírgulas finais, permitidos no tsconfig mas não no JSON."""
+    result = []
+    i = 0
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == '"':
+            end = i + 1
+            while end < length and text[end] != '"':
+                end += 2 if text[end] == '\\' else 1
+            result.append(text[i:end + 1])
+            i = end + 1
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = length if end == -1 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+        else:
+            result.append(char)
+            i += 1
+
+    return re.sub(r',(\s*[}\]])', r'\1', ''.join(result))
+
+
+def load_compiler_options(root_dir):
+    """
+    Retorna os compilerOptions do primeiro tsconfig/jsconfig encontrado na raiz,
+    seguindo `extends` para arquivos locais.
+
+    Para baseUrl e paths, guarda também o diretório (relativo à raiz) do arquivo
+    que os declarou em `_baseUrlDir` / `_pathsDir`.
+    """
+    for name in CONFIG_FILES:
+        config_path = os.path.join(root_dir, name)
+        if os.path.isfile(config_path):
+            break
+    else:
+        return {}
+
+    options = {}
+    seen = set()
+    chain = []
+
+    # Seguir a cadeia de `extends` (apenas arquivos locais, não pacotes)
+    while config_path and config_path not in seen and os.path.isfile(config_path):
+        seen.add(config_path)
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.loads(_strip_json_comments(f.read()))
+        except Exception as e:
+            print(f"Erro ao ler {config_path}: {e}")
+            break
+
+        chain.append((config, os.path.dirname(config_path)))
+        parent = config.get('extends')
+        if isinstance(parent, str) and parent.startswith('.'):
+            if not parent.endswith('.json'):
+                parent += '.json'
+            config_path = os.path.join(os.path.dirname(config_path), parent)
+        else:
+            config_path = None
+
+    # As opções do arquivo mais próximo sobrescrevem as herdadas; baseUrl e
+    # paths são relativos ao arquivo que os declarou
+    for config, directory in reversed(chain):
+        compiler = config.get('compilerOptions') or {}
+        rel_dir = os.path.relpath(directory, root_dir)
+        rel_dir = '' if rel_dir == '.' else rel_dir.replace(os.sep, '/')
+        for key, value in compiler.items():
+            options[key] = value
+            if key in ('baseUrl', 'paths'):
+                options['_' + key + 'Dir'] = rel_dir
+
+    return options
+
+
+class AliasTrie:
+    """Trie de prefixos dos padrões de `paths` (`@/*`, `~components/*`, ...)."""
+
+    def __init__(self):
+        self.root = {}
+        self.exact = {}
+
+    def add(self, pattern, targets):
+        if '*' not in pattern:
+            self.exact[pattern] = targets
+            return
+
+        prefix, suffix = pattern.split('*', 1)
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append((suffix, targets))
+
+    def matches(self, specifier):
+        """
+        Retorna [(alvos, trecho casado com '*'), ...] de todos os padrões que
+        casam, do prefixo mais longo para o mais curto (o exato vem primeiro).
+        """
+        found = []
+        if specifier in self.exact:
+            found.append((self.exact[specifier], ''))
+
+        nodes = []
+        node = self.root
+        depth = 0
+        for char in specifier:
+            if None in node:
+                nodes.append((depth, node[None]))
+            node = node.get(char)
+            if node is None:
+                break
+            depth += 1
+        else:
+            if None in node:
+                nodes.append((depth, node[None]))
+
+        for depth, patterns in reversed(nodes):
+            rest = specifier[depth:]
+            for suffix, targets in patterns:
+                if rest.endswith(suffix):
+                    found.append((targets, rest[:len(rest) - len(suffix)] if suffix else rest))
+
+        return found
+
+
+class ImportResolver:
+    def __init__(self, root_dir, module_index=None):
+        self.root_dir = root_dir
+        self.module_index = module_index if module_index is not None else build_module_index(root_dir)
+        self.memo = {}
+        self.load_config()
+
+    def load_config(self):
+        """(Re)lê baseUrl e paths do tsconfig/jsconfig e reconstrói a trie de aliases."""
+        self.memo.clear()
+        self.aliases = AliasTrie()
+        self.base_url = None
+
+        options = load_compiler_options(self.root_dir)
+
+        if 'baseUrl' in options:
+            self.base_url = self._normalize(posixpath.join(options.get('_baseUrlDir', ''), options['baseUrl']))
+
+        # Sem baseUrl, os alvos de `paths` são relativos ao próprio tsconfig
+        paths_base = self.base_url if self.base_url is not None else options.get('_pathsDir', '')
+        for pattern, targets in (options.get('paths') or {}).items():
+            self.aliases.add(pattern, [posixpath.join(paths_base, target) for target in targets])
+
+    @staticmethod
+    def _normalize(path):
+        key = posixpath.normpath(path)
+        return '' if key == '.' else key
+
+    def resolve_key(self, from_dir, specifier):
+        """
+        Retorna o caminho de módulo (sem extensão) de uma importação.
+
+        O resultado é None quando a importação não pode ser verificada
+        (pacote do node_modules). Um caminho que não está no índice indica
+        uma importação quebrada.
+        """
+        return self.resolve_with_dependencies(from_dir, specifier)[0]
+
+    def resolve_with_dependencies(self, from_dir, specifier):
+        """
+        Retorna (caminho de módulo, caminhos consultados no índice).
+
+        Os caminhos consultados são os que, se criados ou removidos, podem
+        mudar o resultado; o modo --watch usa isso para reverificar apenas os
+        arquivos afetados.
+        """
+        memo_key = (from_dir, specifier)
+        if memo_key in self.memo:
+            return self.memo[memo_key]
+
+        result = self._resolve_key(from_dir, specifier)
+        self.memo[memo_key] = result
+        return result
+
+    def _resolve_key(self, from_dir, specifier):
+        # Imagens, fontes e JSON não estão no inventário
+        if posixpath.splitext(specifier)[1] in ASSET_EXTENSIONS:
+            return None, ()
+
+        if specifier.startswith('./') or specifier.startswith('../'):
+            key = self.module_index.module_key(from_dir, specifier)
+            return key, (key,)
+
+        bare = _EXTENSION_RE.sub('', specifier)
+
+        # Aliases de `paths`: os padrões são tentados do prefixo mais longo
+        # para o mais curto e o primeiro alvo existente vence; se nenhum
+        # existir, a importação está quebrada e reportamos o primeiro alvo
+        # do padrão mais longo
+        candidates = tuple(dict.fromkeys(self._normalize(_EXTENSION_RE.sub('', target.replace('*', star)))
+                                         for targets, star in self.aliases.matches(specifier)
+                                         for target in targets))
+        if candidates:
+            for candidate in candidates:
+                if candidate in self.module_index:
+                    return candidate, candidates
+            return candidates[0], candidates
+
+        # Importações "absolutas" a partir de baseUrl
+        if self.base_url is not None:
+            candidate = self._normalize(posixpath.join(self.base_url, bare))
+            if candidate in self.module_index:
+                return candidate, (candidate,)
+            return None, (candidate,)
+
+        return None, ()
+
+    def invalidate(self):
+        """Descarta o memo; necessário quando arquivos são criados ou removidos."""
+        self.memo.clear()
+
+    def resolve(self, from_dir, specifier):
+        """Resolve uma importação para o arquivo concreto do projeto, ou None."""
+        key = self.resolve_key(from_dir, specifier)
+        if key is None:
+            return None
+        return self.module_index.lookup(key)
+
+
+def build_import_resolver(root_dir):
+    """Retorna o resolvedor do projeto, reaproveitado enquanto o índice de módulos não mudar."""
+    module_index = build_module_index(root_dir)
+    root = os.path.abspath(root_dir)
+    cached = _resolvers.get(root)
+    if cached is not None and cached.module_index is module_index:
+        return cached
+
+    resolver = ImportResolver(root_dir, module_index)
+    _resolvers[root] = resolver
+    return resolver
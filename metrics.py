@@ -0,0 +1,102 @@
+"""
+Métricas de execução das ferramentas do projeto Agenda Livre.
+
+Cada ferramenta tem um Metrics onde as fases registram:
+1. Tempo de parede e número de chamadas de cada fase (decorador @measured)
+2. Contadores livres (arquivos alterados, importações verificadas, ...)
+3. Estatísticas de componentes já existentes (cache de fatos, ContentStore,
+   regras de reescrita, backups), lidas no momento do relatório
+
+O resultado vai como bloco `metrics` no relatório JSON de cada ferramenta.
+Com --profile, a execução também é gravada pelo cProfile (ver profiled).
+"""
+
+import cProfile
+import contextlib
+import functools
+import time
+
+
+class Metrics:
+    def __init__(self):
+        self.phases = {}    # fase -> {'seconds': ..., 'calls': ...}
+        self.counters = {}
+        self.sources = {}   # nome -> dicionário de estatísticas de outro componente
+        self._running = {}  # fase -> (início, profundidade), para fases ainda abertas
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Mede uma fase; chamadas recursivas contam só a mais externa."""
+        if name in self._running:
+            start, depth = self._running[name]
+            self._running[name] = (start, depth + 1)
+            try:
+                yield
+            finally:
+                self._running[name] = (start, depth)
+            return
+
+        self._running[name] = (time.perf_counter(), 0)
+        try:
+            yield
+        finally:
+            start, _ = self._running.pop(name)
+            phase = self.phases.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            phase['seconds'] += time.perf_counter() - start
+            phase['calls'] += 1
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def track(self, name, stats):
+        """Inclui no relatório as estatísticas (dicionário) de um componente."""
+        self.sources[name] = stats
+
+    def as_dict(self):
+        """Bloco `metrics` do relatório; fases ainda abertas entram com o tempo até agora."""
+        now = time.perf_counter()
+        phases = {}
+        for name, phase in self.phases.items():
+            phases[name] = {'seconds': round(phase['seconds'], 4), 'calls': phase['calls']}
+        for name, (start, _) in self._running.items():
+            phase = phases.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            phase['seconds'] = round(phase['seconds'] + now - start, 4)
+            phase['calls'] += 1
+            phase['running'] = True
+
+        sources = {}
+        for name, stats in self.sources.items():
+            stats = dict(stats)
+            if 'hits' in stats and 'misses' in stats:
+                hits = stats['hits'] + stats.get('hash_hits', 0)
+                lookups = hits + stats['misses']
+                stats['hit_rate'] = round(hits / lookups, 4) if lookups else None
+            sources[name] = stats
+
+        return {'phases': phases, 'counters': dict(self.counters), **sources}
+
+
+def measured(method):
+    """Decorador: registra o método como uma fase em self.metrics."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.metrics.phase(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@contextlib.contextmanager
+def profiled(path):
+    """Grava um perfil cProfile da execução em `path` (nada a fazer se for None)."""
+    if not path:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Perfil salvo em {path} (ver com: python -m pstats {path})")
@@ -0,0 +1,161 @@
+"""
+Índice de resolução de módulos do projeto Agenda Livre.
+
+Construído uma vez a partir do inventário de arquivos, mapeia o caminho de
+módulo sem extensão (com '/' como separador) para o arquivo concreto:
+1. `src/components/Button` -> `src/components/Button.tsx`
+2. `src/components` -> `src/components/index.ts` (fallback de index já embutido)
+3. `styles/globals.css` -> `styles/globals.css` (folhas de estilo, pelo nome completo)
+
+Assim verificar se uma importação existe é uma consulta a um dicionário, em
+vez de testar 4 extensões x 2 formas contra a lista de arquivos.
+"""
+
+import os
+import posixpath
+import re
+
+from workspace_scanner import scan_workspace
+
+# Extensões resolvidas, em ordem de preferência
+RESOLVE_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx']
+
+# Folhas de estilo só respondem pelo nome completo (import './estilos.css')
+STYLE_EXTENSIONS = ['.css', '.scss']
+
+# Arquivos fora do inventário; importações deles não são verificadas
+ASSET_EXTENSIONS = ['.json', '.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.woff', '.woff2']
+
+_EXTENSION_RE = re.compile(r'\.(js|jsx|ts|tsx)$')
+
+_indexes = {}
+
+
+def to_module_path(file_path):
+    """Converte um caminho do inventário para o formato com '/'."""
+    return file_path.replace(os.sep, '/') if os.sep != '/' else file_path
+
+
+def module_dir(file_path):
+    """Diretório (com '/') de um arquivo do inventário, '' para a raiz."""
+    return posixpath.dirname(to_module_path(file_path))
+
+
+class ModuleIndex:
+    def __init__(self, files):
+        self.modules = {}  # caminho de módulo -> arquivo concreto
+        self.ranks = {}    # caminho de módulo -> prioridade do arquivo escolhido
+        self.files = set()
+
+        for file_path in files:
+            self.add_file(file_path)
+
+    @staticmethod
+    def _module_keys(file_path):
+        """Caminhos de módulo pelos quais um arquivo responde, com sua prioridade."""
+        base, ext = os.path.splitext(file_path)
+        if ext in STYLE_EXTENSIONS:
+            return [(to_module_path(file_path), 0)]
+        if ext not in RESOLVE_EXTENSIONS:
+            return []
+
+        key = to_module_path(base)
+        ext_rank = RESOLVE_EXTENSIONS.index(ext)
+        keys = [(key, ext_rank)]
+
+        # `dir/index.ts` também responde por `dir`, com prioridade menor que `dir.ts`
+        if key == 'index' or key.endswith('/index'):
+            keys.append((key[:-len('/index')] if key != 'index' else '', len(RESOLVE_EXTENSIONS) + ext_rank))
+
+        return keys
+
+    def add_file(self, file_path):
+        """Inclui um arquivo no índice; retorna os caminhos de módulo afetados."""
+        keys = self._module_keys(file_path)
+        if keys:
+            self.files.add(file_path)
+
+        for module_key, rank in keys:
+            if module_key not in self.ranks or rank < self.ranks[module_key]:
+                self.ranks[module_key] = rank
+                self.modules[module_key] = file_path
+
+        return [module_key for module_key, _ in keys]
+
+    def remove_file(self, file_path):
+        """Remove um arquivo do índice; retorna os caminhos de módulo afetados."""
+        keys = self._module_keys(file_path)
+        self.files.discard(file_path)
+
+        for module_key, _ in keys:
+            if self.modules.get(module_key) != file_path:
+                continue
+
+            # Escolher o próximo melhor candidato entre os arquivos restantes
+            del self.modules[module_key]
+            del self.ranks[module_key]
+            native = module_key.replace('/', os.sep)
+            index_base = os.path.join(native, 'index') if native else 'index'
+            for rank, candidate in enumerate(
+                    [native + ext for ext in RESOLVE_EXTENSIONS] +
+                    [index_base + ext for ext in RESOLVE_EXTENSIONS]):
+                if candidate in self.files:
+                    self.modules[module_key] = candidate
+                    self.ranks[module_key] = rank
+                    break
+
+        return [module_key for module_key, _ in keys]
+
+    def __contains__(self, module_key):
+        return module_key in self.modules
+
+    def __len__(self):
+        return len(self.modules)
+
+    def lookup(self, module_key):
+        """Retorna o arquivo concreto de um caminho de módulo, ou None."""
+        return self.modules.get(module_key)
+
+    def module_key(self, from_dir, specifier):
+        """
+        Calcula o caminho de módulo de uma importação relativa.
+
+        Retorna None para importações não relativas (pacotes ou aliases).
+        Caminhos que saem da raiz do projeto começam com '../' e nunca estão
+        no índice.
+        """
+        if not (specifier.startswith('./') or specifier.startswith('../')):
+            return None
+
+        specifier = _EXTENSION_RE.sub('', specifier)
+        key = posixpath.normpath(posixpath.join(from_dir, specifier))
+
+        return '' if key == '.' else key
+
+    def resolve(self, from_dir, specifier):
+        """Resolve uma importação relativa para o arquivo concreto, ou None."""
+        key = self.module_key(from_dir, specifier)
+        if key is None:
+            return None
+        return self.modules.get(key)
+
+
+def build_module_index(root_dir, files=None):
+    """
+    Retorna o índice de módulos do projeto.
+
+    Sem `files`, o índice é construído a partir do inventário compartilhado e
+    reaproveitado por todas as ferramentas enquanto o inventário não mudar.
+    """
+    if files is not None:
+        return ModuleIndex(files)
+
+    inventory = scan_workspace(root_dir)
+    root = os.path.abspath(root_dir)
+    cached = _indexes.get(root)
+    if cached is not None and cached[0] is inventory:
+        return cached[1]
+
+    index = ModuleIndex(entry.path for entry in inventory)
+    _indexes[root] = (inventory, index)
+    return index
@@ -0,0 +1,68 @@
+"""
+Tabela de caminhos do inventário do projeto Agenda Livre.
+
+A varredura e as ferramentas criavam objetos de caminho repetidamente para
+cada arquivo: Path(...).parent, str(...), posixpath.dirname(...). Aqui cada
+diretório é registrado uma única vez, quando a varredura entra nele:
+1. Diretório -> id inteiro, com o caminho relativo já nas formas usadas
+   pelas ferramentas (separador do sistema, com '/', como Path(...).parent e
+   como prefixo dos arquivos) e o id do diretório pai
+2. Cada arquivo do inventário é guardado como (id do diretório, nome); o
+   caminho relativo só é montado (prefixo + nome) quando alguém pede
+3. Consultas como "diretório deste arquivo" devolvem sempre a mesma string
+   já guardada, sem criar nada que sobreviva à consulta
+
+Diretórios que não vieram da varredura (ex.: o de um arquivo que um corretor
+acabou de criar) são registrados na primeira consulta.
+"""
+
+import os
+
+ROOT_ID = 0
+
+
+class PathTable:
+    def __init__(self):
+        self.dirs = ['']           # id -> caminho relativo (separador do sistema); '' é a raiz
+        self.module_dirs = ['']    # id -> caminho com '/' (como module_index.module_dir)
+        self.display_dirs = ['.']  # id -> como str(Path(arquivo).parent)
+        self.prefixes = ['']       # id -> prefixo dos caminhos dos arquivos ('src/' ...)
+        self.parents = [-1]        # id -> id do diretório pai (-1 para a raiz)
+        self.dir_ids = {'': ROOT_ID}
+
+    def add_dir(self, rel_dir, parent_id):
+        """Registra um diretório (filho de `parent_id`); retorna o id."""
+        dir_id = self.dir_ids.get(rel_dir)
+        if dir_id is not None:
+            return dir_id
+
+        dir_id = len(self.dirs)
+        self.dir_ids[rel_dir] = dir_id
+        self.dirs.append(rel_dir)
+        self.module_dirs.append(rel_dir.replace(os.sep, '/') if os.sep != '/' else rel_dir)
+        self.display_dirs.append(rel_dir)
+        self.prefixes.append(rel_dir + os.sep)
+        self.parents.append(parent_id)
+        return dir_id
+
+    def _intern_dir(self, rel_dir):
+        dir_id = self.dir_ids.get(rel_dir)
+        if dir_id is None:
+            dir_id = self.add_dir(rel_dir, self._intern_dir(os.path.dirname(rel_dir)))
+        return dir_id
+
+    def path(self, dir_id, name):
+        """Caminho relativo de um arquivo do diretório `dir_id`."""
+        return self.prefixes[dir_id] + name
+
+    def dir_id(self, file_path):
+        """Id do diretório de um arquivo (pelo caminho relativo)."""
+        return self._intern_dir(os.path.dirname(file_path))
+
+    def module_dir(self, file_path):
+        """Diretório do arquivo com '/', '' para a raiz."""
+        return self.module_dirs[self.dir_id(file_path)]
+
+    def display_dir(self, file_path):
+        """Diretório do arquivo como str(Path(arquivo).parent): '.' para a raiz."""
+        return self.display_dirs[self.dir_id(file_path)]
@@ -8,162 +8,196 @@ Este script vai:
 4. Gerar um relatório detalhado
 """
 
-import os
-import re
 import json
 from collections import defaultdict
 from pathlib import Path
 
+from facts_table import IS_COMPONENT, FactsTable
+from file_cache import FileFactsCache
+from import_graph import ImportGraph
+from import_resolver import build_import_resolver
+from metrics import Metrics, measured, profiled
+from similarity_index import SimilarityIndex
+from typescript_worker import TSCONFIG, TYPESCRIPT_EXTENSIONS, start_tsc_worker
+from workspace_scanner import iter_files, workspace_paths
+
 # Configurações
 PROJECT_ROOT = '.'  # Diretório atual
-IGNORE_DIRS = ['.git', '.next', 'node_modules', 'coverage', '.history', 'backups', 'backup_20250414_181421', 'broken_state_20250414_183530',]
 SUPPORTED_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx', '.css', '.scss']
 
-# Padrões de regex para encontrar importações
-IMPORT_PATTERNS = [
-    r'import\s+.*?from\s+[\'"](.+?)[\'"]',  # import X from 'path'
-    r'require\([\'"](.+?)[\'"]\)',          # require('path')
-    r'import\([\'"](.+?)[\'"]\)',           # import('path')
-]
-
 class ProjectAnalyzer:
-    def __init__(self, root_dir):
+    def __init__(self, root_dir, use_cache=True, jobs=1, workspace=None, tsc=None):
         self.root_dir = Path(root_dir)
+        # TscWorker (ver typescript_worker.py) para diagnósticos reais; sem ele, heurísticas
+        self.tsc = tsc
+        self.tsc_stale = False  # Arquivos .ts/.tsx mudaram desde a última compilação usada
+        self.jobs = jobs  # Processos para extrair fatos dos arquivos (1 = serial)
+        # Com um Workspace (ver shared_workspace.py), cache e conteúdos são os mesmos das outras etapas
+        self.cache = workspace.cache if workspace else FileFactsCache(root_dir, enabled=use_cache)
         self.files = []
         self.imports = {}
         self.duplications = []
-        self.file_contents = {}
+        self.file_facts = {}  # Fatos extraídos por arquivo (ver file_facts.py)
         self.import_errors = []
+        self.import_errors_by_file = {}
+        self.importers = defaultdict(set)  # Caminho de módulo -> arquivos que dependem dele
+        self.imported_keys = {}            # Arquivo -> caminhos de módulo dos quais depende
+        self.resolved_imports = {}         # Arquivo -> arquivos do projeto que importa
+        self.import_graph = None
+        self.resolver = None  # Construído após a varredura (ver import_resolver.py)
         self.files_by_name = defaultdict(list)
         self.component_files = []  # Arquivos que são componentes React
+        self.table = FactsTable()  # Colunas compactas por arquivo para as agregações (ver facts_table.py)
+        self.paths = None  # PathTable do inventário: diretório de cada arquivo (ver path_table.py)
+        self.metrics = Metrics()  # Tempos por fase e contadores (bloco 'metrics' do relatório)
+        self.metrics.track('cache', self.cache.stats)
+        if tsc is not None:
+            self.metrics.track('tsc', tsc.stats)
         
+    @measured
     def scan_directory(self):
         """Escaneia o diretório do projeto recursivamente."""
         print(f"Escaneando diretório: {self.root_dir}")
         
-        for root, dirs, files in os.walk(self.root_dir):
-            # Ignorar diretórios específicos
-            dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+        entries = list(iter_files(self.root_dir, SUPPORTED_EXTENSIONS))
+        
+        # Fatos dos arquivos (importações, componente, TypeScript), lidos do
+        # cache ou extraídos em paralelo quando jobs > 1
+        facts_by_path = self.cache.facts_for_all(entries, jobs=self.jobs)
+        
+        for entry in entries:
+            # Caminho montado uma vez (ver FileEntry) e compartilhado pelas estruturas
+            path = entry.path
+            self.files.append(path)
             
-            for file in files:
-                file_path = Path(root) / file
-                rel_path = file_path.relative_to(self.root_dir)
-                
-                # Verificar se a extensão é suportada
-                if file_path.suffix in SUPPORTED_EXTENSIONS:
-                    self.files.append(str(rel_path))
-                    
-                    # Armazenar arquivos por nome para detectar duplicações
-                    self.files_by_name[file].append(str(rel_path))
-                    
-                    # Identificar componentes React
-                    if self._is_react_component(file_path):
-                        self.component_files.append(str(rel_path))
+            # Armazenar arquivos por nome para detectar duplicações
+            self.files_by_name[entry.name].append(path)
+            
+            facts = facts_by_path.get(path)
+            if facts is None:
+                continue
+            self.file_facts[path] = facts
+            
+            # Identificar componentes React
+            if facts['is_component']:
+                self.component_files.append(path)
         
+        self.cache.prune(self.files)
+        self.cache.save()
+        
+        self.paths = workspace_paths(self.root_dir)
+        self.table = FactsTable.build(self.files, self.file_facts, self.paths)
+        self.metrics.count('files_scanned', len(entries))
         print(f"Total de arquivos encontrados: {len(self.files)}")
-    
-    def _is_react_component(self, file_path):
-        """Verifica se o arquivo é um componente React."""
-        suffixes = ['.jsx', '.tsx']
-        if file_path.suffix in suffixes:
-            return True
-        
-        # Também verificar arquivos .js e .ts que podem ser componentes
-        if file_path.suffix in ['.js', '.ts']:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # Verificar padrões comuns de componentes React
-                    if re.search(r'(import React|from [\'"]react[\'"](;|,))', content) and \
-                       (re.search(r'function\s+\w+\s*\(', content) or \
-                        re.search(r'const\s+\w+\s*=\s*\(', content) or \
-                        re.search(r'class\s+\w+\s+extends\s+React\.Component', content)):
-                        return True
-            except Exception as e:
-                print(f"Erro ao ler arquivo {file_path}: {e}")
-        
-        return False
+        stats = self.cache.stats
+        print(f"Cache: {stats['hits'] + stats['hash_hits']} arquivos reaproveitados, {stats['misses']} analisados")
                     
+    @measured
     def analyze_imports(self):
         """Analisa as importações em cada arquivo."""
         print("Analisando importações...")
         
+        # Índice de módulos e aliases do tsconfig construídos uma vez; cada
+        # importação vira uma consulta
+        self.resolver = build_import_resolver(self.root_dir)
+        
         for file_path in self.files:
-            full_path = self.root_dir / file_path
-            try:
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    self.file_contents[file_path] = content
-                    
-                    # Encontrar todas as importações
-                    imports = []
-                    for pattern in IMPORT_PATTERNS:
-                        imports.extend(re.findall(pattern, content))
-                    
-                    # Armazenar importações
-                    self.imports[file_path] = imports
-                    
-                    # Verificar importações com problemas
-                    self._check_import_errors(file_path, imports)
-                    
-            except Exception as e:
-                print(f"Erro ao analisar arquivo {file_path}: {e}")
-    
-    def _check_import_errors(self, file_path, imports):
-        """Verifica possíveis erros nas importações."""
-        for imp in imports:
-            # Ignorar importações de pacotes (não começam com .)
-            if not imp.startswith('.'):
+            facts = self.file_facts.get(file_path)
+            if facts is None:
                 continue
-                
-            # Calcular o caminho completo da importação
-            current_dir = Path(file_path).parent
-            import_path = self._resolve_import_path(current_dir, imp)
+            
+            # Armazenar importações
+            self.imports[file_path] = facts['imports']
+            
+            # Verificar importações com problemas
+            self._check_import_errors(file_path, facts['import_records'])
+            self.metrics.count('imports_checked', len(facts['import_records']))
+        
+        self._collect_import_errors()
+    
+    def _check_import_errors(self, file_path, import_records):
+        """Verifica possíveis erros nas importações de um arquivo."""
+        current_dir = self.paths.module_dir(file_path)
+        errors = []
+        dependencies = set()
+        resolved = []
+        
+        for kind, imp, line, _ in import_records:
+            # Calcular o caminho completo da importação (None para pacotes)
+            import_path, keys = self._resolve_import_path(current_dir, imp)
+            dependencies.update(keys)
+            
+            # Arestas do grafo de dependências
+            if import_path is not None:
+                target = self.resolver.module_index.lookup(import_path)
+                if target is not None:
+                    resolved.append(target)
             
             # Verificar se o arquivo importado existe
             if not self._import_file_exists(import_path):
-                self.import_errors.append({
+                errors.append({
                     'file': file_path,
                     'import': imp,
-                    'resolved_path': str(import_path) if import_path else None,
+                    'line': line,
+                    'kind': kind,
+                    'resolved_path': import_path,
                     'error': 'Arquivo não encontrado'
                 })
-    
-    def _resolve_import_path(self, current_dir, import_path):
-        """Resolve o caminho completo de uma importação."""
-        # Remover extensão da importação, se houver
-        import_path = re.sub(r'\.(js|jsx|ts|tsx)$', '', import_path)
         
-        # Caminho relativo
-        if import_path.startswith('./') or import_path.startswith('../'):
-            resolved = (current_dir / import_path).resolve().relative_to(self.root_dir)
-            return resolved
+        # Atualizar o mapa reverso usado pelo modo --watch
+        self._forget_import_dependencies(file_path)
+        for key in dependencies:
+            self.importers[key].add(file_path)
+        self.imported_keys[file_path] = dependencies
+        self.resolved_imports[file_path] = resolved
         
-        # Importações absolutas (podem ser baseadas em aliases configurados no projeto)
-        return None
+        if errors:
+            self.import_errors_by_file[file_path] = errors
+    
+    def _forget_import_dependencies(self, file_path):
+        """Remove um arquivo do mapa reverso de importações e dos erros."""
+        for key in self.imported_keys.pop(file_path, ()):
+            importers = self.importers.get(key)
+            if importers is not None:
+                importers.discard(file_path)
+                if not importers:
+                    del self.importers[key]
+        self.resolved_imports.pop(file_path, None)
+        self.import_errors_by_file.pop(file_path, None)
+    
+    def _collect_import_errors(self):
+        """Monta a lista de erros de importação na ordem dos arquivos."""
+        self.import_errors = [
+            error
+            for file_path in self.files if file_path in self.import_errors_by_file
+            for error in self.import_errors_by_file[file_path]
+        ]
+    
+    def _resolve_import_path(self, current_dir, import_path):
+        """Resolve o caminho de módulo (sem extensão) de uma importação e suas dependências."""
+        # Relativas, aliases do tsconfig (paths) e importações a partir de baseUrl
+        return self.resolver.resolve_with_dependencies(current_dir, import_path)
     
     def _import_file_exists(self, import_path):
         """Verifica se o arquivo importado existe."""
         if import_path is None:
-            return True  # Não podemos verificar importações absolutas sem conhecer os aliases
+            return True  # Pacotes do node_modules não são verificados
         
-        # Verificar diferentes extensões possíveis
-        for ext in ['.js', '.jsx', '.ts', '.tsx']:
-            potential_file = str(import_path) + ext
-            if potential_file in self.files:
-                return True
-            
-            # Verificar se existe como index
-            potential_index = str(import_path) + '/index' + ext
-            if potential_index in self.files:
-                return True
-        
-        return False
+        # Arquivo com qualquer extensão suportada, ou index dentro do diretório
+        return import_path in self.resolver.module_index
             
+    @measured
     def find_duplications(self):
         """Encontra arquivos duplicados (mesmo nome em locais diferentes)."""
         print("Procurando duplicações...")
         
+        self._collect_duplications()
+        
+        print(f"Encontradas {len(self.duplications)} duplicações")
+    
+    def _collect_duplications(self):
+        """Monta a lista de duplicações a partir de files_by_name."""
+        self.duplications = []
         for filename, paths in self.files_by_name.items():
             if len(paths) > 1:
                 # Ignorar arquivos comuns como index.js que podem aparecer em múltiplos diretórios
@@ -172,20 +206,93 @@ class ProjectAnalyzer:
                         'filename': filename,
                         'paths': paths
                     })
+    
+    @measured
+    def apply_changes(self, entries, changed, removed, config_changed=False):
+        """
+        Atualiza a análise em memória após mudanças no disco (modo --watch).
         
-        print(f"Encontradas {len(self.duplications)} duplicações")
+        `entries` é o inventário novo, `changed` os caminhos criados ou
+        modificados e `removed` os caminhos removidos. Só os arquivos alterados
+        são relidos, e só eles e os que importam módulos criados/removidos têm
+        as importações reverificadas. Com `config_changed` (tsconfig/jsconfig
+        alterado) os aliases são relidos e todas as importações reverificadas.
+        """
+        index = self.resolver.module_index
+        old_files = set(self.files)
+        affected_keys = set()
+        
+        for file_path in removed:
+            self.file_facts.pop(file_path, None)
+            self.imports.pop(file_path, None)
+            self._forget_import_dependencies(file_path)
+            affected_keys.update(index.remove_file(file_path))
+        
+        for file_path in changed:
+            if file_path not in old_files:
+                affected_keys.update(index.add_file(file_path))
+        
+        # Reler apenas os arquivos alterados
+        entries_by_path = {entry.path: entry for entry in entries}
+        changed_entries = [entries_by_path[path] for path in changed if path in entries_by_path]
+        new_facts = self.cache.facts_for_all(changed_entries, jobs=self.jobs)
+        self.cache.save()
+        
+        # Reordenar as estruturas derivadas na ordem do inventário, como em uma execução completa
+        facts = self.file_facts
+        facts.update(new_facts)
+        self.files = [entry.path for entry in entries]
+        self.files_by_name = defaultdict(list)
+        for entry, path in zip(entries, self.files):
+            self.files_by_name[entry.name].append(path)
+        self.file_facts = {path: facts[path] for path in self.files if path in facts}
+        self.component_files = [path for path, file_facts in self.file_facts.items() if file_facts['is_component']]
+        self.paths = workspace_paths(self.root_dir)
+        self.table = FactsTable.build(self.files, self.file_facts, self.paths)
+        
+        # Reverificar importações dos arquivos alterados e dos que dependem de módulos afetados
+        if affected_keys:
+            self.resolver.invalidate()
+        to_check = set(new_facts)
+        if config_changed:
+            self.resolver.load_config()
+            to_check.update(self.file_facts)
+        for key in affected_keys:
+            to_check.update(self.importers.get(key, ()))
+        for file_path in to_check:
+            if file_path in self.file_facts:
+                self.imports[file_path] = self.file_facts[file_path]['imports']
+                self._check_import_errors(file_path, self.file_facts[file_path]['import_records'])
+        for file_path in changed:
+            if file_path not in self.file_facts:
+                self.imports.pop(file_path, None)
+                self._forget_import_dependencies(file_path)
+        
+        self._collect_import_errors()
+        self._collect_duplications()
+        
+        # O tsc --watch recompila sozinho; o relatório espera a nova compilação
+        if any(path.endswith(TYPESCRIPT_EXTENSIONS) for path in list(changed) + list(removed)):
+            self.tsc_stale = True
+        
+        return len(to_check)
     
+    @measured
     def analyze_typescript_errors(self):
         """Analisa possíveis erros de TypeScript nos arquivos."""
+        if self.tsc is not None:
+            typescript_errors = self._tsc_errors()
+            if typescript_errors is not None:
+                return typescript_errors
+        
         print("Analisando potenciais erros de TypeScript...")
         
         typescript_errors = []
         
-        for file_path, content in self.file_contents.items():
+        for file_path, facts in self.file_facts.items():
             if file_path.endswith('.ts') or file_path.endswith('.tsx'):
-                # Procurar por funções/componentes sem tipagem
-                untypedParams = re.findall(r'function\s+\w+\s*\(([^:)]+)\)', content)
-                untypedParams.extend(re.findall(r'const\s+\w+\s*=\s*\(([^:)]+)\)', content))
+                # Funções/componentes sem tipagem
+                untypedParams = facts['untyped_params']
                 
                 if untypedParams:
                     typescript_errors.append({
@@ -194,75 +301,144 @@ class ProjectAnalyzer:
                         'details': untypedParams
                     })
                 
-                # Procurar por uso de 'any'
-                any_usage = re.findall(r':\s*any', content)
-                if any_usage:
+                # Uso de 'any'
+                if facts['any_count']:
                     typescript_errors.append({
                         'file': file_path,
                         'error': 'Uso explícito de any',
-                        'count': len(any_usage)
+                        'count': facts['any_count']
                     })
         
         return typescript_errors
     
+    def _tsc_errors(self):
+        """Diagnósticos do tsc agrupados por arquivo, ou None se o tsc não respondeu."""
+        print("Aguardando diagnósticos do tsc...")
+        diagnostics = self.tsc.diagnostics(wait_for_rebuild=self.tsc_stale)
+        if diagnostics is None:
+            print("O tsc não concluiu a compilação; usando as heurísticas de regex")
+            for line in self.tsc.output_tail:
+                print(f"  {line}")
+            self.tsc.close()
+            self.tsc = None
+            return None
+        self.tsc_stale = False
+        
+        by_file = defaultdict(list)
+        for diagnostic in diagnostics:
+            file_path = diagnostic['file'] or TSCONFIG
+            by_file[file_path].append({key: diagnostic[key] for key in ('line', 'column', 'category', 'code', 'message')})
+        
+        return [
+            {'file': file_path, 'error': 'Diagnósticos do tsc', 'count': len(items), 'diagnostics': items}
+            for file_path, items in by_file.items()
+        ]
+    
+    @measured
+    def analyze_similar_components(self):
+        """Agrupa componentes React pelo conteúdo (idênticos ou quase idênticos)."""
+        print("Comparando conteúdo dos componentes...")
+        
+        index = SimilarityIndex()
+        for file_path in self.component_files:
+            facts = self.file_facts[file_path]
+            index.add(file_path, facts['content_hash'], facts['minhash'])
+        
+        groups = index.groups()
+        for group in groups:
+            reference = group['files'][0]
+            group['similarity'] = {
+                path: round(index.similarity(reference, path), 2)
+                for path in group['files'][1:]
+            }
+        
+        return groups
+    
+    @measured
+    def analyze_dependencies(self):
+        """Monta o grafo de importações e extrai ciclos e módulos mais importados."""
+        print("Analisando grafo de dependências...")
+        
+        self.import_graph = ImportGraph(self.files, self.resolved_imports)
+        
+        return {
+            'modules': len(self.import_graph),
+            'edges': self.import_graph.edge_count,
+            'cycles': self.import_graph.cycles(),
+            'most_depended_on': self.import_graph.most_depended_on()
+        }
+    
+    @measured
     def analyze_structure(self):
         """Analisa a estrutura geral do projeto."""
+        # Contagens por diretório e extensão direto das colunas da tabela de fatos
         structure = {
-            'directories': defaultdict(int),
-            'file_extensions': defaultdict(int),
+            'directories': self.table.count_by_directory(),
+            'file_extensions': self.table.count_by_extension(),
             'react_components': {
                 'total': len(self.component_files),
-                'locations': defaultdict(int)
+                'locations': self.table.count_by_directory(IS_COMPONENT)
             }
         }
         
-        # Contagem de arquivos por diretório
-        for file_path in self.files:
-            dir_name = str(Path(file_path).parent)
-            structure['directories'][dir_name] += 1
-            
-            # Contagem por extensão
-            ext = Path(file_path).suffix
-            structure['file_extensions'][ext] += 1
-        
-        # Analisar localizações de componentes React
-        for comp_path in self.component_files:
-            dir_name = str(Path(comp_path).parent)
-            structure['react_components']['locations'][dir_name] += 1
-        
         return structure
         
     def generate_report(self):
-        """Gera um relatório completo da análise."""
+        """
+        Gera um relatório completo da análise.
+        
+        O bloco `metrics` é tirado depois que a fase build_report termina, para
+        nenhuma fase aparecer ainda em andamento.
+        """
         print("Gerando relatório...")
         
+        report = self.build_report()
+        report['metrics'] = self.metrics.as_dict()
+        
+        # Salvar o relatório em JSON
+        with open('project_analysis_report.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        
+        # Gerar relatório em formato de texto
+        self._generate_text_report(report)
+        
+        print("Relatório gerado: project_analysis_report.json e project_analysis_report.txt")
+        return report
+    
+    @measured
+    def build_report(self):
+        """Monta o relatório (sem o bloco `metrics`)."""
         typescript_errors = self.analyze_typescript_errors()
         structure = self.analyze_structure()
+        dependencies = self.analyze_dependencies()
+        similar_components = self.analyze_similar_components()
         
         report = {
             'summary': {
                 'total_files': len(self.files),
                 'react_components': len(self.component_files),
                 'duplications': len(self.duplications),
+                'similar_components': len(similar_components),
                 'import_errors': len(self.import_errors),
-                'typescript_error_files': len(typescript_errors)
+                'typescript_error_files': len(typescript_errors),
+                'import_cycles': len(dependencies['cycles'])
             },
             'structure': structure,
             'duplications': self.duplications,
+            'similar_components': similar_components,
             'import_errors': self.import_errors,
+            'dependency_graph': {
+                'modules': dependencies['modules'],
+                'edges': dependencies['edges']
+            },
+            'cycles': dependencies['cycles'],
+            'most_depended_on': dependencies['most_depended_on'],
             'typescript_errors': typescript_errors,
+            'typescript_checker': 'tsc' if self.tsc is not None else 'heuristics',
             'files_by_directory': structure['directories'],
-            'file_extensions': structure['file_extensions']
+            'file_extensions': structure['file_extensions'],
         }
         
-        # Salvar o relatório em JSON
-        with open('project_analysis_report.json', 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2)
-        
-        # Gerar relatório em formato de texto
-        self._generate_text_report(report)
-        
-        print("Relatório gerado: project_analysis_report.json e project_analysis_report.txt")
         return report
     
     def _generate_text_report(self, report):
@@ -275,8 +451,10 @@ class ProjectAnalyzer:
             f.write(f"Total de arquivos: {report['summary']['total_files']}\n")
             f.write(f"Componentes React: {report['summary']['react_components']}\n")
             f.write(f"Duplicações: {report['summary']['duplications']}\n")
+            f.write(f"Componentes com conteúdo duplicado: {report['summary']['similar_components']}\n")
             f.write(f"Erros de importação: {report['summary']['import_errors']}\n")
-            f.write(f"Arquivos com potenciais erros TypeScript: {report['summary']['typescript_error_files']}\n\n")
+            f.write(f"Arquivos com potenciais erros TypeScript: {report['summary']['typescript_error_files']}\n")
+            f.write(f"Ciclos de importação: {report['summary']['import_cycles']}\n\n")
             
             # Estrutura
             f.write("== ESTRUTURA DO PROJETO ==\n")
@@ -310,14 +488,38 @@ class ProjectAnalyzer:
                     f.write(f"    - {path}\n")
             f.write("\n")
             
+            # Componentes com conteúdo duplicado
+            f.write("== COMPONENTES COM CONTEÚDO DUPLICADO ==\n")
+            for group in report['similar_components']:
+                f.write(f"Grupo ({'idênticos' if group['match'] == 'exact' else 'similares'}):\n")
+                f.write(f"    - {group['files'][0]}\n")
+                for path in group['files'][1:]:
+                    f.write(f"    - {path} (similaridade {group['similarity'][path]:.0%})\n")
+            f.write("\n")
+            
             # Erros de importação
             f.write("== ERROS DE IMPORTAÇÃO ==\n")
             for err in report['import_errors']:
                 f.write(f"Arquivo: {err['file']}\n")
-                f.write(f"  Importação: {err['import']}\n")
+                f.write(f"  Importação: {err['import']} (linha {err['line']})\n")
                 f.write(f"  Erro: {err['error']}\n")
             f.write("\n")
             
+            # Ciclos de importação
+            f.write("== CICLOS DE IMPORTAÇÃO ==\n")
+            for cycle in report['cycles']:
+                f.write(f"Ciclo com {len(cycle)} arquivos:\n")
+                for path in cycle:
+                    f.write(f"    - {path}\n")
+            f.write("\n")
+            
+            # Módulos mais importados
+            f.write("== MÓDULOS MAIS IMPORTADOS ==\n")
+            for module in report['most_depended_on']:
+                f.write(f"  {module['file']}: {module['direct_importers']} importadores diretos, "
+                        f"{module['transitive_importers']} transitivos\n")
+            f.write("\n")
+            
             # Erros TypeScript
             f.write("== POTENCIAIS ERROS TYPESCRIPT ==\n")
             for err in report['typescript_errors']:
@@ -327,22 +529,53 @@ class ProjectAnalyzer:
                     f.write(f"  Detalhes: {err['details']}\n")
                 if 'count' in err:
                     f.write(f"  Ocorrências: {err['count']}\n")
+                for diagnostic in err.get('diagnostics', []):
+                    location = f"linha {diagnostic['line']}, coluna {diagnostic['column']}" if diagnostic['line'] else "global"
+                    f.write(f"  {diagnostic['code']} ({location}): {diagnostic['message']}\n")
             
             f.write("\n=== FIM DO RELATÓRIO ===\n")
 
 def main():
-    analyzer = ProjectAnalyzer(PROJECT_ROOT)
-    analyzer.scan_directory()
-    analyzer.analyze_imports()
-    analyzer.find_duplications()
-    report = analyzer.generate_report()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Analisar a estrutura do projeto Agenda Livre')
+    parser.add_argument('--no-cache', action='store_true', help='Ignorar o cache de análise em .cache/')
+    parser.add_argument('--jobs', type=int, default=1, help='Número de processos para ler e analisar arquivos')
+    parser.add_argument('--watch', action='store_true', help='Manter a análise em memória e atualizar o relatório a cada alteração')
+    parser.add_argument('--interval', type=float, default=0.5, help='Intervalo em segundos entre verificações no modo --watch')
+    parser.add_argument('--profile', metavar='ARQUIVO', help='Gravar um perfil cProfile da execução em ARQUIVO')
+    parser.add_argument('--tsc', action='store_true', help='Erros TypeScript reais via tsc do projeto (node_modules/.bin/tsc)')
+    
+    args = parser.parse_args()
+    
+    # O tsc começa a compilar em segundo plano enquanto o projeto é varrido
+    tsc = start_tsc_worker(PROJECT_ROOT) if args.tsc else None
+    analyzer = ProjectAnalyzer(PROJECT_ROOT, use_cache=not args.no_cache, jobs=args.jobs, tsc=tsc)
+    
+    try:
+        if args.watch:
+            from project_watcher import ProjectWatcher
+            with profiled(args.profile):
+                ProjectWatcher(analyzer, SUPPORTED_EXTENSIONS, interval=args.interval).run()
+            return
+        
+        with profiled(args.profile):
+            analyzer.scan_directory()
+            analyzer.analyze_imports()
+            analyzer.find_duplications()
+            report = analyzer.generate_report()
+    finally:
+        if analyzer.tsc is not None:
+            analyzer.tsc.close()
     
     print("\nResumo da análise:")
     print(f"Total de arquivos: {report['summary']['total_files']}")
     print(f"Componentes React: {report['summary']['react_components']}")
     print(f"Duplicações encontradas: {report['summary']['duplications']}")
+    print(f"Componentes com conteúdo duplicado: {report['summary']['similar_components']}")
     print(f"Erros de importação: {report['summary']['import_errors']}")
     print(f"Arquivos com potenciais erros TypeScript: {report['summary']['typescript_error_files']}")
+    print(f"Ciclos de importação: {report['summary']['import_cycles']}")
     print("\nRelatório completo salvo em project_analysis_report.json e project_analysis_report.txt")
 
 if __name__ == "__main__":
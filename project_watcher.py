@@ -0,0 +1,111 @@
+"""
+Modo --watch do analisador de projeto Agenda Livre.
+
+Mantém o inventário, o índice de importações e os fatos por arquivo em memória
+e, a cada intervalo, compara um snapshot de mtime/tamanho do projeto:
+1. Arquivos criados, modificados ou removidos são detectados sem ler conteúdo;
+   só os diretórios cujo mtime mudou são listados de novo (ver
+   workspace_scanner.rescan_workspace), nos demais basta o stat dos arquivos
+2. Apenas esses arquivos são relidos (via cache) e reanalisados
+3. Erros de importação e duplicações são atualizados e o relatório é reescrito
+4. Se o tsconfig.json/jsconfig.json mudar, os aliases são relidos e todas as
+   importações são reverificadas
+
+Não depende de nenhum serviço externo: a detecção é feita por polling com
+os.scandir, podando os mesmos diretórios ignorados pela varredura normal.
+"""
+
+import os
+import time
+
+from import_resolver import CONFIG_FILES
+from workspace_scanner import rescan_workspace
+
+# Configurações
+DEFAULT_INTERVAL = 0.5  # segundos entre verificações
+
+
+def snapshot(entries):
+    """Mapa caminho -> (mtime, tamanho) de um inventário."""
+    return {entry.path: (entry.mtime, entry.size) for entry in entries}
+
+
+def diff_snapshots(old, new):
+    """Retorna (alterados ou criados, removidos) entre dois snapshots."""
+    changed = [path for path, stat in new.items() if old.get(path) != stat]
+    removed = [path for path in old if path not in new]
+    return changed, removed
+
+
+class ProjectWatcher:
+    def __init__(self, analyzer, extensions, interval=DEFAULT_INTERVAL):
+        self.analyzer = analyzer
+        self.extensions = extensions
+        self.interval = interval
+        self.snapshot = {}
+        self.config_mtimes = None
+
+    def _scan(self):
+        entries = rescan_workspace(self.analyzer.root_dir)
+        return [entry for entry in entries if entry.ext in self.extensions]
+
+    def _config_mtimes(self):
+        """mtime de cada tsconfig/jsconfig da raiz (None se não existe)."""
+        mtimes = []
+        for name in CONFIG_FILES:
+            try:
+                mtimes.append(os.stat(os.path.join(self.analyzer.root_dir, name)).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+
+    def start(self):
+        """Executa a análise completa inicial e guarda o snapshot."""
+        analyzer = self.analyzer
+        analyzer.scan_directory()
+        analyzer.analyze_imports()
+        analyzer.find_duplications()
+        analyzer.generate_report()
+        self.snapshot = snapshot(self._scan())
+        self.config_mtimes = self._config_mtimes()
+
+    def poll(self):
+        """
+        Verifica mudanças uma vez; retorna (alterados, removidos, arquivos
+        reverificados) ou None se nada mudou.
+        """
+        entries = self._scan()
+        current = snapshot(entries)
+        changed, removed = diff_snapshots(self.snapshot, current)
+        config_mtimes = self._config_mtimes()
+        config_changed = config_mtimes != self.config_mtimes
+        if not changed and not removed and not config_changed:
+            return None
+
+        self.snapshot = current
+        self.config_mtimes = config_mtimes
+        rechecked = self.analyzer.apply_changes(entries, changed, removed, config_changed)
+        self.analyzer.generate_report()
+        return changed, removed, rechecked
+
+    def run(self):
+        """Monitora o projeto até Ctrl+C."""
+        self.start()
+        print(f"\nMonitorando alterações a cada {self.interval}s (Ctrl+C para sair)...")
+
+        try:
+            while True:
+                time.sleep(self.interval)
+                started = time.perf_counter()
+                result = self.poll()
+                if result is None:
+                    continue
+
+                changed, removed, rechecked = result
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"{len(changed)} alterados, {len(removed)} removidos, "
+                      f"{rechecked} arquivos reverificados; relatório atualizado em {elapsed:.1f} ms "
+                      f"({len(self.analyzer.import_errors)} erros de importação, "
+                      f"{len(self.analyzer.duplications)} duplicações)")
+        except KeyboardInterrupt:
+            print("\nMonitoramento encerrado.")
@@ -0,0 +1,107 @@
+"""
+Relatórios em streaming das ferramentas de correção do projeto Agenda Livre.
+
+Em vez de acumular todas as mudanças em uma lista e gravar o JSON no final:
+1. Cada mudança é acrescentada a `<relatório>.jsonl` assim que acontece
+   (uma linha JSON por mudança, com flush)
+2. No fim, uma linha {"type": "summary", ...} fecha o arquivo
+3. Os relatórios .json e .txt são gerados relendo o .jsonl linha a linha
+
+A memória usada não depende do número de mudanças, e uma execução
+interrompida deixa um .jsonl válido com tudo que foi feito até ali (só sem a
+linha de resumo).
+"""
+
+import json
+from datetime import datetime
+
+
+class ReportSink:
+    def __init__(self, path, tool, enabled=True):
+        self.path = path
+        self.tool = tool
+        self.enabled = enabled  # Desligado em simulação: só conta as mudanças
+        self.count = 0
+        self._file = None
+
+    def _open(self):
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write({
+            'type': 'run',
+            'tool': self.tool,
+            'started_at': datetime.now().isoformat(timespec='seconds')
+        })
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def add(self, change):
+        """Registra uma mudança (dicionário com 'file' e 'change')."""
+        self.count += 1
+        if not self.enabled:
+            return
+        if self._file is None:
+            self._open()
+        record = {'type': 'change'}
+        record.update(change)
+        self._write(record)
+
+    def close(self, summary=None):
+        """Grava o resumo final (se houver) e fecha o arquivo."""
+        if not self.enabled:
+            return
+        if self._file is None:
+            self._open()
+        if summary is not None:
+            record = {'type': 'summary'}
+            record.update((key, value) for key, value in summary.items() if not isinstance(value, ReportSink))
+            self._write(record)
+        self._file.close()
+        self._file = None
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Relê as mudanças gravadas, uma por vez."""
+        return iter_changes(self.path) if self.enabled else iter(())
+
+
+def iter_changes(path):
+    """Percorre as mudanças de um relatório .jsonl (também de execuções interrompidas)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # Última linha incompleta de uma execução interrompida
+            if record.get('type') == 'change':
+                del record['type']
+                yield record
+
+
+def write_json_report(path, report):
+    """
+    Grava `report` como json.dump(report, f, indent=2), mas os valores que são
+    ReportSink são copiados do .jsonl um registro por vez.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for position, (key, value) in enumerate(report.items()):
+            f.write(',\n  ' if position else '\n  ')
+            f.write(json.dumps(key) + ': ')
+            if isinstance(value, ReportSink):
+                _write_json_list(f, value)
+            else:
+                f.write(json.dumps(value, indent=2).replace('\n', '\n  '))
+        f.write('\n}' if report else '}')
+
+
+def _write_json_list(f, records):
+    empty = True
+    for record in records:
+        f.write('[\n    ' if empty else ',\n    ')
+        f.write(json.dumps(record, indent=2).replace('\n', '\n    '))
+        empty = False
+    f.write('[]' if empty else '\n  ]')
@@ -0,0 +1,113 @@
+"""
+Regras de reescrita compartilhadas pelos corretores do projeto Agenda Livre.
+
+Antes, cada corretor chamava re.search / re.findall / re.sub com padrões em
+texto, um por vez, em cada arquivo. Aqui:
+1. Cada regra (Rule) é compilada uma única vez, quando o módulo do corretor
+   é importado
+2. Um RuleSet junta as palavras-chave literais de todas as regras em um único
+   padrão; um arquivo sem nenhuma delas é descartado com uma só busca
+3. As regras cujas palavras-chave aparecem no arquivo rodam juntas, em uma
+   única passada (alternância dos padrões), em vez de um re.sub por regra
+
+As regras de um mesmo RuleSet não devem se sobrepor (cada trecho do código
+casa com no máximo uma delas); nesse caso uma passada combinada dá o mesmo
+resultado que aplicar as regras uma depois da outra. Os padrões não podem
+usar grupos nomeados nem referências a grupos dentro do próprio padrão.
+"""
+
+import re
+from collections import Counter
+
+
+class Rule:
+    def __init__(self, name, pattern, replacement=None, keywords=()):
+        self.name = name
+        self.pattern = pattern
+        self.regex = re.compile(pattern)
+        # Texto com \1, \2... (como no re.sub) ou None; pode ser trocado por
+        # uma função na chamada de RuleSet.apply
+        self.replacement = replacement
+        # Literais dos quais pelo menos um precisa aparecer para a regra casar
+        self.keywords = tuple(keywords)
+
+
+class RuleSet:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.by_name = {rule.name: rule for rule in self.rules}
+        keywords = sorted({keyword for rule in self.rules for keyword in rule.keywords}, key=len, reverse=True)
+        self.keywords = keywords
+        self._keyword_re = re.compile('|'.join(re.escape(keyword) for keyword in keywords)) if keywords else None
+        self._combined = {}  # índices das regras ativas -> padrão combinado
+        # Buscas do pré-filtro, arquivos descartados por ele, passadas combinadas e trechos casados
+        self.stats = {'prefilter_searches': 0, 'skipped': 0, 'passes': 0, 'matches': 0}
+
+    def active_rules(self, content):
+        """Regras que podem casar com o conteúdo (pelas palavras-chave)."""
+        if self._keyword_re is not None:
+            self.stats['prefilter_searches'] += 1
+            if self._keyword_re.search(content) is None:
+                self.stats['skipped'] += 1
+                return []  # Caso comum: uma única busca e o arquivo é descartado
+
+        present = {keyword for keyword in self.keywords if keyword in content}
+        return [rule for rule in self.rules if not rule.keywords or present.intersection(rule.keywords)]
+
+    def _combined_regex(self, rules):
+        key = tuple(self.rules.index(rule) for rule in rules)
+        regex = self._combined.get(key)
+        if regex is None:
+            # O grupo de fora de cada alternativa é o último a fechar, então
+            # match.lastgroup diz qual regra casou
+            regex = re.compile('|'.join(f'(?P<_r{index}>{rule.pattern})' for index, rule in zip(key, rules)))
+            self._combined[key] = regex
+        return regex
+
+    def matches(self, content):
+        """Percorre (regra, match) de todas as regras em uma única passada."""
+        rules = self.active_rules(content)
+        if not rules:
+            return
+
+        self.stats['passes'] += 1
+        for match in self._combined_regex(rules).finditer(content):
+            self.stats['matches'] += 1
+            rule = self.rules[int(match.lastgroup[2:])]
+            # O mesmo trecho, casado pelo padrão da própria regra (grupos numerados dela)
+            yield rule, rule.regex.match(content, match.start())
+
+    def apply(self, content, handlers=None):
+        """
+        Aplica as regras em uma única passada; retorna (novo conteúdo,
+        Counter de substituições por regra).
+
+        `handlers` mapeia nome da regra -> função(match) que retorna o texto
+        substituto, ou None para manter o trecho como está.
+        """
+        handlers = handlers or {}
+        applied = Counter()
+        pieces = []
+        position = 0
+
+        for rule, match in self.matches(content):
+            handler = handlers.get(rule.name)
+            if handler is not None:
+                replacement = handler(match)
+            elif rule.replacement is not None:
+                replacement = match.expand(rule.replacement)
+            else:
+                replacement = None
+
+            if replacement is None:
+                continue
+            pieces.append(content[position:match.start()])
+            pieces.append(replacement)
+            position = match.end()
+            applied[rule.name] += 1
+
+        if not applied:
+            return content, applied
+
+        pieces.append(content[position:])
+        return ''.join(pieces), applied
@@ -0,0 +1,49 @@
+"""
+Workspace compartilhado entre as ferramentas do projeto Agenda Livre.
+
+Quando várias ferramentas rodam no mesmo processo (ver agenda_tools.py), elas
+usam o mesmo Workspace em vez de cada uma abrir o seu:
+1. Um único FileFactsCache (o SQLite é carregado uma vez)
+2. Um único ContentStore (um arquivo lido por uma etapa não é relido pela
+   seguinte)
+3. O inventário em memória de workspace_scanner.py
+
+Depois que uma etapa aplica o seu ChangePlan, record_changes atualiza o
+inventário (só stat dos arquivos escritos), os fatos em cache e o conteúdo
+em memória a partir do próprio plano: a etapa seguinte vê as edições sem
+reler nada do disco.
+"""
+
+from content_store import ContentStore
+from file_cache import FileFactsCache
+from workspace_scanner import invalidate, scan_workspace, update_entries
+
+
+class Workspace:
+    def __init__(self, root_dir, use_cache=True):
+        self.root_dir = root_dir
+        # Sem o cache em disco, os fatos ainda são compartilhados entre as
+        # etapas por um banco em memória
+        cache_path = None if use_cache else ':memory:'
+        self.cache = FileFactsCache(root_dir, cache_path=cache_path)
+        self.contents = ContentStore(root_dir)
+
+    def record_changes(self, plan):
+        """Registra as escritas de um ChangePlan já aplicado."""
+        if plan.dry_run or not plan.changes:
+            return
+
+        if not update_entries(self.root_dir, plan.changes):
+            # Arquivos novos: nova varredura (só listagem e stat, sem leitura)
+            invalidate(self.root_dir)
+
+        entries = {entry.path: entry for entry in scan_workspace(self.root_dir)}
+        for file_path, content in plan.changes.items():
+            self.contents.put(file_path, content)
+            entry = entries.get(file_path)
+            if entry is not None:
+                self.cache.record(entry, content)
+        self.cache.save()
+
+    def close(self):
+        self.cache.close()
@@ -0,0 +1,176 @@
+"""
+Detecção de componentes duplicados por conteúdo no projeto Agenda Livre.
+
+Agrupar só pelo nome do arquivo deixa passar cópias renomeadas e junta
+arquivos `Button.tsx` que não têm nada em comum. Aqui o agrupamento é pelo
+conteúdo:
+1. O código é normalizado em tokens (sem comentários nem espaços)
+2. Duplicatas exatas: mesmo hash da sequência de tokens
+3. Quase duplicatas: assinatura MinHash dos shingles de tokens, com LSH por
+   bandas para encontrar candidatos sem comparar todos os pares
+
+A assinatura é calculada uma vez por arquivo e fica no cache de fatos (ver
+file_facts.py); montar os grupos custa praticamente linear no número de
+componentes.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+
+# Configurações
+SHINGLE_SIZE = 5           # Tokens por shingle
+NUM_HASHES = 64            # Tamanho da assinatura MinHash (potência de 2)
+LSH_BANDS = 16             # Bandas do LSH (NUM_HASHES / LSH_BANDS linhas por banda)
+MIN_TOKENS = 40            # Arquivos menores não entram (redirecionamentos, reexports)
+SIMILARITY_THRESHOLD = 0.85
+
+_TOKEN_RE = re.compile(r'''
+      (?P<skip>\s+|//[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<token>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?|`(?:[^`\\]|\\.)*`?|[\w$]+|.)
+''', re.VERBOSE | re.DOTALL)
+
+_BIN_BITS = NUM_HASHES.bit_length() - 1
+_BIN_MASK = NUM_HASHES - 1
+_ROWS = NUM_HASHES // LSH_BANDS
+
+
+def normalized_tokens(content):
+    """Tokens do código, sem comentários e espaços (strings ficam inteiras)."""
+    return [match.group('token') for match in _TOKEN_RE.finditer(content) if match.lastgroup == 'token']
+
+
+def _shingle_hashes(tokens):
+    """Hashes estáveis (64 bits) dos shingles de SHINGLE_SIZE tokens."""
+    last = max(len(tokens) - SHINGLE_SIZE + 1, 1)
+    for i in range(last):
+        shingle = '\x00'.join(tokens[i:i + SHINGLE_SIZE]).encode('utf-8')
+        yield int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), 'little')
+
+
+def minhash(tokens):
+    """
+    Assinatura MinHash de uma permutação (one permutation hashing).
+
+    Cada shingle é espalhado uma única vez: os bits baixos do hash escolhem
+    uma das NUM_HASHES posições e o restante disputa o mínimo daquela posição.
+    Posições vazias copiam a próxima preenchida (densificação por rotação),
+    então duas assinaturas continuam comparáveis posição a posição.
+    """
+    bins = [None] * NUM_HASHES
+    for value in _shingle_hashes(tokens):
+        position = value & _BIN_MASK
+        value >>= _BIN_BITS
+        if bins[position] is None or value < bins[position]:
+            bins[position] = value
+
+    if bins.count(None) == NUM_HASHES:
+        return None
+
+    # Rotação: cada posição vazia usa a próxima preenchida (circular), com um
+    # deslocamento pela distância para não virar uma cópia exata
+    offset = 1 << (64 - _BIN_BITS)
+    for position in range(NUM_HASHES):
+        if bins[position] is None:
+            distance = 1
+            while bins[(position + distance) % NUM_HASHES] is None:
+                distance += 1
+            bins[position] = bins[(position + distance) % NUM_HASHES] + distance * offset
+
+    return bins
+
+
+def content_signature(content):
+    """
+    Retorna (hash do conteúdo normalizado, assinatura MinHash), ou (None, None)
+    para arquivos pequenos demais para comparar.
+    """
+    tokens = normalized_tokens(content)
+    if len(tokens) < MIN_TOKENS:
+        return None, None
+
+    content_hash = hashlib.sha1('\x00'.join(tokens).encode('utf-8')).hexdigest()
+    return content_hash, minhash(tokens)
+
+
+def similarity(signature_a, signature_b):
+    """Similaridade de Jaccard estimada entre duas assinaturas (0 a 1)."""
+    same = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return same / NUM_HASHES
+
+
+class SimilarityIndex:
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.paths = []
+        self.signatures = {}                # arquivo -> assinatura MinHash
+        self.hashes = {}                    # arquivo -> hash do conteúdo normalizado
+        self.by_hash = defaultdict(list)    # hash do conteúdo -> arquivos
+        self.parent = {}                    # union-find dos grupos
+
+    def add(self, path, content_hash, signature):
+        if content_hash is None or signature is None:
+            return
+        self.paths.append(path)
+        self.signatures[path] = signature
+        self.hashes[path] = content_hash
+        self.by_hash[content_hash].append(path)
+        self.parent[path] = path
+
+    def _find(self, path):
+        root = path
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[path] != root:
+            self.parent[path], path = root, self.parent[path]
+        return root
+
+    def _union(self, a, b):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+    def similarity(self, path_a, path_b):
+        return similarity(self.signatures[path_a], self.signatures[path_b])
+
+    def groups(self):
+        """
+        Grupos de arquivos duplicados, na ordem em que foram adicionados.
+
+        Cada grupo é um dicionário com 'files' e 'match' ('exact' se todos
+        têm o mesmo conteúdo normalizado, 'similar' caso contrário).
+        """
+        # Duplicatas exatas: um representante por hash entra no LSH
+        representatives = []
+        for paths in self.by_hash.values():
+            for path in paths[1:]:
+                self._union(paths[0], path)
+            representatives.append(paths[0])
+
+        # LSH: arquivos que coincidem em uma banda inteira viram candidatos
+        buckets = defaultdict(list)
+        for path in representatives:
+            signature = self.signatures[path]
+            for band in range(LSH_BANDS):
+                start = band * _ROWS
+                buckets[(band, tuple(signature[start:start + _ROWS]))].append(path)
+
+        for bucket in buckets.values():
+            for i, path in enumerate(bucket):
+                for other in bucket[i + 1:]:
+                    # Pares já no mesmo grupo não precisam ser comparados
+                    if self._find(path) != self._find(other) and self.similarity(path, other) >= self.threshold:
+                        self._union(path, other)
+
+        members = defaultdict(list)
+        for path in self.paths:
+            members[self._find(path)].append(path)
+
+        groups = []
+        for files in members.values():
+            if len(files) < 2:
+                continue
+            exact = len({self.hashes[path] for path in files}) == 1
+            groups.append({'files': files, 'match': 'exact' if exact else 'similar'})
+
+        return groups
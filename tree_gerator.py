@@ -1,99 +1,211 @@
+import argparse
 import os
+import sys
 
-def generate_tree(directory, output_file='tree_structure.txt', ignore_dirs=None, ignore_files=None):
+from backup_store import BACKUP_ROOT
+from ignore_rules import IgnoreMatcher
+from workspace_scanner import IGNORE_DIRS as SHARED_IGNORE_DIRS
+
+# Configurações
+# Além dos diretórios ignorados pelas outras ferramentas (ver workspace_scanner.py)
+TREE_IGNORE_DIRS = ['__pycache__', 'venv', 'env', '.venv', 'READ_CHAT']
+IGNORE_FILES = ['.gitignore', '.DS_Store']
+PREVIEW_LINES = 15
+
+
+def default_ignore_dirs():
+    """Diretórios ignorados por padrão: os compartilhados, os de backup e os deste script."""
+    return list(dict.fromkeys(SHARED_IGNORE_DIRS + [BACKUP_ROOT] + TREE_IGNORE_DIRS))
+
+
+def _list_directory(dir_path, rel_dir, matcher, ignore_dirs, ignore_files, skip_path):
+    """
+    Itens visíveis de um diretório, em ordem alfabética, como (nome, caminho,
+    caminho relativo, é_diretório).
+
+    Usa os.scandir: o tipo de cada item vem do próprio DirEntry, sem um stat
+    por item na maioria dos sistemas de arquivos. Itens ignorados pelos
+    .gitignore (ver ignore_rules.py) ficam de fora.
+    """
+    items = []
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if name in ignore_dirs:
+                        continue  # Nem é listado, muito menos percorrido
+                elif name.startswith('.') or name in ignore_files or entry.path == skip_path:
+                    continue
+
+                rel_path = os.path.join(rel_dir, name) if rel_dir else name
+                if matcher.ignored(rel_path, name, is_dir):
+                    continue
+
+                items.append((name, entry.path, rel_path, is_dir))
+    except OSError as e:
+        print(f"Erro ao listar diretório {dir_path}: {e}")
+
+    items.sort()
+    return items
+
+
+def iter_tree_lines(directory, ignore_dirs=None, ignore_files=None, max_depth=None,
+                    max_entries_per_dir=None, skip_path=None, use_gitignore=True):
+    """
+    Gera as linhas da árvore de `directory`, uma por vez.
+
+    Só a listagem do diretório atual e das pastas acima dele fica em memória.
+    `skip_path` é um arquivo a deixar de fora. `max_depth` limita quantos
+    níveis são percorridos (1 = só os itens da raiz); `max_entries_per_dir`
+    mostra só os primeiros itens de cada diretório e resume o restante em uma
+    linha.
+    """
+    ignore_dirs = frozenset(default_ignore_dirs() if ignore_dirs is None else ignore_dirs)
+    ignore_files = frozenset(IGNORE_FILES if ignore_files is None else ignore_files)
+    # Caminhos absolutos, para comparar direto com skip_path
+    directory = os.path.abspath(directory)
+    if skip_path is not None:
+        skip_path = os.path.abspath(skip_path)
+
+    matcher = IgnoreMatcher.for_root(directory) if use_gitignore else IgnoreMatcher()
+    root_items = _list_directory(directory, '', matcher, ignore_dirs, ignore_files, skip_path)
+
+    # Pilha de (itens restantes do diretório, prefixo das linhas, profundidade, regras de ignore)
+    stack = [(iter(_summarized(root_items, max_entries_per_dir)), '', 1, matcher)]
+
+    while stack:
+        items, prefix, depth, matcher = stack[-1]
+        item = next(items, None)
+        if item is None:
+            stack.pop()
+            continue
+
+        name, path, rel_path, is_dir, is_last = item
+        if is_last:
+            yield f"{prefix}└── {name}"
+            next_prefix = prefix + "    "
+        else:
+            yield f"{prefix}├── {name}"
+            next_prefix = prefix + "│   "
+
+        if is_dir and path is not None and (max_depth is None or depth < max_depth):
+            child_matcher = matcher.child(path, rel_path) if use_gitignore else matcher
+            children = _list_directory(path, rel_path, child_matcher, ignore_dirs, ignore_files, skip_path)
+            if children:
+                stack.append((iter(_summarized(children, max_entries_per_dir)), next_prefix, depth + 1,
+                              child_matcher))
+
+
+def _summarized(items, max_entries):
+    """Marca o último item e, se houver limite, troca o excedente por uma linha de resumo."""
+    if max_entries is not None and len(items) > max_entries:
+        hidden = items[max_entries:]
+        hidden_dirs = sum(1 for item in hidden if item[3])
+        summary = f"… mais {len(hidden)} itens ({hidden_dirs} diretórios, {len(hidden) - hidden_dirs} arquivos)"
+        items = items[:max_entries] + [(summary, None, None, False)]
+
+    last = len(items) - 1
+    for position, (name, path, rel_path, is_dir) in enumerate(items):
+        yield name, path, rel_path, is_dir, position == last
+
+
+def generate_tree(directory, output_file='tree_structure.txt', ignore_dirs=None, ignore_files=None,
+                  max_depth=None, max_entries_per_dir=None, preview=True, use_gitignore=True):
     """
     Percorre todas as pastas do projeto e gera uma representação de árvore
     da estrutura de diretórios, salvando-a em um arquivo de texto.
-    
+
+    As linhas são gravadas no arquivo à medida que são geradas.
+
     Args:
         directory (str): Diretório raiz para iniciar a varredura
         output_file (str): Nome do arquivo onde a estrutura será salva
-        ignore_dirs (list): Lista de diretórios para ignorar
+        ignore_dirs (list): Lista de diretórios para ignorar (padrão: default_ignore_dirs())
         ignore_files (list): Lista de arquivos para ignorar
+        max_depth (int): Quantos níveis percorrer (None = todos)
+        max_entries_per_dir (int): Itens mostrados por diretório antes do resumo (None = todos)
+        preview (bool): Mostrar as primeiras linhas no console
+        use_gitignore (bool): Respeitar os .gitignore do projeto
     """
-    if ignore_dirs is None:
-        ignore_dirs = ['.git', '__pycache__', 'venv', 'env', '.venv', 'node_modules', '.history', 'READ_CHAT',
-        "backup_20250414_181421","backup_20250414_181209","broken_state_20250414_183530"]
-    
-    if ignore_files is None:
-        ignore_files = ['.gitignore', '.DS_Store']
-    
     print(f"Gerando estrutura de diretórios para: {os.path.abspath(directory)}")
     print(f"O resultado será salvo em: {os.path.abspath(output_file)}")
-    
-    def walk_directory(dir_path, prefix='', is_last_item=True, result_lines=None):
-        if result_lines is None:
-            result_lines = []
-        
-        # Obtém a lista de todos os itens no diretório atual
-        items = sorted([item for item in os.listdir(dir_path) 
-                        if os.path.isdir(os.path.join(dir_path, item)) or not item.startswith('.')])
-        
-        # Filtra itens a serem ignorados
-        items = [item for item in items 
-                if (not os.path.isdir(os.path.join(dir_path, item)) or item not in ignore_dirs) and 
-                   (not os.path.isfile(os.path.join(dir_path, item)) or item not in ignore_files)]
-        
-        # Se não tiver itens, retorna as linhas atuais
-        if not items:
-            return result_lines
-        
-        # Para cada item no diretório atual
-        for i, item in enumerate(items):
-            # Verifica se é o último item
-            is_last = i == len(items) - 1
-            item_path = os.path.join(dir_path, item)
-            
-            # Define os caracteres para a estrutura da árvore
-            if is_last:
-                line_prefix = prefix + "└── "
-                next_prefix = prefix + "    "
-            else:
-                line_prefix = prefix + "├── "
-                next_prefix = prefix + "│   "
-            
-            # Adiciona o item atual à lista de linhas
-            result_lines.append(f"{line_prefix}{item}")
-            
-            # Se for um diretório, processa recursivamente
-            if os.path.isdir(item_path):
-                walk_directory(item_path, next_prefix, is_last, result_lines)
-        
-        return result_lines
-
-    # Gera a estrutura do diretório
-    tree_lines = walk_directory(directory)
-    
-    # Salva a estrutura em um arquivo
+
+    preview_lines = []
+    total = 0
+    lines = iter_tree_lines(directory, ignore_dirs, ignore_files, max_depth, max_entries_per_dir,
+                            skip_path=output_file, use_gitignore=use_gitignore)  # O próprio arquivo de saída não entra na árvore
+
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(tree_lines))
-    
-    print(f"Estrutura gerada com sucesso e salva em {output_file}")
+        for line in lines:
+            f.write(line if total == 0 else "\n" + line)
+            if total < PREVIEW_LINES:
+                preview_lines.append(line)
+            total += 1
+
+    print(f"Estrutura gerada com sucesso e salva em {output_file} ({total} linhas)")
     print("Você pode abrir este arquivo e copiar seu conteúdo para o chat.")
-    
+
+    if not preview:
+        return
+
     # Exibe uma prévia da estrutura no console
     print("\nPrévia da estrutura gerada:")
     print("-" * 50)
-    for line in tree_lines[:min(15, len(tree_lines))]:
+    for line in preview_lines:
         print(line)
-    if len(tree_lines) > 15:
+    if total > PREVIEW_LINES:
         print("... (mais itens no arquivo)")
     print("-" * 50)
 
-if __name__ == "__main__":
+
+def _interactive():
+    """Modo antigo: pergunta o diretório e o arquivo de saída."""
     # Diretório atual como padrão
     current_dir = os.getcwd()
-    
+
     print("Gerador de Estrutura de Diretórios")
     print("-" * 50)
-    
+
     # Permite que o usuário especifique um diretório diferente
     user_dir = input(f"Digite o caminho do diretório (ou pressione Enter para usar o diretório atual: {current_dir}): ")
     directory = user_dir if user_dir.strip() else current_dir
-    
+
     # Permite que o usuário especifique o arquivo de saída
     output_file = input("Digite o nome do arquivo de saída (ou pressione Enter para usar 'tree_structure.txt'): ")
     output_file = output_file if output_file.strip() else 'tree_structure.txt'
-    
+
     # Gera a estrutura
-    generate_tree(directory, output_file)
\ No newline at end of file
+    generate_tree(directory, output_file)
+
+
+def main():
+    # Sem argumentos em um terminal, mantém as perguntas de antes
+    if len(sys.argv) == 1 and sys.stdin.isatty():
+        _interactive()
+        return
+
+    parser = argparse.ArgumentParser(description='Gerar a árvore de diretórios do projeto em um arquivo de texto')
+    parser.add_argument('directory', nargs='?', default='.', help='Diretório raiz (padrão: diretório atual)')
+    parser.add_argument('-o', '--output', default='tree_structure.txt', help="Arquivo de saída (padrão: tree_structure.txt)")
+    parser.add_argument('--max-depth', type=int, help='Níveis a percorrer (padrão: todos)')
+    parser.add_argument('--max-entries-per-dir', type=int, help='Itens por diretório antes de resumir o restante')
+    parser.add_argument('--ignore', action='append', default=[], metavar='DIRETÓRIO',
+                        help='Diretório extra a ignorar (pode repetir)')
+    parser.add_argument('--no-gitignore', action='store_true', help='Listar também o que os .gitignore ignoram')
+    parser.add_argument('--no-preview', action='store_true', help='Não mostrar a prévia no console')
+
+    args = parser.parse_args()
+
+    generate_tree(args.directory, args.output, ignore_dirs=default_ignore_dirs() + args.ignore,
+                  max_depth=args.max_depth, max_entries_per_dir=args.max_entries_per_dir,
+                  preview=not args.no_preview, use_gitignore=not args.no_gitignore)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Diagnósticos reais de TypeScript para o analisador do projeto Agenda Livre.
+
+O analisador só estimava erros de TypeScript por regex (parâmetros sem tipo,
+uso de any). Com --tsc ele usa o compilador instalado no próprio projeto
+(node_modules/.bin/tsc):
+1. Um único processo `tsc --watch` fica aberto durante toda a análise, com o
+   tsconfig.json do projeto: o programa é montado uma vez, não um tsc por
+   arquivo
+2. Com `incremental` (já ligado no tsconfig.json), o estado fica no
+   .tsbuildinfo e uma nova execução só verifica o que mudou
+3. A saída é lida linha a linha em uma thread e convertida em diagnósticos
+   estruturados (arquivo, linha, coluna, código, mensagem)
+4. No modo --watch do analisador, o tsc recompila sozinho quando os arquivos
+   mudam; o relatório espera a compilação nova quando um arquivo .ts/.tsx
+   mudou
+
+Se o TypeScript não está instalado, ou o tsc falha, o analisador volta às
+heurísticas de file_facts.py.
+"""
+
+import os
+import re
+import subprocess
+import threading
+import time
+
+# Configurações
+TSC_BIN = os.path.join('node_modules', '.bin', 'tsc.cmd' if os.name == 'nt' else 'tsc')
+TSCONFIG = 'tsconfig.json'
+BUILD_TIMEOUT = 300  # segundos para a primeira compilação (programa inteiro)
+REBUILD_TIMEOUT = 30  # segundos para uma recompilação no modo --watch
+# Arquivos do programa do tsc (o include do tsconfig.json só lista .ts/.tsx); mudar
+# um .js não gera recompilação, então esperar por ela só esgotaria REBUILD_TIMEOUT
+TYPESCRIPT_EXTENSIONS = ('.ts', '.tsx')
+
+# arquivo(linha,coluna): error TS2345: mensagem
+DIAGNOSTIC_RE = re.compile(
+    r'^(?P<file>.+?)\((?P<line>\d+),(?P<column>\d+)\): (?P<category>error|warning|message) '
+    r'TS(?P<code>\d+): (?P<message>.*)$'
+)
+# Diagnóstico sem arquivo (ex.: opção inválida no tsconfig)
+GLOBAL_DIAGNOSTIC_RE = re.compile(r'^(?P<category>error|warning|message) TS(?P<code>\d+): (?P<message>.*)$')
+# Fim de uma compilação no modo --watch: "... - Found 3 errors. Watching for file changes."
+BUILD_DONE_RE = re.compile(r'Found \d+ errors?\b')
+
+
+def find_tsc(root_dir):
+    """Caminho do tsc instalado no projeto, ou None."""
+    path = os.path.join(root_dir, TSC_BIN)
+    return path if os.path.isfile(path) else None
+
+
+class DiagnosticParser:
+    """Converte a saída do tsc (--pretty false) em diagnósticos, uma linha por vez."""
+
+    def __init__(self):
+        self.diagnostics = []
+
+    def feed(self, line):
+        line = line.rstrip('\r\n')
+        match = DIAGNOSTIC_RE.match(line)
+        if match:
+            self.diagnostics.append({
+                'file': os.path.normpath(match.group('file')),
+                'line': int(match.group('line')),
+                'column': int(match.group('column')),
+                'category': match.group('category'),
+                'code': f"TS{match.group('code')}",
+                'message': match.group('message'),
+            })
+            return
+
+        match = GLOBAL_DIAGNOSTIC_RE.match(line)
+        if match:
+            self.diagnostics.append({
+                'file': None,
+                'line': None,
+                'column': None,
+                'category': match.group('category'),
+                'code': f"TS{match.group('code')}",
+                'message': match.group('message'),
+            })
+            return
+
+        # Mensagens longas continuam nas linhas seguintes, indentadas
+        if line.startswith(' ') and line.strip() and self.diagnostics:
+            self.diagnostics[-1]['message'] += '\n' + line.strip()
+
+    def take(self):
+        """Diagnósticos acumulados desde a última chamada."""
+        diagnostics, self.diagnostics = self.diagnostics, []
+        return diagnostics
+
+
+class TscWorker:
+    def __init__(self, root_dir, tsc_path):
+        self.root_dir = root_dir
+        self.tsc_path = tsc_path
+        self.process = None
+        self.builds = 0         # Compilações concluídas
+        self.consumed = 0       # Última compilação entregue por diagnostics()
+        self.latest = None      # Diagnósticos da última compilação concluída
+        self.output_tail = []   # Últimas linhas da saída, para mensagens de erro
+        self.stats = {'builds': 0, 'diagnostics': 0, 'first_build_seconds': None}
+        self._condition = threading.Condition()
+        self._reader = None
+        self._finished = False  # A saída do tsc chegou ao fim (processo encerrado)
+        self._started_at = None
+
+    def start(self):
+        """Inicia o `tsc --watch`; a primeira compilação começa imediatamente."""
+        command = [
+            self.tsc_path, '--project', TSCONFIG, '--watch', '--preserveWatchOutput',
+            '--pretty', 'false', '--noEmit', '--incremental',
+        ]
+        self._started_at = time.perf_counter()
+        self.process = subprocess.Popen(
+            command, cwd=self.root_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace', bufsize=1
+        )
+        self._reader = threading.Thread(target=self._read_output, name='tsc-worker', daemon=True)
+        self._reader.start()
+        return self
+
+    def _read_output(self):
+        parser = DiagnosticParser()
+        for line in self.process.stdout:
+            if BUILD_DONE_RE.search(line):
+                diagnostics = parser.take()
+                with self._condition:
+                    self.latest = diagnostics
+                    self.builds += 1
+                    self.stats['builds'] = self.builds
+                    self.stats['diagnostics'] = len(diagnostics)
+                    if self.stats['first_build_seconds'] is None:
+                        self.stats['first_build_seconds'] = round(time.perf_counter() - self._started_at, 3)
+                    self._condition.notify_all()
+                continue
+
+            parser.feed(line)
+            if line.strip():
+                self.output_tail = (self.output_tail + [line.rstrip()])[-10:]
+
+        # Processo encerrado: acorda quem está esperando
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
+
+    def diagnostics(self, wait_for_rebuild=False):
+        """
+        Diagnósticos da compilação mais recente, ou None se o tsc terminou ou
+        não respondeu a tempo.
+
+        Com `wait_for_rebuild`, espera uma compilação posterior à última
+        entregue (depois de arquivos .ts/.tsx alterados no modo --watch).
+        """
+        target = self.consumed + 1 if (wait_for_rebuild or self.builds == 0) else self.builds
+        timeout = BUILD_TIMEOUT if self.builds == 0 else REBUILD_TIMEOUT
+
+        with self._condition:
+            self._condition.wait_for(lambda: self.builds >= target or self._finished, timeout=timeout)
+            if self.builds == 0:
+                return None
+            self.consumed = self.builds
+            return self.latest
+
+    def close(self):
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self._reader.join(timeout=5)
+        self.process.stdout.close()
+        self.process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def start_tsc_worker(root_dir):
+    """Inicia um TscWorker para o projeto, ou retorna None (com aviso) se não houver tsc."""
+    tsc_path = find_tsc(root_dir)
+    if tsc_path is None:
+        print(f"TypeScript não encontrado em {os.path.join(root_dir, TSC_BIN)} "
+              "(npm install); usando as heurísticas de regex")
+        return None
+    if not os.path.isfile(os.path.join(root_dir, TSCONFIG)):
+        print(f"{TSCONFIG} não encontrado em {root_dir}; usando as heurísticas de regex")
+        return None
+
+    print(f"Iniciando tsc em segundo plano: {tsc_path}")
+    try:
+        return TscWorker(root_dir, os.path.abspath(tsc_path)).start()
+    except OSError as e:
+        print(f"Erro ao iniciar o tsc: {e}; usando as heurísticas de regex")
+        return None
@@ -17,71 +17,114 @@ Opções:
   --target=snake   Forçar uso de snake_case (first_name, last_name)
 """
 
-import os
 import re
 import argparse
-import json
 from pathlib import Path
-import shutil
+
+from apply_engine import ChangePlan
+from content_store import ContentStore
+from file_cache import FileFactsCache
+from metrics import Metrics, measured, profiled
+from report_sink import ReportSink, write_json_report
+from rewrite_rules import Rule, RuleSet
+from workspace_scanner import iter_files
 
 # Configurações
 PROJECT_ROOT = '.'  # Diretório atual
-IGNORE_DIRS = ['.git', '.next', 'node_modules', 'coverage']
-BACKUP_DIR = './backups/user_type_fix'
 SUPPORTED_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx']
 
+# Regras por estilo alvo, compiladas uma vez (ver rewrite_rules.py)
+# Definições do tipo User: renomear os campos para o estilo alvo
+USER_DEFINITION_RULES = {
+    'camel': RuleSet([
+        Rule('first_name', r'first_name\s*:', 'firstName:', keywords=['first_name']),
+        Rule('last_name', r'last_name\s*:', 'lastName:', keywords=['last_name']),
+    ]),
+    'snake': RuleSet([
+        Rule('firstName', r'firstName\s*:', 'first_name:', keywords=['firstName']),
+        Rule('lastName', r'lastName\s*:', 'last_name:', keywords=['lastName']),
+    ]),
+}
+
+# Referências a user.xxx: usar o estilo alvo com fallback para o outro
+USER_REFERENCE_RULES = {
+    'camel': RuleSet([
+        Rule('first_name', r'(user\.)first_name', r'\1firstName || \1first_name', keywords=['user.first_name']),
+        Rule('last_name', r'(user\.)last_name', r'\1lastName || \1last_name', keywords=['user.last_name']),
+    ]),
+    'snake': RuleSet([
+        Rule('firstName', r'(user\.)firstName', r'\1first_name || \1firstName', keywords=['user.firstName']),
+        Rule('lastName', r'(user\.)lastName', r'\1last_name || \1lastName', keywords=['user.lastName']),
+    ]),
+}
+
+# Onde inserir os aliases na definição do tipo User
+USER_TYPE_BODY_RE = re.compile(r'type User\s*=\s*\{([^}]*)')
+
 class UserTypeFixer:
-    def __init__(self, root_dir, target_style=None, dry_run=False):
+    def __init__(self, root_dir, target_style=None, dry_run=False, use_cache=True, jobs=1, workspace=None):
         self.root_dir = Path(root_dir)
         self.target_style = target_style  # 'camel' ou 'snake' ou None (auto-detectar)
         self.dry_run = dry_run
+        # Com um Workspace (ver shared_workspace.py), cache e conteúdos são os mesmos das outras etapas
+        self.cache = workspace.cache if workspace else FileFactsCache(root_dir, enabled=use_cache)
+        self.backup_manifest = None
+        self.jobs = jobs  # Threads para gravar os arquivos no fim
+        # Mudanças acumuladas e aplicadas de uma vez no fim (ver apply_engine.py)
+        self.plan = ChangePlan(root_dir, 'user_type_fix', dry_run=dry_run)
         self.files = []
-        self.file_contents = {}
-        self.changes_made = []
+        self.file_facts = {}
+        self.contents = workspace.contents if workspace else ContentStore(root_dir)  # Sob demanda, com limite de memória
+        self.metrics = Metrics()  # Tempos por fase e contadores (bloco 'metrics' do relatório)
+        self.metrics.track('cache', self.cache.stats)
+        self.metrics.track('contents', self.contents.stats)
+        # Mudanças gravadas no .jsonl à medida que acontecem (ver report_sink.py)
+        self.changes = ReportSink('user_type_fixes_report.jsonl', 'user_type_fix', enabled=not dry_run)
         self.camel_case_count = 0
         self.snake_case_count = 0
         self.user_type_files = []
         
+    @measured
     def scan_directory(self):
         """Escaneia o diretório do projeto e carrega os arquivos relevantes."""
         print(f"Escaneando diretório: {self.root_dir}")
         
-        for root, dirs, files in os.walk(self.root_dir):
-            # Ignorar diretórios específicos
-            dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+        for entry in iter_files(self.root_dir, SUPPORTED_EXTENSIONS):
+            str_path = entry.path
+            self.files.append(str_path)
             
-            for file in files:
-                file_path = Path(root) / file
-                rel_path = file_path.relative_to(self.root_dir)
-                str_path = str(rel_path)
-                
-                # Verificar se é um arquivo relevante
-                if file_path.suffix in SUPPORTED_EXTENSIONS:
-                    self.files.append(str_path)
-                    
-                    # Carregar o conteúdo dos arquivos
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            self.file_contents[str_path] = content
-                            
-                            # Contar ocorrências de firstName vs first_name
-                            self.camel_case_count += content.count('firstName')
-                            self.snake_case_count += content.count('first_name')
-                            
-                            # Identificar arquivos que definem o tipo User
-                            if ('interface User' in content or 
-                                'type User' in content or 
-                                'User:' in content):
-                                self.user_type_files.append(str_path)
-                    except Exception as e:
-                        print(f"Erro ao ler arquivo {file_path}: {e}")
+            facts, content = self.cache.facts_for(entry)
+            if facts is None:
+                continue
+            self.file_facts[str_path] = facts
+            
+            # Contar ocorrências de firstName vs first_name
+            self.camel_case_count += facts['camel_case_count']
+            self.snake_case_count += facts['snake_case_count']
+            
+            # Identificar arquivos que definem o tipo User
+            if facts['defines_user_type']:
+                self.user_type_files.append(str_path)
+            
+            # Aproveitar o conteúdo já lido só dos arquivos que podem mudar
+            if content is not None and (facts['defines_user_type'] or facts['has_user_refs']):
+                self.contents.put(str_path, content)
+        
+        self.metrics.count('files_scanned', len(self.files))
+        self.cache.save()
         
         print(f"Total de arquivos encontrados: {len(self.files)}")
         print(f"Arquivos com definição de User: {len(self.user_type_files)}")
         print(f"Ocorrências de camelCase (firstName): {self.camel_case_count}")
         print(f"Ocorrências de snake_case (first_name): {self.snake_case_count}")
     
+    def _get_content(self, file_path):
+        """Retorna o conteúdo de um arquivo, lendo do disco só se não estiver no cache."""
+        planned = self.plan.get(file_path)
+        if planned is not None:
+            return planned  # Já alterado nesta execução, ainda não gravado
+        return self.contents.get(file_path)
+    
     def determine_target_style(self):
         """Determina qual estilo usar baseado na análise ou no parâmetro fornecido."""
         if self.target_style:
@@ -90,83 +133,55 @@ class UserTypeFixer:
         # Auto-detectar baseado no uso mais comum
         return 'camel' if self.camel_case_count >= self.snake_case_count else 'snake'
     
-    def _backup_file(self, file_path):
-        """Cria um backup de um arquivo antes de modificá-lo."""
-        backup_path = Path(BACKUP_DIR) / file_path
-        os.makedirs(backup_path.parent, exist_ok=True)
-        
-        src_path = self.root_dir / file_path
-        shutil.copy2(src_path, backup_path)
-        
-        return backup_path
-    
     def _save_file(self, file_path, content):
-        """Salva o conteúdo em um arquivo."""
-        if self.dry_run:
-            return
-            
-        full_path = self.root_dir / file_path
-        
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        """Agenda a gravação de um arquivo no plano de mudanças."""
+        self.plan.write(file_path, content)
     
+    @measured
     def update_user_type_definitions(self):
         """Atualiza definições do tipo User para usar o estilo escolhido e incluir aliases."""
         target_style = self.determine_target_style()
         print(f"Atualizando definições do tipo User para usar {target_style}...")
+        self.metrics.track('definition_rules', USER_DEFINITION_RULES[target_style].stats)
         
         for type_file in self.user_type_files:
-            content = self.file_contents[type_file]
+            content = self._get_content(type_file)
             original_content = content
             
+            # Converter os campos das definições para o estilo alvo (uma passada)
+            content, _ = USER_DEFINITION_RULES[target_style].apply(content)
+            
             if target_style == 'camel':
-                # Converter snake_case para camelCase nas definições
-                content = re.sub(r'first_name\s*:', r'firstName:', content)
-                content = re.sub(r'last_name\s*:', r'lastName:', content)
-                
                 # Adicionar aliases para compatibilidade
                 if 'firstName' in content and 'first_name?' not in content:
                     if 'type User' in content:
-                        add_before = re.search(r'type User\s*=\s*\{([^}]*)', content)
+                        add_before = USER_TYPE_BODY_RE.search(content)
                         if add_before:
                             pos = add_before.end(1)
                             content = content[:pos] + "\n  // Aliases para compatibilidade com snake_case\n  first_name?: string;\n  last_name?: string;" + content[pos:]
             else:
-                # Converter camelCase para snake_case nas definições
-                content = re.sub(r'firstName\s*:', r'first_name:', content)
-                content = re.sub(r'lastName\s*:', r'last_name:', content)
-                
                 # Adicionar aliases para compatibilidade
                 if 'first_name' in content and 'firstName?' not in content:
                     if 'type User' in content:
-                        add_before = re.search(r'type User\s*=\s*\{([^}]*)', content)
+                        add_before = USER_TYPE_BODY_RE.search(content)
                         if add_before:
                             pos = add_before.end(1)
                             content = content[:pos] + "\n  // Aliases para compatibilidade com camelCase\n  firstName?: string;\n  lastName?: string;" + content[pos:]
             
             if content != original_content:
-                self._backup_file(type_file)
                 self._save_file(type_file, content)
-                self.changes_made.append({
+                self.changes.add({
                     'file': type_file,
                     'change': f"Atualizada definição do tipo User para usar {target_style}"
                 })
-                
-                # Atualizar o conteúdo em memória
-                self.file_contents[type_file] = content
     
+    @measured
     def create_user_type_if_missing(self):
         """Cria um arquivo de definição do tipo User se não existir."""
         if not self.user_type_files:
             target_style = self.determine_target_style()
             
-            # Decidir onde criar o arquivo
-            types_dir = self.root_dir / 'src/types'
-            if not types_dir.exists():
-                types_dir = self.root_dir / 'types'
-                if not types_dir.exists() and not self.dry_run:
-                    os.makedirs(types_dir)
-            
+            # Decidir onde criar o arquivo (o diretório é criado ao aplicar o plano)
             type_file = 'src/types/user.ts' if (self.root_dir / 'src/types').exists() else 'types/user.ts'
             print(f"Arquivo de tipo User será criado em: {type_file}")
             
@@ -230,71 +245,72 @@ export type AuthContextType = {
             if not self.dry_run:
                 # Criar o arquivo
                 self._save_file(type_file, content)
-                self.changes_made.append({
+                self.changes.add({
                     'file': type_file,
                     'change': f"Criado arquivo de tipos User usando {target_style}"
                 })
     
+    @measured
     def update_user_references(self):
         """Atualiza referências ao User em todo o projeto para usar o estilo escolhido."""
         target_style = self.determine_target_style()
         print(f"Atualizando referências ao User para usar {target_style}...")
+        self.metrics.track('reference_rules', USER_REFERENCE_RULES[target_style].stats)
         
         for file_path in self.files:
             # Pular arquivos que já são definições de tipo
             if file_path in self.user_type_files:
                 continue
+            
+            # Referências a propriedades do User (detectadas na varredura)
+            facts = self.file_facts.get(file_path)
+            if facts is None or not facts['has_user_refs']:
+                continue
                 
-            content = self.file_contents[file_path]
+            content = self._get_content(file_path)
             original_content = content
             
-            # Encontrar referências a propriedades do User
-            has_user_refs = ('user.first_name' in content or 'user.firstName' in content or 
-                            'user.last_name' in content or 'user.lastName' in content)
-            
-            if has_user_refs:
-                if target_style == 'camel':
-                    # Adicionar suporte para ambos os estilos usando operador de coalescência nula
-                    content = re.sub(r'(user\.)first_name', r'\1firstName || \1first_name', content)
-                    content = re.sub(r'(user\.)last_name', r'\1lastName || \1last_name', content)
-                else:
-                    # Adicionar suporte para ambos os estilos usando operador de coalescência nula
-                    content = re.sub(r'(user\.)firstName', r'\1first_name || \1firstName', content)
-                    content = re.sub(r'(user\.)lastName', r'\1last_name || \1lastName', content)
+            # Adicionar suporte para ambos os estilos usando operador de coalescência nula
+            content, _ = USER_REFERENCE_RULES[target_style].apply(content)
+            # Cada arquivo é visitado uma vez: o original não precisa ficar no cache
+            self.contents.release(file_path)
             
             if content != original_content:
-                self._backup_file(file_path)
                 self._save_file(file_path, content)
-                self.changes_made.append({
+                self.changes.add({
                     'file': file_path,
                     'change': f"Atualizadas referências ao User para usar {target_style} com fallbacks"
                 })
     
     def run(self):
         """Executa todas as etapas de correção."""
-        print(f"Iniciando correção do tipo User (modo {'simulação' if self.dry_run else 'aplicação'})...")
-        
-        # Criar diretório de backup
-        if not self.dry_run:
-            os.makedirs(BACKUP_DIR, exist_ok=True)
-        
-        # Determinar o estilo alvo
-        target_style = self.determine_target_style()
-        print(f"Estilo escolhido: {target_style}")
-        
-        # Criar ou atualizar definições do tipo User
-        self.update_user_type_definitions()
-        self.create_user_type_if_missing()
-        
-        # Atualizar referências ao User em todo o projeto
-        self.update_user_references()
+        with self.metrics.phase('run'):
+            print(f"Iniciando correção do tipo User (modo {'simulação' if self.dry_run else 'aplicação'})...")
+            
+            # Determinar o estilo alvo
+            target_style = self.determine_target_style()
+            print(f"Estilo escolhido: {target_style}")
+            
+            # Criar ou atualizar definições do tipo User
+            self.update_user_type_definitions()
+            self.create_user_type_if_missing()
+            
+            # Atualizar referências ao User em todo o projeto
+            self.update_user_references()
+            
+            # Aplicar todas as mudanças de uma vez: backups em lote e escrita atômica
+            with self.metrics.phase('apply'):
+                self.backup_manifest = self.plan.apply(workers=self.jobs)
+            self.metrics.count('files_planned', len(self.plan))
+            if self.backup_manifest:
+                print(f"Mudanças aplicadas. Para desfazer: python apply_engine.py rollback {self.backup_manifest}")
         
-        # Gerar relatório
+        # Gerar relatório depois de fechar a fase 'run', para o bloco metrics sair completo
         self._generate_report()
         
-        print(f"Correção concluída. {len(self.changes_made)} mudanças {'simuladas' if self.dry_run else 'aplicadas'}.")
+        print(f"Correção concluída. {len(self.changes)} mudanças {'simuladas' if self.dry_run else 'aplicadas'}.")
         if not self.dry_run:
-            print("Relatório salvo em user_type_fixes_report.json e user_type_fixes_report.txt")
+            print("Relatório salvo em user_type_fixes_report.jsonl, user_type_fixes_report.json e user_type_fixes_report.txt")
     
     def _generate_report(self):
         """Gera um relatório das mudanças feitas ou simuladas."""
@@ -303,18 +319,20 @@ export type AuthContextType = {
                 'target_style': self.determine_target_style(),
                 'camel_case_count': self.camel_case_count,
                 'snake_case_count': self.snake_case_count,
-                'total_changes': len(self.changes_made),
+                'total_changes': len(self.changes),
                 'dry_run': self.dry_run
             },
-            'changes': self.changes_made,
-            'user_type_files': self.user_type_files
+            'backups': dict(self.plan.backups.stats, manifest=self.backup_manifest),
+            'changes': self.changes,
+            'user_type_files': self.user_type_files,
+            'metrics': self.metrics.as_dict()
         }
         
         # Salvar o relatório
         if not self.dry_run:
-            # Formato JSON
-            with open('user_type_fixes_report.json', 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2)
+            # Resumo no fim do .jsonl; o JSON é gerado relendo as mudanças
+            self.changes.close(report)
+            write_json_report('user_type_fixes_report.json', report)
             
             # Formato texto
             with open('user_type_fixes_report.txt', 'w', encoding='utf-8') as f:
@@ -332,7 +350,7 @@ export type AuthContextType = {
                 f.write("\n")
                 
                 f.write("== MUDANÇAS REALIZADAS ==\n")
-                for change in self.changes_made:
+                for change in self.changes:
                     f.write(f"Arquivo: {change['file']}\n")
                     f.write(f"  {change['change']}\n\n")
                 
@@ -344,12 +362,17 @@ def main():
     parser = argparse.ArgumentParser(description='Padronizar o tipo User no projeto Agenda Livre')
     parser.add_argument('--dry-run', action='store_true', help='Apenas mostrar mudanças sem aplicá-las')
     parser.add_argument('--target', choices=['camel', 'snake'], help='Forçar uso de camelCase ou snake_case')
+    parser.add_argument('--no-cache', action='store_true', help='Ignorar o cache de análise em .cache/')
+    parser.add_argument('--jobs', type=int, default=1, help='Threads para gravar os arquivos alterados (padrão: 1)')
+    parser.add_argument('--profile', metavar='ARQUIVO', help='Gravar um perfil cProfile da execução em ARQUIVO')
     
     args = parser.parse_args()
     
-    fixer = UserTypeFixer(PROJECT_ROOT, target_style=args.target, dry_run=args.dry_run)
-    fixer.scan_directory()
-    fixer.run()
+    fixer = UserTypeFixer(PROJECT_ROOT, target_style=args.target, dry_run=args.dry_run,
+                          use_cache=not args.no_cache, jobs=args.jobs)
+    with profiled(args.profile):
+        fixer.scan_directory()
+        fixer.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,308 @@
+"""
+Varredura compartilhada do workspace do projeto Agenda Livre.
+
+Todas as ferramentas (analisador, deduplicador e corretores) usam este módulo
+para percorrer o projeto uma única vez:
+1. Percorre a árvore com os.scandir (um stat por arquivo relevante)
+2. Descarta diretórios ignorados (IGNORE_DIRS e regras dos .gitignore, ver
+   ignore_rules.py) antes de descer neles
+3. Entrega o mesmo inventário de arquivos (caminho, tamanho, mtime, extensão)
+4. Registra cada diretório uma única vez em uma PathTable (ver path_table.py):
+   cada arquivo do inventário é (id do diretório, nome), o caminho relativo
+   só é montado quando alguém o pede, e as extensões são as próprias strings
+   da configuração
+
+O inventário fica em memória por processo, então várias ferramentas rodando
+em sequência no mesmo interpretador reaproveitam a mesma varredura. O modo
+--watch varre de novo com rescan_workspace, que só relista os diretórios
+cujo mtime mudou.
+"""
+
+import os
+from collections import namedtuple
+from pathlib import Path
+
+from backup_store import BACKUP_ROOT
+from ignore_rules import IGNORE_FILE, IgnoreMatcher
+from path_table import ROOT_ID, PathTable
+
+# Configurações
+# Sempre ignorados; pastas de histórico datadas (backup_*, broken_state_*) e o que
+# mais o projeto quiser vêm dos .gitignore e de ignore_rules.IGNORE_PATTERNS
+IGNORE_DIRS = ['.git', '.next', 'node_modules', 'coverage', 'dist', '.history', 'backups']
+SCAN_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx', '.css', '.scss']
+
+
+class FileEntry(namedtuple('FileEntry', ['table', 'dir_id', 'name', 'ext', 'size', 'mtime'])):
+    """Um arquivo do inventário: diretório (id na PathTable `table`) e nome."""
+    __slots__ = ()
+
+    @property
+    def path(self):
+        """Caminho relativo à raiz do projeto, montado a cada acesso."""
+        return self.table.prefixes[self.dir_id] + self.name
+
+
+# Um diretório já listado: regras de ignore dele, mtime (ns) dele e do
+# .gitignore dele (só com track_dirs), arquivos e (caminho, id) dos subdiretórios
+DirState = namedtuple('DirState', ['matcher', 'mtime', 'ignore_mtime', 'files', 'subdirs'])
+
+_inventories = {}
+_path_tables = {}  # mesma chave de _inventories -> PathTable da varredura
+_trackers = {}     # mesma chave de _inventories -> WorkspaceScanner do modo --watch
+
+
+class WorkspaceScanner:
+    def __init__(self, root_dir, ignore_dirs=None, extensions=None, use_gitignore=True, track_dirs=False):
+        self.root_dir = Path(root_dir)
+        # O diretório de backups nunca é varrido, mesmo com uma lista personalizada
+        self.ignore_dirs = frozenset(IGNORE_DIRS if ignore_dirs is None else ignore_dirs) | {BACKUP_ROOT}
+        self.extensions = frozenset(SCAN_EXTENSIONS if extensions is None else extensions)
+        self.extension_list = tuple(self.extensions)
+        self.use_gitignore = use_gitignore
+        # Guardar o mtime e o conteúdo de cada diretório para rescan() (modo --watch)
+        self.track_dirs = track_dirs
+        self.paths = PathTable()
+        self.dir_states = {}
+
+    def scan(self):
+        """Percorre o projeto e retorna a lista de FileEntry na ordem do os.walk."""
+        self.paths = PathTable()
+        self.dir_states = {}
+        return self._walk([(str(self.root_dir), ROOT_ID, None, True)])
+
+    def rescan(self):
+        """
+        Varre de novo após um scan() com track_dirs=True, relistando só os
+        diretórios cujo mtime mudou (entradas criadas, removidas ou
+        renomeadas) e, se um .gitignore mudou, a subárvore dele. Nos demais
+        diretórios basta um stat por arquivo já conhecido.
+        """
+        return self._walk([(str(self.root_dir), ROOT_ID, None, False)])
+
+    def _walk(self, stack):
+        """
+        Percorre uma pilha de (caminho absoluto, id na PathTable, regras de
+        ignore do pai, relistar à força); a ordem de visita é a mesma do
+        os.walk top-down: arquivos do diretório, depois subdiretórios.
+        """
+        entries = []
+        states = self.dir_states
+
+        while stack:
+            dir_path, dir_id, parent_matcher, force = stack.pop()
+            previous = states.get(dir_id)
+            state = None
+            if previous is not None and not force:
+                if self._ignore_mtime(dir_path) != previous.ignore_mtime:
+                    force = True  # As regras de toda a subárvore podem ter mudado
+                else:
+                    state = self._refresh(dir_path, previous)
+
+            if state is None:
+                try:
+                    state = self._visit(dir_path, dir_id, parent_matcher)
+                except OSError as e:
+                    print(f"Erro ao listar diretório {dir_path}: {e}")
+                    continue
+                if previous is not None:
+                    kept = {sub_id for _, sub_id in state.subdirs}
+                    for _, sub_id in previous.subdirs:
+                        if sub_id not in kept:
+                            self._forget(sub_id)
+
+            entries.extend(state.files)
+            stack.extend((path, sub_id, state.matcher, force) for path, sub_id in reversed(state.subdirs))
+
+        return entries
+
+    def _ignore_mtime(self, dir_path):
+        if not self.use_gitignore:
+            return None
+        try:
+            return os.stat(os.path.join(dir_path, IGNORE_FILE)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh(self, dir_path, state):
+        """Estado de um diretório sem entradas novas, ou None se for preciso relistá-lo."""
+        try:
+            if os.stat(dir_path).st_mtime_ns != state.mtime:
+                return None
+            files = state.files
+            for position, entry in enumerate(files):
+                stat = os.stat(os.path.join(dir_path, entry.name))
+                if stat.st_mtime != entry.mtime or stat.st_size != entry.size:
+                    files[position] = entry._replace(size=stat.st_size, mtime=stat.st_mtime)
+        except OSError:
+            return None
+        return state
+
+    def _forget(self, dir_id):
+        """Descarta o estado de um diretório removido e de toda a subárvore dele."""
+        state = self.dir_states.pop(dir_id, None)
+        if state is not None:
+            for _, sub_id in state.subdirs:
+                self._forget(sub_id)
+
+    def _visit(self, dir_path, dir_id, parent_matcher):
+        """Lista um diretório; retorna o DirState com os arquivos e subdiretórios dele."""
+        paths = self.paths
+        mtime = ignore_mtime = None
+        if self.track_dirs:
+            # Antes de listar, para uma mudança durante a listagem aparecer na próxima
+            mtime = os.stat(dir_path).st_mtime_ns
+            ignore_mtime = self._ignore_mtime(dir_path)
+
+        if dir_id == ROOT_ID:
+            matcher = IgnoreMatcher.for_root(dir_path) if self.use_gitignore else IgnoreMatcher()
+        elif self.use_gitignore:
+            matcher = parent_matcher.child(dir_path, paths.dirs[dir_id])
+        else:
+            matcher = parent_matcher
+        extensions = self.extension_list
+        # Prefixo dos caminhos relativos deste diretório (guardado na PathTable)
+        prefix = paths.prefixes[dir_id]
+        files = []
+        subdirs = []
+
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+
+                if is_dir:
+                    if name in self.ignore_dirs or entry.is_symlink():
+                        continue
+                    rel_path = prefix + name
+                    if matcher.ignored(rel_path, name, True):
+                        continue  # A subárvore inteira fica de fora
+                    subdirs.append((entry.path, paths.add_dir(rel_path, dir_id)))
+                    continue
+
+                # Extensão sem os.path.splitext (que cria uma tupla e duas
+                # strings por arquivo); `ext` é a string da configuração
+                for ext in extensions:
+                    if name.endswith(ext):
+                        break
+                else:
+                    continue
+                # Como no splitext, pontos no início do nome não separam extensão
+                if name[0] == '.' and os.path.splitext(name)[1] != ext:
+                    continue
+
+                # Só monta o caminho se alguma regra vale para arquivos
+                if matcher.checks_files and matcher.ignored(prefix + name, name, False):
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except OSError as e:
+                    print(f"Erro ao ler arquivo {entry.path}: {e}")
+                    continue
+
+                files.append(FileEntry(paths, dir_id, name, ext, stat.st_size, stat.st_mtime))
+
+        state = DirState(matcher, mtime, ignore_mtime, files, subdirs)
+        if self.track_dirs:
+            self.dir_states[dir_id] = state
+        return state
+
+
+def _inventory_key(root_dir, ignore_dirs, extensions):
+    return (
+        os.path.abspath(root_dir),
+        tuple(IGNORE_DIRS if ignore_dirs is None else ignore_dirs),
+        tuple(SCAN_EXTENSIONS if extensions is None else extensions),
+    )
+
+
+def scan_workspace(root_dir, ignore_dirs=None, extensions=None, refresh=False):
+    """Retorna o inventário do projeto, varrendo o disco só na primeira chamada."""
+    key = _inventory_key(root_dir, ignore_dirs, extensions)
+
+    if refresh or key not in _inventories:
+        scanner = WorkspaceScanner(root_dir, ignore_dirs, extensions)
+        _inventories[key] = scanner.scan()
+        _path_tables[key] = scanner.paths
+
+    return _inventories[key]
+
+
+def rescan_workspace(root_dir, ignore_dirs=None, extensions=None):
+    """
+    Como scan_workspace(refresh=True), mas a partir da segunda chamada só
+    relista os diretórios que mudaram (ver WorkspaceScanner.rescan).
+    """
+    key = _inventory_key(root_dir, ignore_dirs, extensions)
+    scanner = _trackers.get(key)
+
+    if scanner is None:
+        scanner = _trackers[key] = WorkspaceScanner(root_dir, ignore_dirs, extensions, track_dirs=True)
+        _inventories[key] = scanner.scan()
+    else:
+        _inventories[key] = scanner.rescan()
+    _path_tables[key] = scanner.paths
+
+    return _inventories[key]
+
+
+def workspace_paths(root_dir):
+    """PathTable do inventário compartilhado (varre o projeto se preciso)."""
+    scan_workspace(root_dir)
+    return _path_tables[_inventory_key(root_dir, None, None)]
+
+
+def iter_files(root_dir, extensions):
+    """Percorre o inventário compartilhado filtrando pelas extensões informadas."""
+    for entry in scan_workspace(root_dir):
+        if entry.ext in extensions:
+            yield entry
+
+
+def update_entries(root_dir, paths):
+    """
+    Atualiza tamanho e mtime de arquivos já inventariados que acabaram de ser
+    escritos, sem varrer o projeto de novo.
+
+    Retorna False se algum caminho (de extensão inventariada) ainda não está
+    no inventário, ou seja, é um arquivo novo: aí é preciso varrer de novo
+    (scan_workspace com refresh=True) para ele entrar na posição certa.
+    """
+    root = os.path.abspath(root_dir)
+    paths = set(paths)
+    complete = True
+
+    for key, entries in _inventories.items():
+        if key[0] != root:
+            continue
+        found = set()
+        for position, entry in enumerate(entries):
+            if entry.path in paths:
+                stat = os.stat(os.path.join(root, entry.path))
+                entries[position] = entry._replace(size=stat.st_size, mtime=stat.st_mtime)
+                found.add(entry.path)
+        extensions = key[2]
+        if any(os.path.splitext(path)[1] in extensions for path in paths - found):
+            complete = False
+
+    return complete
+
+
+def invalidate(root_dir=None):
+    """Descarta inventários em memória (todos, ou apenas os de uma raiz)."""
+    if root_dir is None:
+        _inventories.clear()
+        _path_tables.clear()
+        _trackers.clear()
+        return
+
+    root = os.path.abspath(root_dir)
+    for key in [k for k in _inventories if k[0] == root]:
+        del _inventories[key]
+        _path_tables.pop(key, None)
+    for key in [k for k in _trackers if k[0] == root]:
+        del _trackers[key]